@@ -0,0 +1,142 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(), nullable=True),
+        sa.Column('hashed_password', sa.String(), nullable=True),
+        sa.Column('full_name', sa.String(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('subscription_tier', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_id', 'users', ['id'])
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    op.create_table(
+        'user_documents',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('document_type', sa.String(), nullable=True),
+        sa.Column('original_path', sa.String(), nullable=True),
+        sa.Column('processed_path', sa.String(), nullable=True),
+        sa.Column('metadata', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_user_documents_id', 'user_documents', ['id'])
+    op.create_index('ix_user_documents_user_id', 'user_documents', ['user_id'])
+
+    op.create_table(
+        'job_applications',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('job_title', sa.String(), nullable=True),
+        sa.Column('company', sa.String(), nullable=True),
+        sa.Column('job_url', sa.String(), nullable=True),
+        sa.Column('application_date', sa.DateTime(), nullable=True),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('match_score', sa.Float(), nullable=True),
+        sa.Column('application_data', sa.JSON(), nullable=True),
+        sa.Column('follow_up_tasks', sa.JSON(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_job_applications_id', 'job_applications', ['id'])
+    op.create_index('ix_job_applications_user_id', 'job_applications', ['user_id'])
+
+    op.create_table(
+        'application_settings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('preferences', sa.JSON(), nullable=True),
+        sa.Column('target_companies', sa.JSON(), nullable=True),
+        sa.Column('excluded_companies', sa.JSON(), nullable=True),
+        sa.Column('salary_range', sa.JSON(), nullable=True),
+        sa.Column('locations', sa.JSON(), nullable=True),
+        sa.Column('auto_apply', sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_application_settings_id', 'application_settings', ['id'])
+    op.create_index('ix_application_settings_user_id', 'application_settings', ['user_id'])
+
+    op.create_table(
+        'jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('source', sa.String(length=64), nullable=False),
+        sa.Column('external_id', sa.String(length=512), nullable=False),
+        sa.Column('canonical_id', sa.Integer(), nullable=True),
+        sa.Column('url', sa.String(), nullable=True),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('company', sa.String(), nullable=True),
+        sa.Column('location', sa.String(), nullable=True),
+        sa.Column('province', sa.String(length=8), nullable=True),
+        sa.Column('posted_date', sa.Date(), nullable=True),
+        sa.Column('salary_min', sa.Float(), nullable=True),
+        sa.Column('salary_max', sa.Float(), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('first_seen_at', sa.DateTime(), nullable=True),
+        sa.Column('last_seen_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('source', 'external_id', name='uq_jobs_source_external_id')
+    )
+    op.create_index('ix_jobs_id', 'jobs', ['id'])
+    op.create_index('ix_jobs_canonical_id', 'jobs', ['canonical_id'])
+    op.create_index('ix_jobs_province', 'jobs', ['province'])
+    op.create_index('ix_jobs_posted_date', 'jobs', ['posted_date'])
+    op.create_index('ix_jobs_salary_min', 'jobs', ['salary_min'])
+    op.create_index('ix_jobs_last_seen_at', 'jobs', ['last_seen_at'])
+    op.create_index('ix_jobs_province_posted', 'jobs', ['province', 'posted_date'])
+
+    op.create_table(
+        'job_skills',
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('skill_id', sa.String(length=64), nullable=False),
+        sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('job_id', 'skill_id')
+    )
+    op.create_index('ix_job_skills_skill_id', 'job_skills', ['skill_id'])
+
+    op.create_table(
+        'scrape_runs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('source', sa.String(length=64), nullable=False),
+        sa.Column('keyword', sa.String(), nullable=False),
+        sa.Column('location', sa.String(), nullable=False),
+        sa.Column('last_scraped_at', sa.DateTime(), nullable=False),
+        sa.Column('jobs_found', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('source', 'keyword', 'location', name='uq_scrape_runs_search')
+    )
+    op.create_index('ix_scrape_runs_id', 'scrape_runs', ['id'])
+    op.create_index('ix_scrape_runs_last_scraped_at', 'scrape_runs', ['last_scraped_at'])
+
+
+def downgrade() -> None:
+    op.drop_table('scrape_runs')
+    op.drop_table('job_skills')
+    op.drop_table('jobs')
+    op.drop_table('application_settings')
+    op.drop_table('job_applications')
+    op.drop_table('user_documents')
+    op.drop_table('users')
@@ -0,0 +1,50 @@
+"""job application composite and partial indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 09:30:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN_FOLLOW_UPS = "status IN ('applied', 'interview') AND next_follow_up_at IS NOT NULL"
+
+
+def upgrade() -> None:
+    op.add_column('job_applications', sa.Column('canonical_job_id', sa.Integer(), nullable=True))
+    op.add_column('job_applications', sa.Column('next_follow_up_at', sa.DateTime(), nullable=True))
+
+    # Every query below leads with user_id, so the single-column index is redundant
+    op.drop_index('ix_job_applications_user_id', table_name='job_applications')
+    op.create_index('ix_job_applications_user_date', 'job_applications',
+                    ['user_id', 'application_date', 'id'])
+    op.create_index('ix_job_applications_user_status_date', 'job_applications',
+                    ['user_id', 'status', 'application_date', 'id'])
+    op.create_index('ix_job_applications_user_company', 'job_applications', ['user_id', 'company'])
+    op.create_index('ix_job_applications_user_canonical_job', 'job_applications',
+                    ['user_id', 'canonical_job_id'])
+    op.create_index('ix_job_applications_user_match', 'job_applications', ['user_id', 'match_score'])
+    op.create_index('ix_job_applications_follow_up_due', 'job_applications', ['next_follow_up_at'],
+                    postgresql_where=sa.text(OPEN_FOLLOW_UPS), sqlite_where=sa.text(OPEN_FOLLOW_UPS))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_applications_follow_up_due', table_name='job_applications')
+    op.drop_index('ix_job_applications_user_match', table_name='job_applications')
+    op.drop_index('ix_job_applications_user_canonical_job', table_name='job_applications')
+    op.drop_index('ix_job_applications_user_company', table_name='job_applications')
+    op.drop_index('ix_job_applications_user_status_date', table_name='job_applications')
+    op.drop_index('ix_job_applications_user_date', table_name='job_applications')
+    op.create_index('ix_job_applications_user_id', 'job_applications', ['user_id'])
+    op.drop_column('job_applications', 'next_follow_up_at')
+    op.drop_column('job_applications', 'canonical_job_id')
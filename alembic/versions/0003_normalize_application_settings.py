@@ -0,0 +1,209 @@
+"""normalize application settings
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 11:00:00
+
+Moves salary_range, locations, target/excluded companies and the keywords
+inside preferences out of JSON into salary columns and the user_locations,
+user_keywords and user_company_preferences tables.
+
+The normalization below is a frozen copy of search_settings.settings_rows
+as of this revision, so later changes to the live code cannot change what
+this migration does. Resolving places against the gazetteer is left to
+SearchSettingsStore.resolve_locations (run by scripts/setup_db.py): rows
+are written here with the normalized name and no province.
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LEGACY_COLUMNS = ('target_companies', 'excluded_companies', 'salary_range', 'locations')
+
+NORMALIZED_FIELDS = ('keywords', 'locations', 'min_salary', 'max_salary',
+                     'target_companies', 'excluded_companies', 'auto_apply')
+
+COMPANY_SUFFIXES = re.compile(r'\b(pty|ltd|limited|inc|llc|plc|co|sa|za|group|holdings)\b')
+
+
+def _normalize_keyword(keyword: str) -> str:
+    return re.sub(r'\s+', ' ', (keyword or '').lower()).strip()
+
+
+def _normalize_company(name: str) -> str:
+    words = re.findall(r'[a-z0-9+#]+', (name or '').lower())
+    return ' '.join(COMPANY_SUFFIXES.sub(' ', ' '.join(words)).split())
+
+
+def _normalize_location(name: str) -> str:
+    name = name.lower().replace("'", "").replace("-", " ")
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", " ", name)).strip()
+
+
+def _salary(value):
+    try:
+        return float(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _settings_rows(user_id: int, settings: dict):
+    """The application_settings values and the location, keyword and company rows of one user"""
+    values = {
+        'preferences': {key: value for key, value in settings.items() if key not in NORMALIZED_FIELDS},
+        'salary_min': _salary(settings.get('min_salary')),
+        'salary_max': _salary(settings.get('max_salary'))
+    }
+
+    names = {_normalize_location(location or '') for location in settings.get('locations') or []}
+    names.discard('')
+    locations = [{'user_id': user_id, 'province': None, 'location': name} for name in sorted(names)]
+    if not locations:
+        locations = [{'user_id': user_id, 'province': None, 'location': ''}]  # anywhere
+
+    keywords = {_normalize_keyword(keyword) for keyword in settings.get('keywords') or []}
+    keywords.discard('')
+
+    companies = {}
+    for kind in ('target', 'excluded'):
+        for company in settings.get(f'{kind}_companies') or []:
+            key = _normalize_company(company or '')
+            if key:
+                companies[(kind, key)] = {'user_id': user_id, 'kind': kind, 'company_key': key, 'company': company}
+
+    return (values, locations, [{'user_id': user_id, 'keyword': keyword} for keyword in sorted(keywords)],
+            list(companies.values()))
+
+
+def _legacy_settings(row) -> dict:
+    """Flat settings dict from a pre-0003 application_settings row"""
+    settings = dict(row.preferences or {})
+    salary_range = row.salary_range or {}
+    if isinstance(salary_range, (list, tuple)):
+        salary_range = dict(zip(('min', 'max'), salary_range))
+    settings.setdefault('min_salary', salary_range.get('min'))
+    settings.setdefault('max_salary', salary_range.get('max'))
+    settings['locations'] = row.locations or settings.get('locations') or []
+    settings['target_companies'] = row.target_companies or []
+    settings['excluded_companies'] = row.excluded_companies or []
+    settings['auto_apply'] = True if row.auto_apply is None else row.auto_apply
+    return settings
+
+
+def upgrade() -> None:
+    op.add_column('application_settings', sa.Column('salary_min', sa.Float(), nullable=True))
+    op.add_column('application_settings', sa.Column('salary_max', sa.Float(), nullable=True))
+    op.create_index('ix_application_settings_auto_apply_salary', 'application_settings',
+                    ['auto_apply', 'salary_min'])
+
+    user_locations = op.create_table(
+        'user_locations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('province', sa.String(length=8), nullable=True),
+        sa.Column('location', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_user_locations_user_id', 'user_locations', ['user_id'])
+    op.create_index('ix_user_locations_province_user', 'user_locations', ['province', 'user_id'])
+
+    user_keywords = op.create_table(
+        'user_keywords',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('keyword', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('user_id', 'keyword')
+    )
+    op.create_index('ix_user_keywords_keyword', 'user_keywords', ['keyword'])
+
+    user_companies = op.create_table(
+        'user_company_preferences',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=16), nullable=False),
+        sa.Column('company_key', sa.String(), nullable=False),
+        sa.Column('company', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('user_id', 'kind', 'company_key')
+    )
+    op.create_index('ix_user_company_preferences_company', 'user_company_preferences',
+                    ['company_key', 'kind', 'user_id'])
+
+    op.create_index('ix_jobs_first_seen_at', 'jobs', ['first_seen_at'])
+
+    settings_table = sa.table(
+        'application_settings',
+        sa.column('id', sa.Integer), sa.column('user_id', sa.Integer), sa.column('preferences', sa.JSON),
+        sa.column('target_companies', sa.JSON), sa.column('excluded_companies', sa.JSON),
+        sa.column('salary_range', sa.JSON), sa.column('locations', sa.JSON), sa.column('auto_apply', sa.Boolean),
+        sa.column('salary_min', sa.Float), sa.column('salary_max', sa.Float)
+    )
+    connection = op.get_bind()
+    for row in connection.execute(sa.select(settings_table)).fetchall():
+        if row.user_id is None:
+            continue
+        values, locations, keywords, companies = _settings_rows(row.user_id, _legacy_settings(row))
+        connection.execute(
+            settings_table.update().where(settings_table.c.id == row.id).values(
+                preferences=values['preferences'], salary_min=values['salary_min'], salary_max=values['salary_max']
+            )
+        )
+        for table, rows in ((user_locations, locations), (user_keywords, keywords), (user_companies, companies)):
+            if rows:
+                connection.execute(table.insert(), rows)
+
+    for column in LEGACY_COLUMNS:
+        op.drop_column('application_settings', column)
+
+
+def downgrade() -> None:
+    for column in LEGACY_COLUMNS:
+        op.add_column('application_settings', sa.Column(column, sa.JSON(), nullable=True))
+
+    settings_table = sa.table(
+        'application_settings',
+        sa.column('id', sa.Integer), sa.column('user_id', sa.Integer), sa.column('preferences', sa.JSON),
+        sa.column('target_companies', sa.JSON), sa.column('excluded_companies', sa.JSON),
+        sa.column('salary_range', sa.JSON), sa.column('locations', sa.JSON),
+        sa.column('salary_min', sa.Float), sa.column('salary_max', sa.Float)
+    )
+    connection = op.get_bind()
+    locations, keywords, companies = {}, {}, {}
+    for user_id, location in connection.execute(sa.text("SELECT user_id, location FROM user_locations")):
+        if location:
+            locations.setdefault(user_id, []).append(location)
+    for user_id, keyword in connection.execute(sa.text("SELECT user_id, keyword FROM user_keywords")):
+        keywords.setdefault(user_id, []).append(keyword)
+    for user_id, kind, company in connection.execute(
+            sa.text("SELECT user_id, kind, company FROM user_company_preferences")):
+        companies.setdefault((user_id, kind), []).append(company)
+
+    for row in connection.execute(sa.select(settings_table)).fetchall():
+        preferences = dict(row.preferences or {})
+        preferences['keywords'] = keywords.get(row.user_id, [])
+        if row.salary_min is not None:
+            preferences['min_salary'] = row.salary_min
+        connection.execute(
+            settings_table.update().where(settings_table.c.id == row.id).values(
+                preferences=preferences,
+                locations=locations.get(row.user_id, []),
+                target_companies=companies.get((row.user_id, 'target'), []),
+                excluded_companies=companies.get((row.user_id, 'excluded'), []),
+                salary_range={'min': row.salary_min, 'max': row.salary_max}
+            )
+        )
+
+    op.drop_index('ix_jobs_first_seen_at', table_name='jobs')
+    op.drop_table('user_company_preferences')
+    op.drop_table('user_keywords')
+    op.drop_table('user_locations')
+    op.drop_index('ix_application_settings_auto_apply_salary', table_name='application_settings')
+    op.drop_column('application_settings', 'salary_max')
+    op.drop_column('application_settings', 'salary_min')
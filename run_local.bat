@@ -30,7 +30,7 @@ echo Starting Redis...
 start redis-server
 
 echo Starting Celery worker...
-start celery -A src.celery_app worker --pool=solo -l info
+start python -m src.ai_agents.worker_runtime --concurrency 32
 
 echo Starting main application...
 uvicorn src.main:app --host 0.0.0.0 --port 8000 --reload
@@ -0,0 +1,166 @@
+"""Benchmark the job application query layer on a seeded table.
+
+Seeds job_applications with --rows synthetic applications (default one
+million, spread over rows/100 users). A few heavy auto-apply users own 10%
+of the rows, and queries pick users in proportion to their row counts.
+It then times every query in src/database/application_queries.py twice:
+first with only the old single-column user_id index, then with the
+composite and partial indexes from alembic revision 0002.
+
+    python scripts/bench_application_queries.py [--rows 1000000] [--repeat 200]
+        [--url sqlite+aiosqlite:///data/bench_applications.db]
+
+--url takes an async driver URL (postgresql+asyncpg://... for Postgres).
+The benchmark drops and recreates the tables in that database.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import Index, insert, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import application_queries  # noqa: E402
+from src.database.models import Base, JobApplication  # noqa: E402
+
+STATUSES = ['applied'] * 55 + ['interview'] * 10 + ['rejected'] * 30 + ['offered'] * 5
+HEAVY_USERS = 20
+LEGACY_INDEX = Index('ix_job_applications_user_id', JobApplication.user_id)
+
+def application_rows(count: int, users: int, seed: int = 7):
+    """Synthetic applications: a year of history, a few thousand employers, follow-ups on open ones.
+
+    Users 1..HEAVY_USERS share 10% of the rows between them.
+    """
+    generator = random.Random(seed)
+    now = datetime.utcnow()
+    companies = [f"Company {i}" for i in range(5000)]
+    for _ in range(count):
+        status = generator.choice(STATUSES)
+        follow_up = None
+        if status in ('applied', 'interview') and generator.random() < 0.6:
+            follow_up = now + timedelta(hours=generator.randint(-24 * 30, 24 * 30))
+        yield {
+            'user_id': generator.randint(1, HEAVY_USERS) if generator.random() < 0.1 else generator.randint(1, users),
+            'job_title': 'Software Developer',
+            'company': generator.choice(companies),
+            'job_url': 'https://example.co.za/job',
+            'canonical_job_id': generator.randint(1, 200000),
+            'application_date': now - timedelta(seconds=generator.randint(0, 365 * 24 * 3600)),
+            'status': status,
+            'match_score': round(generator.uniform(50, 100), 1),
+            'next_follow_up_at': follow_up
+        }
+
+async def seed(engine, rows: int, users: int, chunk_size: int = 10000):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all, tables=[JobApplication.__table__])
+        for index in JobApplication.__table__.indexes:
+            if index.name != 'ix_job_applications_id':
+                await conn.run_sync(index.drop)
+    started = time.perf_counter()
+    chunk = []
+    for row in application_rows(rows, users):
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            async with engine.begin() as conn:
+                await conn.execute(insert(JobApplication), chunk)
+            chunk = []
+    if chunk:
+        async with engine.begin() as conn:
+            await conn.execute(insert(JobApplication), chunk)
+    print(f"seeded {rows:,} rows for {users:,} users in {time.perf_counter() - started:.1f}s")
+
+async def set_indexes(engine, composite: bool):
+    """Legacy user_id index only, or the composite/partial indexes the model declares"""
+    started = time.perf_counter()
+    async with engine.begin() as conn:
+        if composite:
+            await conn.run_sync(LEGACY_INDEX.drop, checkfirst=True)
+            for index in JobApplication.__table__.indexes:
+                await conn.run_sync(index.create, checkfirst=True)
+        else:
+            await conn.run_sync(LEGACY_INDEX.create)
+        await conn.execute(text('ANALYZE'))
+    print(f"indexes built in {time.perf_counter() - started:.1f}s")
+
+async def timed(sessionmaker, repeat: int, query):
+    """Median and p95 latency in ms of query(session, i) over repeat runs"""
+    samples = []
+    async with sessionmaker() as session:
+        for i in range(repeat):
+            started = time.perf_counter()
+            await query(session, i)
+            samples.append(1000 * (time.perf_counter() - started))
+    samples.sort()
+    return statistics.median(samples), samples[int(0.95 * (len(samples) - 1))]
+
+async def run_queries(sessionmaker, users: int, repeat: int):
+    generator = random.Random(11)
+    user_ids = [
+        generator.randint(1, HEAVY_USERS) if generator.random() < 0.1 else generator.randint(1, users)
+        for _ in range(repeat)
+    ]
+    companies = [[f"Company {generator.randint(0, 4999)}" for _ in range(20)] for _ in range(repeat)]
+    since = datetime.utcnow() - timedelta(days=30)
+
+    async def page_five(session, i):
+        cursor = None
+        for _ in range(5):
+            page = await application_queries.list_applications(session, user_ids[i], limit=10, cursor=cursor)
+            cursor = page['next_cursor']
+
+    queries = {
+        'list first page': lambda s, i: application_queries.list_applications(s, user_ids[i], limit=20),
+        'list page 5 (keyset)': page_five,
+        'list by status': lambda s, i: application_queries.list_applications(s, user_ids[i], status='interview'),
+        'list last 30 days': lambda s, i: application_queries.list_applications(s, user_ids[i], from_date=since),
+        'status counts': lambda s, i: application_queries.status_counts(s, user_ids[i]),
+        'due for follow-up': lambda s, i: application_queries.due_for_follow_up(s, limit=500),
+        'applied companies (20)': lambda s, i: application_queries.applied_companies(s, user_ids[i], companies[i]),
+        'has applied (vacancy)': lambda s, i: application_queries.has_applied(s, user_ids[i], canonical_job_id=i + 1)
+    }
+    results = {}
+    for name, query in queries.items():
+        results[name] = await timed(sessionmaker, repeat, query)
+    return results
+
+async def main_async(args):
+    engine = create_async_engine(args.url)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    users = max(1, args.rows // 100)
+    await seed(engine, args.rows, users)
+
+    await set_indexes(engine, composite=False)
+    before = await run_queries(sessionmaker, users, args.repeat)
+    await set_indexes(engine, composite=True)
+    after = await run_queries(sessionmaker, users, args.repeat)
+    await engine.dispose()
+
+    print(f"\n{'query':<26}{'user_id index (p50/p95 ms)':>30}{'composite (p50/p95 ms)':>28}")
+    for name in before:
+        old, new = before[name], after[name]
+        print(f"{name:<26}{old[0]:>18.2f} / {old[1]:>7.2f}{new[0]:>16.2f} / {new[1]:>7.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000, help='applications to seed')
+    parser.add_argument('--repeat', type=int, default=200, help='runs per query')
+    parser.add_argument('--url', default='sqlite+aiosqlite:///data/bench_applications.db',
+                        help='async database URL (tables are dropped and recreated)')
+    args = parser.parse_args()
+    if args.url.startswith('sqlite') and '///' in args.url:
+        directory = os.path.dirname(args.url.split('///', 1)[1])
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    asyncio.run(main_async(args))
+
+if __name__ == '__main__':
+    main()
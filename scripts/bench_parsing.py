@@ -0,0 +1,75 @@
+"""Benchmark listing-page parsing on saved fixture pages.
+
+Compares the previous approach (full html.parser tree, find_all for cards,
+a CSS select per field per card) with the CardParser layer (lxml pull
+parser yielding each card as it closes, with precompiled XPath, when
+installed; otherwise SoupStrainer card subtrees and soupsieve selectors
+compiled once).
+
+    python scripts/bench_parsing.py [--seconds 3]
+"""
+import argparse
+import os
+import sys
+import time
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.job_scraping.scrapers.card_parser import HTML_PARSER  # noqa: E402
+from src.job_scraping.scrapers.site_specs import SITE_SPECS, get_site_registry  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def legacy_parse(html, card_tag, card_class, fields):
+    """The per-page work the scrapers did before CardParser"""
+    soup = BeautifulSoup(html, 'html.parser')
+    jobs = []
+    for card in soup.find_all(card_tag, class_=card_class):
+        job = {}
+        for name, spec in fields.items():
+            selector, attribute = (spec, None) if isinstance(spec, str) else spec
+            element = card.select_one(selector)
+            if element is None:
+                job[name] = ''
+            elif attribute:
+                job[name] = element.get(attribute, '')
+            else:
+                job[name] = element.text.strip()
+        jobs.append(job)
+    return jobs
+
+def pages_per_second(parse, html, seconds):
+    pages = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        parse(html)
+        pages += 1
+    return pages / (time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=3.0, help='time budget per measurement')
+    args = parser.parse_args()
+
+    cases = [('careerjunction_listing.html', 'CareerJunction'), ('indeed_listing.html', 'Indeed')]
+
+    print(f"CardParser tree builder: {HTML_PARSER}")
+    print(f"{'fixture':<30} {'cards':>5} {'before p/s':>11} {'after p/s':>10} {'speedup':>8}")
+    for filename, site_name in cases:
+        card_parser = get_site_registry().get(site_name).cards
+        fields = SITE_SPECS[site_name]['fields']
+        with open(os.path.join(FIXTURES, filename), encoding='utf-8') as f:
+            html = f.read()
+
+        cards = len(list(card_parser.parse(html)))
+        assert cards == len(legacy_parse(html, card_parser.card_tag, card_parser.card_class, fields))
+
+        before = pages_per_second(
+            lambda page: legacy_parse(page, card_parser.card_tag, card_parser.card_class, fields), html, args.seconds
+        )
+        after = pages_per_second(lambda page: list(card_parser.parse(page)), html, args.seconds)
+        print(f"{filename:<30} {cards:>5} {before:>11.1f} {after:>10.1f} {after / before:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
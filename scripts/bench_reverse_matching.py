@@ -0,0 +1,95 @@
+"""Benchmark job -> users matching through UserProfileIndex.
+
+Builds --users synthetic profiles and a batch of --jobs synthetic
+listings. It then compares two ways of finding each user's high matches:
+scoring every user against the batch with
+JobMatcher.calculate_match_scores_batch, and scoring only the candidates
+from the index's posting-list intersections. Recall is measured against
+all brute-force high matches and must be 100%: the index only prunes
+users who cannot reach the threshold.
+
+    python scripts/bench_reverse_matching.py [--users 20000] [--jobs 300] [--threshold 80]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.document_processing.skill_taxonomy import SKILL_TAXONOMY  # noqa: E402
+from src.job_scraping.scrapers.candidate_index import UserProfileIndex  # noqa: E402
+from src.job_scraping.scrapers.job_matcher import JobMatcher  # noqa: E402
+
+PLACES = ['Johannesburg', 'Cape Town', 'Durban', 'Pretoria', 'Port Elizabeth', 'Bloemfontein',
+          'Polokwane', 'Nelspruit', 'Kimberley', 'Rustenburg', 'East London', 'Stellenbosch']
+EDUCATION = ['Matric', 'Diploma', 'BSc Computer Science', 'Honours', 'MBA']
+
+def make_profiles(count: int, generator: random.Random):
+    skills = list(SKILL_TAXONOMY)
+    return [{
+        'skills': generator.sample(skills, generator.randint(2, 8)),
+        'preferred_locations': generator.sample(PLACES, generator.randint(1, 2)),
+        'years_experience': generator.choice([0, 1, 2, 3, 4, 5, 6, 8, 10, 12, 15]),
+        'expected_salary': generator.choice([0, 15000, 25000, 40000, 60000]),
+        'education': generator.choice(EDUCATION)
+    } for _ in range(count)]
+
+def make_jobs(count: int, generator: random.Random):
+    skills = [SKILL_TAXONOMY[skill_id].get('name', skill_id) for skill_id in SKILL_TAXONOMY]
+    jobs = []
+    for i in range(count):
+        wanted = generator.sample(skills, generator.randint(2, 5))
+        years = generator.choice([0, 1, 2, 3, 5, 7, 10])
+        experience = f" Minimum {years} years experience." if years else ''
+        jobs.append({
+            'url': f'https://example.co.za/jobs/{i}',
+            'title': f"{wanted[0]} Specialist",
+            'company': f"Company {generator.randint(1, 200)}",
+            'location': generator.choice(PLACES + ['Remote']),
+            'salary': generator.choice(['', 'R20 000 - R30 000', 'R45 000', 'R70k']),
+            'description': f"We need {', '.join(wanted)}.{experience} {generator.choice(EDUCATION)} required."
+        })
+    return jobs
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=20000)
+    parser.add_argument('--jobs', type=int, default=300)
+    parser.add_argument('--threshold', type=float, default=80)
+    args = parser.parse_args()
+
+    generator = random.Random(3)
+    profiles = make_profiles(args.users, generator)
+    jobs = make_jobs(args.jobs, generator)
+    matcher = JobMatcher()
+
+    started = time.perf_counter()
+    index = UserProfileIndex(matcher=matcher)
+    for user_id, profile in enumerate(profiles):
+        index.add(user_id, profile)
+    build_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    ranked = matcher.calculate_match_scores_batch(jobs, profiles)
+    brute_seconds = time.perf_counter() - started
+    brute = {(user_id, job['url']) for user_id, user_jobs in enumerate(ranked)
+             for job in user_jobs if job['match_score'] >= args.threshold}
+
+    started = time.perf_counter()
+    matches = index.match_jobs(jobs, min_score=args.threshold)
+    index_seconds = time.perf_counter() - started
+    found = {(user_id, job['url']) for user_id, user_jobs in matches.items() for job in user_jobs}
+
+    pairs = args.users * args.jobs
+    print(f"{args.users:,} users x {args.jobs} jobs = {pairs:,} pairs; index built in {build_seconds:.2f}s")
+    print(f"brute force : {brute_seconds:7.2f}s  {len(brute):,} matches >= {args.threshold:g}")
+    print(f"index       : {index_seconds:7.2f}s  {len(found):,} matches, "
+          f"{index.stats['candidate_pairs']:,} candidate pairs ({100 * index.stats['candidate_pairs'] / pairs:.1f}%), "
+          f"{index.stats['scored_users']:,} users scored")
+    print(f"speedup {brute_seconds / index_seconds:.1f}x, recall {100 * len(found & brute) / max(len(brute), 1):.1f}%, "
+          f"missed {len(brute - found)}, false matches {len(found - brute)}")
+
+if __name__ == '__main__':
+    main()
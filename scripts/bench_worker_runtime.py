@@ -0,0 +1,107 @@
+"""Benchmark user automation cycles per minute per core for both worker models.
+
+Each simulated cycle mirrors full_cycle_automation: it scores --jobs
+synthetic listings for a profile with JobMatcher (CPU), then awaits
+--io-calls simulated LLM/HTTP/database round trips of --latency seconds.
+The two models are:
+
+* solo: the old Celery --pool=solo task, which runs cycles one at a time
+  and calls asyncio.run() with a freshly built agent set (a new JobMatcher)
+  for each,
+* runtime: WorkerRuntime, which runs one long-lived loop and agent set per
+  process, fed by --concurrency task threads as in the Celery threads pool.
+
+Each model runs in a single process. Cycles per minute is wall-clock
+throughput, which mostly reflects how many cycles overlap their remote
+calls; cycles per CPU-minute is throughput per core, i.e. how much CPU a
+cycle costs, and is what the per-core ratio compares.
+
+    python scripts/bench_worker_runtime.py [--cycles 400] [--solo-cycles 20] [--concurrency 32]
+        [--jobs 200] [--io-calls 6] [--latency 0.25]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ai_agents.worker_runtime import WorkerRuntime  # noqa: E402
+from src.job_scraping.scrapers.job_matcher import JobMatcher  # noqa: E402
+from scripts.bench_reverse_matching import make_jobs, make_profiles  # noqa: E402
+
+class BenchAgents:
+    """Stand-in for AgentOrchestrator: real matching work, simulated remote calls"""
+
+    def __init__(self, jobs, profiles, io_calls: int, latency: float):
+        self.matcher = JobMatcher()
+        self.jobs = jobs
+        self.profiles = profiles
+        self.io_calls = io_calls
+        self.latency = latency
+
+    async def full_cycle_automation(self, user_id, preferences=None):
+        scored = self.matcher.calculate_match_scores(self.jobs, self.profiles[int(user_id) % len(self.profiles)])
+        for _ in range(self.io_calls):
+            await asyncio.sleep(self.latency)
+        return {'status': 'success', 'jobs_found': len(scored)}
+
+def measure(run, cycles: int):
+    wall, cpu = time.perf_counter(), time.process_time()
+    run(cycles)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    return {
+        'cycles': cycles,
+        'seconds': wall,
+        'per_minute': 60 * cycles / wall,
+        'cpu_utilization': cpu / wall,
+        'per_cpu_minute': 60 * cycles / cpu if cpu else float('inf')
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cycles', type=int, default=400)
+    parser.add_argument('--solo-cycles', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--jobs', type=int, default=200)
+    parser.add_argument('--io-calls', type=int, default=6)
+    parser.add_argument('--latency', type=float, default=0.25)
+    args = parser.parse_args()
+
+    generator = random.Random(5)
+    jobs = make_jobs(args.jobs, generator)
+    profiles = make_profiles(100, generator)
+
+    def solo(cycles):
+        for user_id in range(cycles):
+            agents = BenchAgents(jobs, profiles, args.io_calls, args.latency)
+            asyncio.run(agents.full_cycle_automation(str(user_id)))
+
+    runtime = WorkerRuntime(
+        max_concurrent_cycles=args.concurrency,
+        orchestrator_factory=lambda: BenchAgents(jobs, profiles, args.io_calls, args.latency)
+    )
+
+    def shared(cycles):
+        with ThreadPoolExecutor(args.concurrency) as pool:
+            list(pool.map(runtime.run_cycle, (str(user_id) for user_id in range(cycles))))
+
+    results = {'solo': measure(solo, args.solo_cycles)}
+    runtime.run_cycle('-1')
+    results['runtime'] = measure(shared, args.cycles)
+    runtime.stop()
+
+    print(f"cycle = score {args.jobs} jobs + {args.io_calls} x {args.latency * 1000:.0f}ms remote calls; "
+          f"runtime concurrency {args.concurrency}")
+    for name, result in results.items():
+        print(f"{name:8}: {result['cycles']:5} cycles in {result['seconds']:7.2f}s  "
+              f"{result['per_minute']:8.1f} cycles/min  cpu {100 * result['cpu_utilization']:5.1f}%  "
+              f"{result['per_cpu_minute']:8.1f} cycles/cpu-min")
+    print(f"wall-clock throughput {results['runtime']['per_minute'] / results['solo']['per_minute']:.1f}x, "
+          f"throughput per core {results['runtime']['per_cpu_minute'] / results['solo']['per_cpu_minute']:.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+"""Create or upgrade the application database to the latest schema.
+
+    python scripts/setup_db.py
+
+Runs the Alembic migrations in alembic/versions against DATABASE_URL, then
+resolves users' places that have no province yet (e.g. migrated by 0003)
+and adds recent stored jobs to the text index that pre-filters user cycles.
+"""
+import asyncio
+import os
+import sys
+from alembic import command
+from alembic.config import Config
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+async def backfill():
+    from src.job_scraping.scrapers.job_store import get_job_store
+    from src.job_scraping.scrapers.search_settings import get_search_settings_store
+    resolved = await get_search_settings_store().resolve_locations()
+    # Pruning first drops superseded and undated rows, which the backfill then re-adds with their dates
+    await get_job_store().prune_index()
+    return resolved, await get_job_store().index_existing_jobs()
+
+def main():
+    os.chdir(ROOT)  # env.py imports the src package from the project root
+    command.upgrade(Config(os.path.join(ROOT, 'alembic.ini')), 'head')
+    print("Database schema is up to date")
+
+    resolved, indexed = asyncio.run(backfill())
+    print(f"Resolved {resolved} user locations")
+    print(f"Indexed {indexed} stored jobs")
+
+if __name__ == '__main__':
+    main()
@@ -1,32 +1,84 @@
 import asyncio
-from typing import Dict, List
+import json
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
 from celery import Celery
+from celery.signals import worker_shutdown
 from ..config import settings
+from ..database.models import JobApplication
+from ..database.session import get_database
 from .resume_agent import ResumeAgent
 from .application_agent import ApplicationAgent
+from .application_executor import get_application_executor
+from .worker_runtime import get_worker_runtime, shard_queue
 from .communication_agent import CommunicationAgent
-from ..job_scraping.job_matcher import JobMatcher
+from ..job_scraping.scrapers.job_matcher import JobMatcher
+from ..job_scraping.scrapers.job_index import get_job_text_index
+from ..job_scraping.scrapers.job_pipeline import JobPipeline, merge_job_streams
+from ..job_scraping.scrapers.za_agencies import SouthAfricaJobScrapers
+from ..job_scraping.scrapers.international_za import InternationalJobScraper
+from ..job_scraping.scrapers.job_store import get_job_store
+from ..job_scraping.scrapers.scrape_demand import ScrapeDemandAggregator
+from ..job_scraping.scrapers.search_settings import get_search_settings_store
+from ..job_scraping.scrapers.candidate_index import get_user_profile_index
+from ..location_za.location_index import LOCATION_INDEX
+
+# Jobs taken from the text index per cycle, before full scoring
+INDEX_TOP_K = 500
+
+# How often celery beat checks for demanded searches that are due; each
+# search is still scraped at most once per ScrapeDemandAggregator.freshness
+REFRESH_LISTINGS_EVERY = timedelta(minutes=30)
+
+# When an open application is first due for a follow-up
+FOLLOW_UP_AFTER = timedelta(days=7)
 
 celery_app = Celery('job_automator', broker=settings.REDIS_URL)
+# Each worker thread holds one user cycle; reserve no more than that and
+# ack only once a cycle finishes so a crashed worker's users are redelivered
+celery_app.conf.update(
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    task_reject_on_worker_lost=True
+)
+
+@worker_shutdown.connect
+def _stop_worker_runtime(**kwargs):
+    get_worker_runtime().stop()
 
 class AgentOrchestrator:
     def __init__(self):
         self.resume_agent = ResumeAgent()
         self.application_agent = ApplicationAgent()
         self.communication_agent = CommunicationAgent()
-        self.job_matcher = JobMatcher()
+        self.job_matcher = JobMatcher(job_index=get_job_text_index())
+        self.job_store = get_job_store()
     
-    async def full_cycle_automation(self, user_id: str, preferences: Dict) -> Dict:
-        """Execute full job application cycle for a user"""
+    async def full_cycle_automation(self, user_id: str, preferences: Optional[Dict] = None) -> Dict:
+        """Execute full job application cycle for a user (with their stored settings if none are given)"""
+        if preferences is None:
+            preferences = await get_search_settings_store().load(int(user_id)) or {}
         
         # 1. Process user documents
         user_profile = await self._process_user_documents(user_id)
+        get_user_profile_index().add(int(user_id), user_profile)
         
-        # 2. Scrape and match jobs
-        matched_jobs = await self._find_matching_jobs(user_profile, preferences)
-        
-        # 3. Automated applications
-        applications = await self._process_applications(user_id, user_profile, matched_jobs)
+        # 2 + 3. Match already-ingested jobs and apply as one stream: high
+        # matches are applied to while the rest are still being scored
+        high_matches: asyncio.Queue = asyncio.Queue()
+        applications: List[Dict] = []
+        applier = asyncio.create_task(self._process_applications(
+            user_id, user_profile, high_matches, applications, preferences.get('max_applications', 50)
+        ))
+        try:
+            matched_jobs = await self._find_matching_jobs(user_profile, preferences, high_matches.put_nowait)
+        finally:
+            # The applier is awaited even when matching fails, so it is never left running;
+            # the matching error, if any, is the one raised
+            high_matches.put_nowait(None)
+            applier_outcome, = await asyncio.gather(applier, return_exceptions=True)
+        if isinstance(applier_outcome, BaseException):
+            raise applier_outcome
         
         # 4. Set up monitoring and follow-ups
         await self._setup_application_tracking(user_id, applications)
@@ -44,44 +96,158 @@ class AgentOrchestrator:
         enhanced_profile = await self.resume_agent.enhance_profile(documents)
         return enhanced_profile
     
-    async def _find_matching_jobs(self, user_profile: Dict, preferences: Dict) -> List[Dict]:
-        """Find and match jobs based on user profile and preferences"""
-        all_jobs = await self.job_matcher.scrape_multiple_sources(
-            keywords=preferences.get('keywords', []),
-            locations=preferences.get('locations', []),
-            industries=preferences.get('industries', [])
+    async def _find_matching_jobs(self, user_profile: Dict, preferences: Dict,
+                                  on_high_match: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """Stream already-ingested jobs through dedup, pre-filters and scoring into the top 50 matches.
+
+        The TF-IDF job index narrows the stream to the jobs most similar to
+        the user's resume; with an empty index every recent job is streamed.
+        """
+        provinces = {LOCATION_INDEX.province_for(location) for location in preferences.get('locations', [])}
+        provinces.discard(None)
+        since_days = preferences.get('max_job_age_days', 30)
+        # Dated before the top-k cut, so older similar postings cannot crowd out the ones streamed below
+        candidates = await asyncio.to_thread(
+            self.job_matcher.indexed_candidates, user_profile, INDEX_TOP_K, date.today() - timedelta(days=since_days)
+        )
+        jobs = self.job_store.stream_jobs(
+            provinces=provinces,
+            skills=user_profile.get('skills', []),
+            since_days=since_days,
+            job_ids=[job['id'] for job in candidates if 'id' in job] if candidates else None
         )
         
-        matched_jobs = self.job_matcher.calculate_matches(all_jobs, user_profile)
-        return matched_jobs[:50]  # Limit to top 50 matches
+        pipeline = JobPipeline(user_profile, preferences, matcher=self.job_matcher, top_k=50)
+        return await pipeline.run(jobs, on_high_match=on_high_match)
     
-    async def _process_applications(self, user_id: str, user_profile: Dict, jobs: List[Dict]) -> List[Dict]:
-        """Process and submit job applications"""
-        applications = []
-        
-        for job in jobs:
-            if job['match_score'] >= 80:  # Only apply to high-match jobs
-                try:
-                    application_result = await self.application_agent.submit_application(
-                        user_id, user_profile, job
-                    )
-                    applications.append(application_result)
-                    
-                    # Notify user
-                    await self.communication_agent.send_application_confirmation(
-                        user_id, job, application_result
-                    )
-                    
-                    await asyncio.sleep(2)  # Rate limiting
-                    
-                except Exception as e:
-                    print(f"Error applying to {job['company']}: {e}")
-                    continue
-        
-        return applications
+    async def _process_applications(self, user_id: str, user_profile: Dict, jobs: asyncio.Queue,
+                                    applications: List[Dict], max_applications: int = 50) -> List[Dict]:
+        """Submit applications for high-match jobs concurrently as the pipeline produces them, until a None arrives.
+
+        Cover letters for upcoming jobs are generated while earlier ones are
+        being submitted; per-user and per-employer limits replace the fixed
+        sleep between applications and confirmations go out in the background.
+        """
+        submit_application = getattr(self.application_agent, 'submit_application', None)
+        if submit_application is None:
+            # Nothing can send an application, so no cover letter is paid for
+            print(f"No application submitter is configured; skipping applications for user {user_id}")
+            return applications
+
+        resume_text = user_profile.get('raw_text') or user_profile.get('resume_text') or ''
+
+        async def high_matches():
+            while True:
+                job = await jobs.get()
+                if job is None:
+                    return
+                yield job
+
+        async def prepare(job: Dict) -> Dict:
+            # A retried job or the same posting on another board gets the letter already written for it
+            cover_letter = await self.application_agent.generate_cover_letter(
+                job, user_profile, resume_text, cache_sampled=True
+            )
+            return {**job, 'cover_letter': cover_letter}
+
+        async def submit(job: Dict) -> Dict:
+            result = await submit_application(user_id, user_profile, job)
+            return {**(result or {}), 'job': job}
+
+        return await get_application_executor().run(
+            user_id, high_matches(), prepare, submit,
+            confirm=lambda job, result: self.communication_agent.send_application_confirmation(user_id, job, result),
+            max_applications=max_applications,
+            on_result=applications.append
+        )
+
+    async def _setup_application_tracking(self, user_id: str, applications: List[Dict]):
+        """Record submitted applications, keyed to their canonical vacancy and due for a follow-up"""
+        if not applications:
+            return
+        now = datetime.utcnow()
+        rows = []
+        for application in applications:
+            job = application.get('job', {})
+            rows.append(JobApplication(
+                user_id=int(user_id),
+                job_title=job.get('title'),
+                company=job.get('company'),
+                job_url=job.get('url') or job.get('job_url'),
+                canonical_job_id=job.get('canonical_id'),
+                application_date=now,
+                status='applied',
+                match_score=job.get('match_score'),
+                application_data=json.loads(json.dumps(
+                    {key: value for key, value in application.items() if key != 'job'}, default=str
+                )),
+                next_follow_up_at=now + FOLLOW_UP_AFTER
+            ))
+        async with get_database().session() as session, session.begin():
+            session.add_all(rows)
+
+@celery_app.task
+def start_automation_cycle(user_id: str, preferences: Optional[Dict] = None):
+    """Celery task to start automation cycle on the worker's shared loop and agents"""
+    return get_worker_runtime().run_cycle(user_id, preferences)
+
+def schedule_automation_cycle(user_id, preferences: Optional[Dict] = None):
+    """Queue a user's cycle on their shard so it always runs in the same worker process"""
+    return start_automation_cycle.apply_async((str(user_id), preferences), queue=shard_queue(user_id))
+
+async def refresh_job_listings(keywords: List[str], locations: List[str], include_international: bool = False) -> Dict:
+    """Scrape the boards once and upsert the results into the jobs table"""
+    streams = [SouthAfricaJobScrapers().iter_jobs(keywords, locations)]
+    if include_international:
+        streams.append(InternationalJobScraper().iter_jobs(keywords))
+    return await get_job_store().ingest(merge_job_streams(*streams))
 
 @celery_app.task
-def start_automation_cycle(user_id: str, preferences: Dict):
-    """Celery task to start automation cycle"""
-    orchestrator = AgentOrchestrator()
-    return asyncio.run(orchestrator.full_cycle_automation(user_id, preferences))
+def ingest_job_listings(keywords: List[str], locations: List[str], include_international: bool = False):
+    """Celery task that refreshes the shared jobs table; user cycles only read from it"""
+    return get_worker_runtime().run(refresh_job_listings(keywords, locations, include_international))
+
+async def schedule_cycles_for_new_jobs(since: datetime, min_score: float = 80) -> int:
+    """Start an automation cycle for every user with a high match among the jobs first seen since ``since``.
+
+    Settings narrow the batch to the jobs each user accepts; the profile index
+    then scores only each job's candidate users. Users whose profile is not
+    indexed yet are scheduled anyway, since their first cycle builds it.
+    """
+    jobs = await get_job_store().query_new_jobs(since)
+    accepted = await get_search_settings_store().candidates_for_jobs(jobs)
+    index = get_user_profile_index()
+    matches = await asyncio.to_thread(index.match_jobs, jobs, min_score, accepted)
+
+    scheduled = {user_id for user_id in accepted if user_id not in index.profiles}
+    for user_id, matched_jobs in matches.items():
+        accepted_ids = {job['id'] for job in accepted[user_id]}
+        if any(job['id'] in accepted_ids for job in matched_jobs):
+            scheduled.add(user_id)
+    for user_id in scheduled:
+        schedule_automation_cycle(user_id)
+    return len(scheduled)
+
+async def refresh_and_schedule() -> Dict:
+    """Refresh the demanded searches, hand the newly seen jobs to the users they suit and prune the text index"""
+    started = datetime.utcnow()
+    report = await ScrapeDemandAggregator().run()
+    report['users_scheduled'] = await schedule_cycles_for_new_jobs(started)
+    report['index_rows_pruned'] = await get_job_store().prune_index()
+    return report
+
+@celery_app.task
+def refresh_demanded_listings():
+    """Celery task: scrape each distinct search across all active users once per freshness window"""
+    report = get_worker_runtime().run(refresh_and_schedule())
+    print(f"Scrape demand: {report['distinct_searches']} distinct of {report['requested_searches']} requested "
+          f"(ratio {report['dedup_ratio']}), {report['scrape_calls_saved']} scrape calls saved, "
+          f"{report['users_scheduled']} users scheduled")
+    return report
+
+celery_app.conf.beat_schedule = {
+    'refresh-demanded-listings': {
+        'task': refresh_demanded_listings.name,
+        'schedule': REFRESH_LISTINGS_EVERY
+    }
+}
@@ -4,6 +4,11 @@ from langchain.tools import Tool
 from langchain.memory import ConversationBufferMemory
 from pydantic_ai import Agent
 from ..config import settings
+from ..llm_cache import get_llm_cache
+from .prompt_builder import COVER_LETTER_BUDGET, CUSTOMIZE_RESUME_BUDGET, get_prompt_builder
+
+# Bump a template's version whenever its prompt changes so cached outputs are not reused
+TEMPLATE_VERSIONS = {'cover_letter': 2, 'customize_resume': 2}
 
 class ApplicationAgent:
     def __init__(self):
@@ -19,16 +24,30 @@ class ApplicationAgent:
         )
         
         self.memory = ConversationBufferMemory()
+        self.cache = get_llm_cache()
+        self.prompt_builder = get_prompt_builder()
     
-    async def generate_cover_letter(self, job_data: dict, candidate_profile: dict, resume_text: str) -> str:
-        """Generate personalized cover letter for a job application"""
+    async def generate_cover_letter(self, job_data: dict, candidate_profile: dict, resume_text: str,
+                                    cache_sampled: bool = False) -> str:
+        """Generate personalized cover letter for a job application.
+
+        Letters are sampled (temperature 0.7); with ``cache_sampled`` a letter
+        already written for the same inputs is reused instead of a new one.
+        """
+        
+        # Only the resume lines and job ad lines that bear on this job's skills, within budget
+        compact = self.prompt_builder.build(
+            'cover_letter', resume_text, job_data.get('description', ''), COVER_LETTER_BUDGET,
+            job_title=job_data.get('title', '')
+        )
+        self._report_prompt('cover_letter', compact['report'])
         
         prompt = f"""
         Generate a compelling cover letter for the following job opportunity:
         
         Job Title: {job_data.get('title')}
         Company: {job_data.get('company')}
-        Job Description: {job_data.get('description', '')}
+        Job Description: {compact['job_description']}
         
         Candidate Profile:
         - Skills: {', '.join(candidate_profile.get('skills', []))}
@@ -36,7 +55,7 @@ class ApplicationAgent:
         - Education: {candidate_profile.get('education')}
         
         Resume Highlights:
-        {resume_text[:1000]}
+        {compact['resume']}
         
         Create a professional, engaging cover letter that:
         1. Addresses the hiring manager personally if possible
@@ -48,29 +67,47 @@ class ApplicationAgent:
         Keep it concise (under 400 words) and impactful.
         """
         
-        response = await self.llm.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are a professional career coach and resume writer."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=1000,
-            temperature=0.7
+        params = {'max_tokens': 1000, 'temperature': 0.7}
+        
+        async def complete() -> str:
+            response = await self.llm.chat.completions.create(
+                model="gpt-4",
+                messages=[
+                    {"role": "system", "content": "You are a professional career coach and resume writer."},
+                    {"role": "user", "content": prompt}
+                ],
+                **params
+            )
+            return response.choices[0].message.content
+        
+        return await self.cache.cached(
+            complete, model="gpt-4", template='cover_letter', version=TEMPLATE_VERSIONS['cover_letter'],
+            inputs={
+                'title': job_data.get('title'),
+                'company': job_data.get('company'),
+                'description': compact['job_description'],
+                'skills': candidate_profile.get('skills', []),
+                'experience': candidate_profile.get('experience'),
+                'education': candidate_profile.get('education'),
+                'resume': compact['resume']
+            },
+            params=params, cache_sampled=cache_sampled
         )
-        
-        return response.choices[0].message.content
     
-    async def customize_resume(self, original_resume: str, job_description: str) -> str:
-        """Customize resume for a specific job application"""
+    async def customize_resume(self, original_resume: str, job_description: str, cache_sampled: bool = False) -> str:
+        """Customize resume for a specific job application (reusing an earlier one with ``cache_sampled``)"""
+        
+        compact = self.prompt_builder.build('customize_resume', original_resume, job_description, CUSTOMIZE_RESUME_BUDGET)
+        self._report_prompt('customize_resume', compact['report'])
         
         prompt = f"""
         Customize this resume to better match the job description:
         
         ORIGINAL RESUME:
-        {original_resume}
+        {compact['resume']}
         
         JOB DESCRIPTION:
-        {job_description}
+        {compact['job_description']}
         
         Please:
         1. Emphasize relevant skills and experience
@@ -81,11 +118,23 @@ class ApplicationAgent:
         Return only the customized resume text.
         """
         
-        response = await self.llm.chat.completions.create(
-            model="gpt-4",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=2000,
-            temperature=0.3
-        )
+        params = {'max_tokens': 2000, 'temperature': 0.3}
+        
+        async def complete() -> str:
+            response = await self.llm.chat.completions.create(
+                model="gpt-4",
+                messages=[{"role": "user", "content": prompt}],
+                **params
+            )
+            return response.choices[0].message.content
         
-        return response.choices[0].message.content
+        return await self.cache.cached(
+            complete, model="gpt-4", template='customize_resume', version=TEMPLATE_VERSIONS['customize_resume'],
+            inputs={'resume': compact['resume'], 'job_description': compact['job_description']},
+            params=params, cache_sampled=cache_sampled
+        )
+    
+    def _report_prompt(self, prompt: str, report: dict):
+        if report['tokens_saved'] > 0:
+            print(f"{prompt} prompt: {report['tokens_before']} -> {report['tokens_after']} input tokens "
+                  f"({report['tokens_saved']} saved)")
@@ -0,0 +1,168 @@
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+from ..job_scraping.scrapers.job_dedup import normalize_company
+from ..job_scraping.scrapers.scrape_scheduler import HostBucket
+
+class ApplicationExecutor:
+    """Concurrent application submission with per-user and per-employer limits.
+
+    Each job goes through three stages:
+
+    * ``prepare`` - LLM work such as the cover letter, at most
+      ``llm_concurrency`` calls at a time across the process,
+    * ``submit`` - at most ``per_user_concurrency`` in flight per user, a
+      token bucket per employer (``employer_rate`` per second, keyed on the
+      normalized company name and shared by every user applying there) and
+      one per job board host (``board_rate``), since many employers'
+      listings are submitted through the same board,
+    * ``confirm`` - sent in the background and never holds up the next job.
+
+    Because stages hold separate limits, the next job's LLM generation
+    overlaps the previous job's submission. Results are collected in
+    completion order, and a failed job is logged without stalling the rest.
+    """
+
+    def __init__(self, per_user_concurrency: int = 4, llm_concurrency: int = 8,
+                 employer_rate: float = 0.5, employer_burst: float = 2,
+                 employer_rates: Optional[Dict[str, float]] = None,
+                 board_rate: float = 2, board_burst: float = 5,
+                 board_rates: Optional[Dict[str, float]] = None):
+        self.per_user_concurrency = per_user_concurrency
+        self.llm_concurrency = llm_concurrency
+        self.employer_rate = employer_rate
+        self.employer_burst = employer_burst
+        self.employer_rates = employer_rates or {}
+        self.board_rate = board_rate
+        self.board_burst = board_burst
+        self.board_rates = board_rates or {}
+        self.buckets: Dict[str, HostBucket] = {}
+        self.board_buckets: Dict[str, HostBucket] = {}
+        self.stats = {'submitted': 0, 'failed': 0, 'confirmations_failed': 0}
+        self._user_slots: Dict[Any, asyncio.Semaphore] = {}
+        self._llm_slots = None
+        self._loop = None
+
+    async def run(self, user_id, jobs: AsyncIterator[Dict],
+                  prepare: Callable[[Dict], Awaitable[Dict]],
+                  submit: Callable[[Dict], Awaitable[Dict]],
+                  confirm: Optional[Callable[[Dict, Dict], Awaitable[Any]]] = None,
+                  max_applications: int = 50,
+                  on_result: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """Apply to jobs as they arrive until the stream ends; returns the results in completion order.
+
+        The stream keeps being drained after ``max_applications`` so its
+        producer never blocks; failed jobs free their slot for a later one.
+        """
+        self._bind_to_running_loop()
+        results: List[Dict] = []
+        pending, confirmations = set(), set()
+        reserved = 0
+
+        async def apply(job: Dict):
+            nonlocal reserved
+            try:
+                async with self._llm_slots:
+                    prepared = await prepare(job)
+                async with self._user_slot(user_id):
+                    await self._bucket(job).acquire()
+                    board = self._board_bucket(job)
+                    if board is not None:
+                        await board.acquire()
+                    result = await submit(prepared)
+            except Exception as e:
+                reserved -= 1
+                self.stats['failed'] += 1
+                print(f"Error applying to {job.get('company')}: {e}")
+                return
+            self.stats['submitted'] += 1
+            results.append(result)
+            if on_result:
+                on_result(result)
+            if confirm:
+                self._spawn(confirmations, self._confirm(confirm, job, result))
+
+        try:
+            async for job in jobs:
+                if reserved >= max_applications:
+                    continue
+                reserved += 1
+                self._spawn(pending, apply(job))
+            while pending:
+                await asyncio.gather(*pending)
+            while confirmations:
+                await asyncio.gather(*confirmations)
+        finally:
+            for task in pending | confirmations:
+                task.cancel()
+        return results
+
+    def report(self) -> Dict:
+        """Counters plus the submissions and average wait per employer and per board host"""
+        def waits(buckets: Dict[str, HostBucket]) -> Dict:
+            return {
+                key: {
+                    'submissions': bucket.stats['requests'],
+                    'avg_wait_ms': round(1000 * bucket.stats['waited_seconds'] / bucket.stats['requests'], 1)
+                    if bucket.stats['requests'] else None
+                }
+                for key, bucket in buckets.items()
+            }
+
+        return {**self.stats, 'employers': waits(self.buckets), 'boards': waits(self.board_buckets)}
+
+    async def _confirm(self, confirm, job: Dict, result: Dict):
+        try:
+            await confirm(job, result)
+        except Exception as e:
+            self.stats['confirmations_failed'] += 1
+            print(f"Error confirming application to {job.get('company')}: {e}")
+
+    def _spawn(self, tasks: set, coro):
+        task = asyncio.create_task(coro)
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    def _bucket(self, job: Dict) -> HostBucket:
+        """Token bucket of the employer ('ABC (Pty) Ltd' and 'ABC' share one; the host when there is no company)"""
+        key = normalize_company(job.get('company') or '') or self._host(job) or 'unknown'
+        if key not in self.buckets:
+            rate = self.employer_rates.get(key, self.employer_rate)
+            self.buckets[key] = HostBucket(rate, self.employer_burst, rate, rate)
+        return self.buckets[key]
+
+    def _board_bucket(self, job: Dict) -> Optional[HostBucket]:
+        """Token bucket of the host the application is submitted through, if the job has a URL"""
+        host = self._host(job)
+        if not host:
+            return None
+        if host not in self.board_buckets:
+            rate = self.board_rates.get(host, self.board_rate)
+            self.board_buckets[host] = HostBucket(rate, self.board_burst, rate, rate)
+        return self.board_buckets[host]
+
+    def _host(self, job: Dict) -> str:
+        host = urlparse(job.get('url') or job.get('job_url') or '').netloc.lower()
+        return host[4:] if host.startswith('www.') else host
+
+    def _user_slot(self, user_id) -> asyncio.Semaphore:
+        if user_id not in self._user_slots:
+            self._user_slots[user_id] = asyncio.Semaphore(self.per_user_concurrency)
+        return self._user_slots[user_id]
+
+    def _bind_to_running_loop(self):
+        # Semaphores belong to one event loop; Celery tasks each run their own
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._llm_slots = asyncio.Semaphore(self.llm_concurrency)
+            self._user_slots = {}
+
+_application_executor = None
+
+def get_application_executor() -> ApplicationExecutor:
+    """Process-wide executor so every user's cycle shares the employer budgets"""
+    global _application_executor
+    if _application_executor is None:
+        _application_executor = ApplicationExecutor()
+    return _application_executor
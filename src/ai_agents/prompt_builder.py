@@ -0,0 +1,205 @@
+import math
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from ..document_processing.resume_parser import ResumeParser
+
+try:
+    # Exact OpenAI token counts; the encoding is downloaded once and cached locally
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Token budgets per prompt input
+COVER_LETTER_BUDGET = {'resume': 600, 'job_description': 500}
+CUSTOMIZE_RESUME_BUDGET = {'resume': 2000, 'job_description': 700}
+
+# Resume sections in the order they are worth keeping when nothing else decides
+SECTION_PRIORITY = ('skills', 'experience', 'projects', 'certifications', 'personal', 'education', 'header')
+
+# Job ad lines that never tell the model anything about the role
+BOILERPLATE = re.compile(
+    r'equal opportunit|employment equity|\bee\s*/\s*aa\b|affirmative action|popia|protection of personal information'
+    r'|only shortlisted|not (?:heard|been contacted)|within (?:two|2|three|3) weeks|consider your application (?:as )?unsuccessful'
+    r'|apply (?:now|online|here)|click (?:here|apply)|share this job|cookies?\b|privacy policy|terms (?:and|&) conditions'
+    r'|recruitment agenc|reserves the right|follow us on|all rights reserved',
+    re.I
+)
+
+class Tokenizer:
+    """Local token counting and truncation for a model.
+
+    Uses tiktoken when it is installed and the model's encoding can be
+    loaded; otherwise estimates four characters per token.
+    """
+
+    def __init__(self, model: str = 'gpt-4'):
+        self.encoding = None
+        if tiktoken is not None:
+            try:
+                self.encoding = tiktoken.encoding_for_model(model)
+            except Exception as e:
+                print(f"tiktoken unavailable for {model}, estimating tokens: {e}")
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self.encoding is not None:
+            return len(self.encoding.encode(text, disallowed_special=()))
+        return math.ceil(len(text) / 4)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        if self.count(text) <= max_tokens:
+            return text
+        if self.encoding is not None:
+            return self.encoding.decode(self.encoding.encode(text, disallowed_special=())[:max_tokens])
+        cut = text[:max_tokens * 4]
+        return cut.rsplit(' ', 1)[0] if ' ' in cut else cut
+
+class PromptBuilder:
+    """Fits resumes and job descriptions into per-prompt token budgets.
+
+    * Job descriptions lose boilerplate: known legal/apply-now lines and
+      lines repeated within the posting. When the rest does not fit, the
+      lines naming the most of the job's skills are kept, in their
+      original order.
+    * Resumes are split into ResumeParser's sections and the lines that
+      mention the job's skills are kept first, then the rest by section
+      priority, until the budget is spent. Output keeps the resume's order.
+
+    Compaction depends only on the inputs and the budget (no state learned
+    from earlier postings), so the same posting always yields the same
+    prompt and the LLM response cache keyed on it keeps hitting. Every call
+    reports the tokens before and after, and totals are kept per prompt in
+    ``stats``.
+    """
+
+    def __init__(self, parser: Optional[ResumeParser] = None, tokenizer: Optional[Tokenizer] = None):
+        self.parser = parser or ResumeParser()
+        self.skill_extractor = self.parser.skill_extractor
+        self.tokenizer = tokenizer or Tokenizer()
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def build(self, prompt: str, resume_text: str, job_description: str, budget: Dict[str, int],
+              job_title: str = '') -> Dict:
+        """Compacted resume and job description for one prompt, with its token report"""
+        skill_ids = set(self.skill_extractor.extract(f"{job_title}\n{job_description}"))
+        resume = self.compact_resume(resume_text, skill_ids, budget['resume'])
+        description = self.compact_job_description(job_description, skill_ids, budget['job_description'])
+
+        before = self.tokenizer.count(resume_text) + self.tokenizer.count(job_description)
+        after = self.tokenizer.count(resume) + self.tokenizer.count(description)
+        totals = self.stats.setdefault(prompt, {'calls': 0, 'tokens_before': 0, 'tokens_after': 0})
+        totals['calls'] += 1
+        totals['tokens_before'] += before
+        totals['tokens_after'] += after
+        return {
+            'resume': resume,
+            'job_description': description,
+            'report': {'tokens_before': before, 'tokens_after': after, 'tokens_saved': before - after}
+        }
+
+    def compact_job_description(self, description: str, skill_ids: Set[str], max_tokens: int) -> str:
+        lines, seen = [], set()
+        for line in self._lines(description):
+            key = self._line_key(line)
+            if key in seen or BOILERPLATE.search(line):
+                continue
+            seen.add(key)
+            lines.append(line)
+
+        scores = [self._relevance(line, skill_ids) for line in lines]
+        return '\n'.join(lines[i] for i in self._select(lines, scores, max_tokens))
+
+    def compact_resume(self, resume_text: str, skill_ids: Set[str], max_tokens: int) -> str:
+        if self.tokenizer.count(resume_text) <= max_tokens:
+            return resume_text.strip()
+        entries: List[Tuple[int, str]] = []
+        lines: List[str] = []
+        scores: List[float] = []
+        sections = self._sections(resume_text)
+        for number, (section, section_lines) in enumerate(sections):
+            rank = SECTION_PRIORITY.index(section) if section in SECTION_PRIORITY else len(SECTION_PRIORITY)
+            for line in section_lines:
+                entries.append((number, section))
+                lines.append(line)
+                scores.append(10 * self._relevance(line, skill_ids) + (len(SECTION_PRIORITY) - rank) / 10)
+        if sections and sections[0][0] == 'header':
+            scores[0] = float('inf')  # the candidate's name, as ResumeParser._extract_name reads it
+
+        # Reserve room for the section headings put back in front of kept lines
+        output, current = [], None
+        for i in self._select(lines, scores, max(0, max_tokens - 3 * len(sections))):
+            number, section = entries[i]
+            if number != current:
+                current = number
+                if section != 'header':
+                    output.append(section.upper())
+            output.append(lines[i])
+        return '\n'.join(output)
+
+    def metrics(self) -> Dict:
+        """Per-prompt calls and tokens before/after compaction"""
+        return {
+            prompt: {**totals, 'tokens_saved': totals['tokens_before'] - totals['tokens_after']}
+            for prompt, totals in self.stats.items()
+        }
+
+    def _select(self, lines: List[str], scores: List[float], max_tokens: int) -> List[int]:
+        """Indexes of the best-scoring lines that fit in max_tokens, in their original order.
+
+        If not even the best line fits, it is truncated in place; if the
+        budget leaves no room for any of it, nothing is selected.
+        """
+        budget = max(0, max_tokens)
+        kept = []
+        for i in sorted(range(len(lines)), key=lambda i: (-scores[i], i)):
+            cost = self.tokenizer.count(lines[i]) + 1
+            if cost <= budget:
+                kept.append(i)
+                budget -= cost
+            elif not kept:
+                if budget > 1:  # one token goes to the line break
+                    lines[i] = self.tokenizer.truncate(lines[i], budget - 1)
+                    kept.append(i)
+                break
+        return sorted(kept)
+
+    def _relevance(self, line: str, skill_ids: Set[str]) -> float:
+        return sum(1 for skill_id in self.skill_extractor.extract(line) if skill_id in skill_ids)
+
+    def _sections(self, resume_text: str) -> List[Tuple[str, List[str]]]:
+        """Resume lines grouped under ResumeParser's section names, in resume order.
+
+        Only short lines count as headings, so "5 years experience in Java"
+        stays a line of the current section.
+        """
+        sections = [('header', [])]
+        for line in resume_text.split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+            section = self.parser._identify_section(line) if len(line.split()) <= 4 else None
+            if section:
+                sections.append((section, []))
+            else:
+                sections[-1][1].append(line)
+        return [(section, lines) for section, lines in sections if lines]
+
+    def _lines(self, text: str) -> Iterable[str]:
+        # Ads often arrive as one paragraph; split on sentences as well as lines
+        for line in re.split(r'\n+|(?<=[.!?])\s+(?=[A-Z])', text or ''):
+            line = line.strip(' \t-*•')
+            if line:
+                yield line
+
+    def _line_key(self, line: str) -> str:
+        return re.sub(r'\W+', ' ', line.lower()).strip()
+
+_prompt_builder = None
+
+def get_prompt_builder() -> PromptBuilder:
+    """Process-wide prompt builder, so token savings are reported across all users"""
+    global _prompt_builder
+    if _prompt_builder is None:
+        _prompt_builder = PromptBuilder()
+    return _prompt_builder
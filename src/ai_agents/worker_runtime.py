@@ -0,0 +1,180 @@
+"""Long-lived per-process runtime for the automation Celery workers.
+
+    python -m src.ai_agents.worker_runtime [--shards 4] [--first-shard 0] [--processes 4] [--concurrency 32]
+
+starts Celery worker processes for shards [first-shard, shards), each with a
+thread pool that feeds one shared event loop. Shards are dealt round-robin,
+so with fewer processes than shards each process consumes several
+automation.shard.N queues and every shard still has exactly one consumer.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import threading
+import zlib
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from ..database.session import get_database
+from ..http_client import get_http_registry
+
+# Total automation shards; producers and workers must agree on it
+AUTOMATION_SHARDS = int(os.environ.get('AUTOMATION_SHARDS', 4))
+
+def shard_for(user_id, shards: int = AUTOMATION_SHARDS) -> int:
+    """Stable shard of a user (crc32, not hash(), so every process agrees)"""
+    return zlib.crc32(str(user_id).encode('utf-8')) % shards
+
+def shard_queue(user_id, shards: int = AUTOMATION_SHARDS) -> str:
+    return f"automation.shard.{shard_for(user_id, shards)}"
+
+def _default_orchestrator():
+    from .agents_orchestrator import AgentOrchestrator
+    return AgentOrchestrator()
+
+class WorkerRuntime:
+    """One event loop and one agent set per worker process.
+
+    The loop runs forever in a background thread. Celery task threads hand it
+    coroutines with ``run``/``run_cycle`` and block on the result, so up to
+    ``max_concurrent_cycles`` user cycles share the loop, the orchestrator
+    (built once, on first use), the HTTP connection pool and the database
+    pool, instead of each task paying for asyncio.run() and fresh clients.
+    Users are sharded to processes, so a second request for a user whose
+    cycle is still running here joins that cycle instead of starting another.
+    """
+
+    def __init__(self, max_concurrent_cycles: int = 32,
+                 orchestrator_factory: Optional[Callable[[], Any]] = None):
+        self.max_concurrent_cycles = max_concurrent_cycles
+        self.orchestrator_factory = orchestrator_factory or _default_orchestrator
+        self.stats = {'cycles': 0, 'coalesced': 0, 'failed': 0, 'running': 0}
+        self._orchestrator = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._cycles: Dict[Any, Future] = {}
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the loop thread and open the shared HTTP pool; idempotent"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever, name='worker-runtime', daemon=True)
+            self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._on_start(), self._loop).result()
+
+    def submit(self, coro: Awaitable) -> Future:
+        """Schedule a coroutine on the runtime loop"""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the runtime loop and wait for its result (from any thread but the loop's)"""
+        return self.submit(coro).result(timeout)
+
+    def run_cycle(self, user_id, preferences: Optional[Dict] = None, timeout: Optional[float] = None) -> Dict:
+        """Full automation cycle for a user, joining the one already running for them if any"""
+        self.start()
+        with self._lock:
+            future = self._cycles.get(user_id)
+            if future is not None and not future.done():
+                self.stats['coalesced'] += 1
+            else:
+                future = asyncio.run_coroutine_threadsafe(self._cycle(user_id, preferences), self._loop)
+                self._cycles[user_id] = future
+                future.add_done_callback(lambda done: self._forget(user_id, done))
+        return future.result(timeout)
+
+    def stop(self, timeout: float = 30):
+        """Close the HTTP and database pools on the loop, then stop it"""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._on_stop(), self._loop).result(timeout)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
+            self._thread = None
+
+    async def _cycle(self, user_id, preferences: Optional[Dict]) -> Dict:
+        async with self._slots:
+            self.stats['running'] += 1
+            try:
+                if self._orchestrator is None:
+                    self._orchestrator = self.orchestrator_factory()
+                result = await self._orchestrator.full_cycle_automation(user_id, preferences)
+                self.stats['cycles'] += 1
+                return result
+            except Exception:
+                self.stats['failed'] += 1
+                raise
+            finally:
+                self.stats['running'] -= 1
+
+    async def _on_start(self):
+        self._slots = asyncio.Semaphore(self.max_concurrent_cycles)
+        await get_http_registry().start()
+
+    async def _on_stop(self):
+        await get_http_registry().close()
+        await get_database().dispose()
+
+    def _forget(self, user_id, future: Future):
+        with self._lock:
+            if self._cycles.get(user_id) is future:
+                del self._cycles[user_id]
+
+_worker_runtime = None
+
+def get_worker_runtime() -> WorkerRuntime:
+    """Process-wide runtime, sized by WORKER_CONCURRENCY (the Celery thread pool size)"""
+    global _worker_runtime
+    if _worker_runtime is None:
+        _worker_runtime = WorkerRuntime(max_concurrent_cycles=int(os.environ.get('WORKER_CONCURRENCY', 32)))
+    return _worker_runtime
+
+def assign_shards(first_shard: int, shards: int, processes: int) -> List[List[int]]:
+    """Shards [first_shard, shards) dealt round-robin to at most ``processes`` workers"""
+    owned = list(range(first_shard, shards))
+    return [owned[i::processes] for i in range(min(processes, len(owned)))]
+
+def _run_worker(worker_shards: List[int], concurrency: int, loglevel: str):
+    os.environ['WORKER_CONCURRENCY'] = str(concurrency)
+    from .agents_orchestrator import celery_app
+    queues = ','.join(f'automation.shard.{shard}' for shard in worker_shards)
+    celery_app.worker_main([
+        'worker',
+        f'--loglevel={loglevel}',
+        '--pool=threads',
+        f'--concurrency={concurrency}',
+        '--prefetch-multiplier=1',
+        '-Q', f'{queues},celery',
+        '-n', f'automation{worker_shards[0]}@%h'
+    ])
+
+def main():
+    parser = argparse.ArgumentParser(description="Run sharded automation workers")
+    parser.add_argument('--shards', type=int, default=AUTOMATION_SHARDS, help='total shards across all hosts')
+    parser.add_argument('--first-shard', type=int, default=0, help='first shard served by this host')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='worker processes; shards are spread over them (default: one per shard, up to the CPUs)')
+    parser.add_argument('--concurrency', type=int, default=32, help='concurrent user cycles per process')
+    parser.add_argument('--loglevel', default='info')
+    args = parser.parse_args()
+
+    os.environ['AUTOMATION_SHARDS'] = str(args.shards)
+    processes = args.processes or min(args.shards - args.first_shard, os.cpu_count() or 1)
+    workers = [
+        multiprocessing.Process(target=_run_worker, args=(worker_shards, args.concurrency, args.loglevel))
+        for worker_shards in assign_shards(args.first_shard, args.shards, processes)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+if __name__ == '__main__':
+    main()
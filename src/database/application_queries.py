@@ -0,0 +1,110 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+from sqlalchemy import and_, func, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from .models import FOLLOW_UP_DUE, JobApplication
+
+# Columns returned by listings; the JSON payload columns are only loaded for a single application
+LISTING_COLUMNS = (
+    JobApplication.id, JobApplication.job_title, JobApplication.company, JobApplication.job_url,
+    JobApplication.canonical_job_id, JobApplication.application_date, JobApplication.status,
+    JobApplication.match_score, JobApplication.next_follow_up_at
+)
+
+def encode_cursor(application_date: datetime, application_id: int) -> str:
+    return f"{application_date.isoformat()}~{application_id}"
+
+def decode_cursor(cursor: str):
+    """(application_date, id) of the last row of the previous page"""
+    try:
+        value, application_id = cursor.rsplit('~', 1)
+        return datetime.fromisoformat(value), int(application_id)
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+async def list_applications(db: AsyncSession, user_id: int, status: Optional[str] = None,
+                            from_date: Optional[datetime] = None, to_date: Optional[datetime] = None,
+                            limit: int = 50, cursor: Optional[str] = None) -> Dict:
+    """One page of a user's applications, newest first.
+
+    Keyset-paged on (application_date, id) so page N costs the same as page 1;
+    served by ix_job_applications_user_date, or ix_job_applications_user_status_date
+    when filtering by status. Pass the returned ``next_cursor`` to get the next page.
+    """
+    stmt = select(*LISTING_COLUMNS).where(JobApplication.user_id == user_id)
+    if status:
+        stmt = stmt.where(JobApplication.status == status)
+    if from_date:
+        stmt = stmt.where(JobApplication.application_date >= from_date)
+    if to_date:
+        stmt = stmt.where(JobApplication.application_date < to_date)
+    if cursor:
+        after_date, after_id = decode_cursor(cursor)
+        stmt = stmt.where(or_(
+            JobApplication.application_date < after_date,
+            and_(JobApplication.application_date == after_date, JobApplication.id < after_id)
+        ))
+    stmt = stmt.order_by(JobApplication.application_date.desc(), JobApplication.id.desc()).limit(limit + 1)
+
+    rows = [dict(row) for row in (await db.execute(stmt)).mappings()]
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]['application_date'], rows[-1]['id'])
+    return {'items': rows, 'next_cursor': next_cursor}
+
+async def status_counts(db: AsyncSession, user_id: int) -> Dict[str, int]:
+    """Number of applications per status, counted from the (user_id, status, ...) index alone"""
+    stmt = (
+        select(JobApplication.status, func.count())
+        .where(JobApplication.user_id == user_id)
+        .group_by(JobApplication.status)
+    )
+    return {status: count for status, count in await db.execute(stmt)}
+
+async def due_for_follow_up(db: AsyncSession, now: Optional[datetime] = None, limit: int = 500) -> List[Dict]:
+    """Open applications whose follow-up time has passed, oldest first, across all users.
+
+    The predicate is emitted as literal SQL so the planner can match it to the
+    partial ix_job_applications_follow_up_due index, which only holds open
+    applications with a follow-up scheduled.
+    """
+    stmt = (
+        select(JobApplication.user_id, *LISTING_COLUMNS)
+        .where(text(FOLLOW_UP_DUE), JobApplication.next_follow_up_at <= (now or datetime.utcnow()))
+        .order_by(JobApplication.next_follow_up_at)
+        .limit(limit)
+    )
+    return [dict(row) for row in (await db.execute(stmt)).mappings()]
+
+async def applied_companies(db: AsyncSession, user_id: int, companies: Iterable[str]) -> Set[str]:
+    """Which of the given companies the user has already applied to"""
+    companies = {company for company in companies if company}
+    if not companies:
+        return set()
+    stmt = select(JobApplication.company).distinct().where(
+        JobApplication.user_id == user_id, JobApplication.company.in_(companies)
+    )
+    return set(await db.scalars(stmt))
+
+async def applied_canonical_jobs(db: AsyncSession, user_id: int, canonical_job_ids: Iterable[int]) -> Set[int]:
+    """Which of the given vacancies (by canonical id, so any board's copy counts) the user has applied to"""
+    canonical_job_ids = {job_id for job_id in canonical_job_ids if job_id is not None}
+    if not canonical_job_ids:
+        return set()
+    stmt = select(JobApplication.canonical_job_id).distinct().where(
+        JobApplication.user_id == user_id, JobApplication.canonical_job_id.in_(canonical_job_ids)
+    )
+    return set(await db.scalars(stmt))
+
+async def has_applied(db: AsyncSession, user_id: int, company: Optional[str] = None,
+                      canonical_job_id: Optional[int] = None) -> bool:
+    """Whether the user already applied to this company, or to this vacancy when canonical_job_id is given"""
+    if canonical_job_id is not None:
+        condition = JobApplication.canonical_job_id == canonical_job_id
+    elif company:
+        condition = JobApplication.company == company
+    else:
+        return False
+    stmt = select(JobApplication.id).where(JobApplication.user_id == user_id, condition).limit(1)
+    return (await db.scalar(stmt)) is not None
@@ -0,0 +1,43 @@
+from typing import Dict, List, Optional
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from .models import JobApplication, User
+
+async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[Dict]:
+    """User columns as a dict, without loading an ORM instance"""
+    row = (await db.execute(select(User.__table__).where(User.id == user_id))).mappings().first()
+    return dict(row) if row else None
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[Dict]:
+    row = (await db.execute(select(User.__table__).where(User.email == email))).mappings().first()
+    return dict(row) if row else None
+
+async def bulk_insert_applications(db: AsyncSession, applications: List[Dict], chunk_size: int = 1000) -> List[int]:
+    """Insert many JobApplication rows with batched multi-row INSERTs; returns the new ids in order"""
+    ids = []
+    for start in range(0, len(applications), chunk_size):
+        result = await db.execute(
+            insert(JobApplication).returning(JobApplication.id, sort_by_parameter_order=True),
+            applications[start:start + chunk_size]
+        )
+        ids.extend(result.scalars().all())
+    await db.commit()
+    return ids
+
+async def bulk_update_application_status(db: AsyncSession, updates: List[Dict]) -> int:
+    """Apply [{'id': ..., 'status': ..., <other columns>}] as one executemany UPDATE by primary key"""
+    if not updates:
+        return 0
+    await db.execute(update(JobApplication), updates)
+    await db.commit()
+    return len(updates)
+
+async def set_application_status(db: AsyncSession, application_ids: List[int], status: str) -> int:
+    """Move many applications to the same status with a single UPDATE ... WHERE id IN"""
+    if not application_ids:
+        return 0
+    result = await db.execute(
+        update(JobApplication).where(JobApplication.id.in_(application_ids)).values(status=status)
+    )
+    await db.commit()
+    return result.rowcount
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, JSON, Text, Float
+from sqlalchemy import Column, Integer, String, DateTime, Date, Boolean, JSON, Text, Float, ForeignKey, Index, UniqueConstraint, text
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
@@ -23,31 +23,132 @@ class UserDocument(Base):
     document_type = Column(String)  # resume, cover_letter, photo, certificate
     original_path = Column(String)
     processed_path = Column(String)
-    metadata = Column(JSON)
+    document_metadata = Column("metadata", JSON)  # "metadata" is reserved on declarative models
     created_at = Column(DateTime, default=datetime.utcnow)
 
+# Applications still waiting on the employer; the only ones follow-ups are scheduled for
+FOLLOW_UP_DUE = "status IN ('applied', 'interview') AND next_follow_up_at IS NOT NULL"
+
 class JobApplication(Base):
     __tablename__ = "job_applications"
+    __table_args__ = (
+        # Per-user listings (optionally by status), keyset-paged on (application_date, id)
+        Index("ix_job_applications_user_date", "user_id", "application_date", "id"),
+        Index("ix_job_applications_user_status_date", "user_id", "status", "application_date", "id"),
+        Index("ix_job_applications_user_company", "user_id", "company"),
+        Index("ix_job_applications_user_canonical_job", "user_id", "canonical_job_id"),
+        Index("ix_job_applications_user_match", "user_id", "match_score"),
+        Index(
+            "ix_job_applications_follow_up_due", "next_follow_up_at",
+            postgresql_where=text(FOLLOW_UP_DUE), sqlite_where=text(FOLLOW_UP_DUE)
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, index=True)
+    user_id = Column(Integer)
     job_title = Column(String)
     company = Column(String)
     job_url = Column(String)
+    canonical_job_id = Column(Integer)  # cross-source vacancy id, see JobDeduplicator
     application_date = Column(DateTime, default=datetime.utcnow)
     status = Column(String, default="applied")  # applied, interview, rejected, offered
     match_score = Column(Float)
     application_data = Column(JSON)
     follow_up_tasks = Column(JSON)
+    next_follow_up_at = Column(DateTime)
 
 class ApplicationSettings(Base):
+    """A user's search settings.
+
+    Keywords, locations and target/excluded companies live in the user_*
+    tables below so candidate users for a job batch can be found with
+    indexed joins; ``preferences`` only holds the remaining free-form options.
+    """
     __tablename__ = "application_settings"
+    __table_args__ = (
+        Index("ix_application_settings_auto_apply_salary", "auto_apply", "salary_min"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, index=True)
     preferences = Column(JSON)
-    target_companies = Column(JSON)
-    excluded_companies = Column(JSON)
-    salary_range = Column(JSON)
-    locations = Column(JSON)
+    salary_min = Column(Float)
+    salary_max = Column(Float)
     auto_apply = Column(Boolean, default=True)
+
+class UserLocation(Base):
+    """A place a user wants to work, keyed by province code"""
+    __tablename__ = "user_locations"
+    __table_args__ = (
+        Index("ix_user_locations_province_user", "province", "user_id"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    province = Column(String(8))  # NULL when the place is unknown, or for "anywhere" ('' location)
+    location = Column(String, nullable=False)  # canonical place name
+
+class UserKeyword(Base):
+    """A normalized search keyword of a user"""
+    __tablename__ = "user_keywords"
+    
+    user_id = Column(Integer, primary_key=True)
+    keyword = Column(String, primary_key=True, index=True)
+
+class UserCompanyPreference(Base):
+    """A company a user targets or excludes, by normalized name"""
+    __tablename__ = "user_company_preferences"
+    __table_args__ = (
+        Index("ix_user_company_preferences_company", "company_key", "kind", "user_id"),
+    )
+    
+    user_id = Column(Integer, primary_key=True)
+    kind = Column(String(16), primary_key=True)  # target or excluded
+    company_key = Column(String, primary_key=True)  # see normalize_company
+    company = Column(String)  # as the user entered it
+
+class Job(Base):
+    """A scraped vacancy, upserted by (source, external_id) on every scrape batch"""
+    __tablename__ = "jobs"
+    __table_args__ = (
+        UniqueConstraint("source", "external_id", name="uq_jobs_source_external_id"),
+        Index("ix_jobs_province_posted", "province", "posted_date"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String(64), nullable=False)
+    external_id = Column(String(512), nullable=False)
+    canonical_id = Column(Integer, index=True)  # cross-source vacancy id from JobDeduplicator
+    url = Column(String)
+    title = Column(String, nullable=False)
+    company = Column(String)
+    location = Column(String)
+    province = Column(String(8), index=True)
+    posted_date = Column(Date, index=True)
+    salary_min = Column(Float, index=True)
+    salary_max = Column(Float)
+    description = Column(Text)
+    content_hash = Column(String(64), nullable=False)
+    first_seen_at = Column(DateTime, default=datetime.utcnow, index=True)
+    last_seen_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+class JobSkill(Base):
+    """Canonical skill ids mentioned by a job, for indexed skill lookups"""
+    __tablename__ = "job_skills"
+    
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+    skill_id = Column(String(64), primary_key=True, index=True)
+
+class ScrapeRun(Base):
+    """Last time a (source, keyword, location) search was scraped on behalf of all users"""
+    __tablename__ = "scrape_runs"
+    __table_args__ = (
+        UniqueConstraint("source", "keyword", "location", name="uq_scrape_runs_search"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String(64), nullable=False)
+    keyword = Column(String, nullable=False)
+    location = Column(String, nullable=False)
+    last_scraped_at = Column(DateTime, nullable=False, index=True)
+    jobs_found = Column(Integer, default=0)
@@ -0,0 +1,164 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+from ..config import settings
+
+def async_database_url(url: str) -> str:
+    """Map a plain DATABASE_URL onto its async driver (asyncpg for Postgres, aiosqlite for SQLite)"""
+    if url.startswith('postgres://'):
+        url = 'postgresql://' + url[len('postgres://'):]
+    if url.startswith('postgresql://'):
+        return 'postgresql+asyncpg://' + url[len('postgresql://'):]
+    if url.startswith('sqlite://'):
+        return 'sqlite+aiosqlite://' + url[len('sqlite://'):]
+    return url
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = {'checkouts': 0, 'checkout_seconds': 0.0, 'max_checkout_seconds': 0.0, 'timeouts': 0}
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics['timeouts'] += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.metrics['checkouts'] += 1
+            self.metrics['checkout_seconds'] += waited
+            self.metrics['max_checkout_seconds'] = max(self.metrics['max_checkout_seconds'], waited)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics  # keep counters across pool recycling
+        return pool
+
+class Database:
+    """Application-wide async engine and session factory.
+
+    Postgres goes through asyncpg and SQLite through aiosqlite. The pool is
+    sized for the API plus background work (pool_size + max_overflow
+    connections, pre-ping, recycled every pool_recycle seconds) and reports
+    checkout latency and saturation through pool_metrics(). Like the HTTP
+    client registry, the engine is bound to the event loop that first used
+    it and is rebuilt if a different loop asks for it.
+    """
+
+    def __init__(self, url: Optional[str] = None, pool_size: int = 10, max_overflow: int = 20,
+                 pool_timeout: float = 10, pool_recycle: int = 1800, echo: bool = False):
+        self.url = async_database_url(url or settings.DATABASE_URL)
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_timeout = pool_timeout
+        self.pool_recycle = pool_recycle
+        self.echo = echo
+        self._engine: Optional[AsyncEngine] = None
+        self._sessionmaker: Optional[async_sessionmaker] = None
+        self._loop = None
+
+    @property
+    def engine(self) -> AsyncEngine:
+        self._bind_to_running_loop()
+        return self._engine
+
+    @property
+    def sessionmaker(self) -> async_sessionmaker:
+        self._bind_to_running_loop()
+        return self._sessionmaker
+
+    def _bind_to_running_loop(self):
+        loop = asyncio.get_running_loop()
+        if self._engine is None or self._loop is not loop:
+            if self._engine is not None:
+                self._discard_engine(self._engine, self._loop)
+            self._loop = loop
+            self._engine = self._create_engine()
+            self._sessionmaker = async_sessionmaker(self._engine, expire_on_commit=False, autoflush=False)
+
+    def _discard_engine(self, engine: AsyncEngine, loop):
+        """Release an engine built on another loop.
+
+        Its connections belong to that loop: if it is still running they are
+        closed there, otherwise the pool is dropped without touching them.
+        """
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(engine.dispose(), loop)
+        else:
+            engine.sync_engine.dispose(close=False)
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        """Session that is rolled back on error and always closed"""
+        async with self.sessionmaker() as session:
+            try:
+                yield session
+            except Exception:
+                await session.rollback()
+                raise
+
+    async def dispose(self):
+        """Close every pooled connection"""
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+            self._sessionmaker = None
+
+    def pool_metrics(self) -> Dict:
+        """Checked-out/idle connections, saturation and checkout wait times"""
+        pool = self._engine.pool if self._engine is not None else None
+        if not isinstance(pool, MeteredQueuePool):
+            return {'pool': type(pool).__name__ if pool else None}
+        metrics = pool.metrics
+        checked_out = pool.checkedout()
+        capacity = pool.size() + self.max_overflow
+        return {
+            'pool_size': pool.size(),
+            'max_overflow': self.max_overflow,
+            'checked_out': checked_out,
+            'idle': pool.checkedin(),
+            'overflow': max(0, pool.overflow()),
+            'saturation': round(checked_out / capacity, 3) if capacity else 0.0,
+            'checkouts': metrics['checkouts'],
+            'checkout_timeouts': metrics['timeouts'],
+            'avg_checkout_ms': round(1000 * metrics['checkout_seconds'] / metrics['checkouts'], 2)
+            if metrics['checkouts'] else 0.0,
+            'max_checkout_ms': round(1000 * metrics['max_checkout_seconds'], 2)
+        }
+
+    def _create_engine(self) -> AsyncEngine:
+        if self.url.startswith('sqlite') and (':memory:' in self.url or self.url.endswith('://')):
+            # One shared connection, otherwise every checkout sees a different empty database
+            return create_async_engine(self.url, echo=self.echo, poolclass=StaticPool)
+        return create_async_engine(
+            self.url,
+            echo=self.echo,
+            poolclass=MeteredQueuePool,
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_timeout=self.pool_timeout,
+            pool_recycle=self.pool_recycle,
+            pool_pre_ping=True
+        )
+
+_database = None
+
+def get_database() -> Database:
+    """Process-wide database"""
+    global _database
+    if _database is None:
+        _database = Database()
+    return _database
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    """FastAPI dependency: one pooled session per request"""
+    async with get_database().session() as session:
+        yield session
@@ -1,3 +1,7 @@
+import asyncio
+import json
+import re
+from typing import AsyncIterator, Dict
 import openai
 from langchain.schema import Document
 from langchain.chains import LLMChain
@@ -5,9 +9,24 @@ from langchain.prompts import PromptTemplate
 from langchain.chat_models import ChatOpenAI
 from pydantic_ai import Agent
 from ..config import settings
+from ..llm_cache import get_llm_cache
+
+# Bump a template's version whenever its prompt changes so cached outputs are not reused
+TEMPLATE_VERSIONS = {'rewrite_resume': 1, 'targeted_version': 1, 'resume_analysis': 1}
+
+JOB_TYPES = ("technical", "managerial", "creative", "executive")
 
 class ResumeRewriter:
-    def __init__(self):
+    """ATS rewrite of a resume, plus targeted versions and an analysis of the rewrite.
+
+    The rewrite is the only dependency: once it is back, the four targeted
+    versions and the analysis run concurrently, at most ``llm_concurrency``
+    LLM calls at a time, so a rewrite costs two round-trips of wall-clock
+    time instead of six. A failed version or analysis is reported under
+    ``errors`` and does not discard the parts that succeeded.
+    """
+
+    def __init__(self, llm_concurrency: int = 5):
         self.llm = ChatOpenAI(
             openai_api_key=settings.OPENAI_API_KEY,
             model_name="gpt-4",
@@ -17,10 +36,67 @@ class ResumeRewriter:
             model='openai:gpt-4',
             system_prompt="You are an expert resume writer and career coach."
         )
+        self.cache = get_llm_cache()
+        self.llm_concurrency = llm_concurrency
+        self._llm_slots = None
+        self._loop = None
+    
+    async def rewrite_resume(self, original_resume: str, target_industry: str = None,
+                             cache_sampled: bool = False) -> dict:
+        """Rewrite resume using AI to optimize for ATS systems and modern hiring practices.
+
+        The rewrite samples at temperature 0.3; with ``cache_sampled`` re-runs
+        and retries reuse the earlier outputs instead of sampling again.
+        """
+        result = {"optimized": None, "versions": {}, "analysis": None}
+        errors = {}
+        async for part in self.stream_rewrite(original_resume, target_industry, cache_sampled):
+            if 'error' in part:
+                errors[part['name']] = part['error']
+            elif part['part'] == 'version':
+                result['versions'][part['name']] = part['content']
+            else:
+                result[part['part']] = part['content']
+        result['versions'] = {job_type: result['versions'][job_type] for job_type in JOB_TYPES
+                              if job_type in result['versions']}
+        if errors:
+            result['errors'] = errors
+        return result
     
-    async def rewrite_resume(self, original_resume: str, target_industry: str = None) -> dict:
-        """Rewrite resume using AI to optimize for ATS systems and modern hiring practices"""
+    async def stream_rewrite(self, original_resume: str, target_industry: str = None,
+                             cache_sampled: bool = False) -> AsyncIterator[Dict]:
+        """Yield the optimized resume first, then each version and the analysis as it finishes.
+
+        Parts look like {'part': 'optimized' | 'version' | 'analysis',
+        'name': ..., 'content': ...}; a failed part carries 'error' instead
+        of 'content'. A failed rewrite raises, as nothing else can run.
+        """
+        rewritten = await self._rewrite(original_resume, target_industry or "general", cache_sampled)
+        yield {'part': 'optimized', 'name': 'optimized', 'content': rewritten}
         
+        tasks = {
+            asyncio.create_task(self._targeted_version(rewritten, job_type, cache_sampled)): ('version', job_type)
+            for job_type in JOB_TYPES
+        }
+        tasks[asyncio.create_task(self._analyze_resume(rewritten, cache_sampled))] = ('analysis', 'analysis')
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    part, name = tasks[task]
+                    if task.exception() is not None:
+                        print(f"Error creating resume {name}: {task.exception()}")
+                        yield {'part': part, 'name': name, 'error': str(task.exception())}
+                    else:
+                        yield {'part': part, 'name': name, 'content': task.result()}
+        finally:
+            # Closed early (or failed): cancel what is left and wait for it, so no task outlives the stream
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+    
+    async def _rewrite(self, original_resume: str, industry: str, cache_sampled: bool = False) -> str:
         prompt = PromptTemplate(
             template="""Rewrite and optimize the following resume for modern hiring practices and ATS systems.
             Focus on:
@@ -38,29 +114,19 @@ class ResumeRewriter:
         )
         
         chain = LLMChain(llm=self.llm, prompt=prompt)
-        rewritten = await chain.arun(resume=original_resume, industry=target_industry or "general")
-        
-        # Generate multiple versions for different job types
-        versions = await self._create_targeted_versions(rewritten)
-        
-        return {
-            "optimized": rewritten,
-            "versions": versions,
-            "analysis": await self._analyze_resume(rewritten)
-        }
+        return await self._cached(
+            'rewrite_resume', {'resume': original_resume, 'industry': industry},
+            lambda: chain.arun(resume=original_resume, industry=industry), cache_sampled
+        )
     
-    async def _create_targeted_versions(self, resume: str) -> dict:
-        """Create different resume versions for various job types"""
-        versions = {}
-        job_types = ["technical", "managerial", "creative", "executive"]
-        
-        for job_type in job_types:
-            prompt = f"Adapt this resume for a {job_type} role, emphasizing relevant skills and experience:\n\n{resume}"
-            versions[job_type] = await self.llm.apredict(prompt)
-        
-        return versions
+    async def _targeted_version(self, resume: str, job_type: str, cache_sampled: bool = False) -> str:
+        prompt = f"Adapt this resume for a {job_type} role, emphasizing relevant skills and experience:\n\n{resume}"
+        return await self._cached(
+            'targeted_version', {'resume': resume, 'job_type': job_type},
+            lambda: self.llm.apredict(prompt), cache_sampled
+        )
     
-    async def _analyze_resume(self, resume: str) -> dict:
+    async def _analyze_resume(self, resume: str, cache_sampled: bool = False) -> dict:
         """Analyze resume strength and provide recommendations"""
         analysis_prompt = f"""Analyze this resume and provide a JSON response with:
         - overall_score (0-100)
@@ -72,5 +138,42 @@ class ResumeRewriter:
         Resume:
         {resume}"""
         
-        analysis = await self.llm.apredict(analysis_prompt)
+        analysis = await self._cached(
+            'resume_analysis', {'resume': resume},
+            lambda: self.llm.apredict(analysis_prompt), cache_sampled
+        )
         return self._parse_analysis(analysis)
+
+    def _parse_analysis(self, analysis: str) -> dict:
+        """JSON object in the model's reply, or the raw text when there is none"""
+        match = re.search(r'\{.*\}', analysis, re.S)
+        if match:
+            try:
+                return json.loads(match.group(0))
+            except ValueError:
+                pass
+        return {'raw': analysis}
+
+    async def _cached(self, template: str, inputs: dict, call, cache_sampled: bool = False) -> str:
+        """Run an LLM call through the response cache, holding an LLM slot only on a miss.
+
+        The rewriter samples at temperature 0.3, so outputs are only cached
+        when the caller opted in with ``cache_sampled``.
+        """
+        self._bind_to_running_loop()
+
+        async def limited() -> str:
+            async with self._llm_slots:
+                return await call()
+
+        return await self.cache.cached(
+            limited, model=self.llm.model_name, template=template, version=TEMPLATE_VERSIONS[template],
+            inputs=inputs, params={'temperature': self.llm.temperature}, cache_sampled=cache_sampled
+        )
+
+    def _bind_to_running_loop(self):
+        # Semaphores belong to one event loop
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._llm_slots = asyncio.Semaphore(self.llm_concurrency)
@@ -2,10 +2,14 @@ from .resume_parser import ResumeParser
 from .ai_rewriter import ResumeRewriter
 from .document_storage import DocumentStorage
 from .compliance_za import ComplianceGeneratorZA
+from .skill_taxonomy import SKILL_TAXONOMY, SkillExtractor, get_skill_extractor
 
 __all__ = [
     "ResumeParser",
     "ResumeRewriter", 
     "DocumentStorage",
-    "ComplianceGeneratorZA"
+    "ComplianceGeneratorZA",
+    "SKILL_TAXONOMY",
+    "SkillExtractor",
+    "get_skill_extractor"
 ]
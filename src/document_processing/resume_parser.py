@@ -3,6 +3,7 @@ import docx
 import re
 from typing import Dict, List, Any
 import io
+from .skill_taxonomy import get_skill_extractor
 
 class ResumeParser:
     def __init__(self):
@@ -14,18 +15,21 @@ class ResumeParser:
             'certifications': ['certifications', 'licenses', 'certificates'],
             'personal': ['personal', 'about', 'profile', 'summary']
         }
+        self.skill_extractor = get_skill_extractor()
     
     def parse_resume(self, file_content: bytes, filename: str) -> Dict[str, Any]:
         """Parse resume file and extract structured information"""
         
         text = self._extract_text(file_content, filename)
         structured_data = self._structure_data(text)
+        skill_counts = self.skill_extractor.extract(text)
         
         return {
             'raw_text': text,
             'structured': structured_data,
             'metadata': self._extract_metadata(text),
-            'skills': self._extract_skills(text),
+            'skills': self._extract_skills(text, skill_counts),
+            'skill_counts': skill_counts,
             'experience': self._extract_experience(text),
             'education': self._extract_education(text)
         }
@@ -121,23 +125,14 @@ class ResumeParser:
                 return line_clean
         return "Unknown"
     
-    def _extract_skills(self, text: str) -> List[str]:
+    def _extract_skills(self, text: str, skill_counts: Dict[str, int] = None) -> List[str]:
         """Extract skills from resume text"""
-        common_skills = [
-            'python', 'java', 'javascript', 'react', 'angular', 'vue', 'node.js',
-            'sql', 'mongodb', 'postgresql', 'aws', 'azure', 'docker', 'kubernetes',
-            'machine learning', 'ai', 'data analysis', 'project management',
-            'agile', 'scrum', 'leadership', 'communication', 'problem solving'
-        ]
+        if skill_counts is None:
+            skill_counts = self.skill_extractor.extract(text)
         
-        found_skills = []
-        text_lower = text.lower()
-        
-        for skill in common_skills:
-            if skill in text_lower:
-                found_skills.append(skill.title())
-                
-        return found_skills
+        # Most frequently mentioned skills first
+        ranked = sorted(skill_counts, key=lambda skill_id: -skill_counts[skill_id])
+        return [self.skill_extractor.display_name(skill_id) for skill_id in ranked]
     
     def _extract_experience(self, text: str) -> List[Dict]:
         """Extract work experience"""
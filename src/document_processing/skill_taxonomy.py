@@ -0,0 +1,123 @@
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set
+
+# Canonical skill ID -> display name and the aliases that should map to it.
+# IDs are lowercase and stable; JobMatcher.skill_weights is keyed by them.
+SKILL_TAXONOMY = {
+    'python': {'name': 'Python', 'aliases': ['python', 'python3', 'django', 'flask', 'fastapi']},
+    'java': {'name': 'Java', 'aliases': ['java', 'spring boot', 'j2ee']},
+    'javascript': {'name': 'JavaScript', 'aliases': ['javascript', 'js', 'ecmascript', 'es6']},
+    'typescript': {'name': 'TypeScript', 'aliases': ['typescript']},
+    'react': {'name': 'React', 'aliases': ['react', 'react.js', 'reactjs']},
+    'angular': {'name': 'Angular', 'aliases': ['angular', 'angularjs']},
+    'vue': {'name': 'Vue', 'aliases': ['vue', 'vue.js', 'vuejs']},
+    'node.js': {'name': 'Node.js', 'aliases': ['node.js', 'nodejs', 'node js']},
+    'c#': {'name': 'C#', 'aliases': ['c#', 'csharp', '.net', 'asp.net']},
+    'c++': {'name': 'C++', 'aliases': ['c++', 'cpp']},
+    'php': {'name': 'PHP', 'aliases': ['php', 'laravel']},
+    'sql': {'name': 'SQL', 'aliases': ['sql', 't-sql', 'pl/sql']},
+    'mongodb': {'name': 'MongoDB', 'aliases': ['mongodb', 'mongo']},
+    'postgresql': {'name': 'PostgreSQL', 'aliases': ['postgresql', 'postgres']},
+    'aws': {'name': 'AWS', 'aliases': ['aws', 'amazon web services']},
+    'azure': {'name': 'Azure', 'aliases': ['azure', 'microsoft azure']},
+    'docker': {'name': 'Docker', 'aliases': ['docker', 'containerisation', 'containerization']},
+    'kubernetes': {'name': 'Kubernetes', 'aliases': ['kubernetes', 'k8s']},
+    'machine learning': {'name': 'Machine Learning', 'aliases': ['machine learning', 'ml', 'deep learning']},
+    'ai': {'name': 'AI', 'aliases': ['ai', 'artificial intelligence']},
+    'data science': {'name': 'Data Science', 'aliases': ['data science', 'data scientist']},
+    'data analysis': {'name': 'Data Analysis', 'aliases': ['data analysis', 'data analytics', 'data analyst']},
+    'excel': {'name': 'Excel', 'aliases': ['excel', 'ms excel', 'microsoft excel']},
+    'power bi': {'name': 'Power BI', 'aliases': ['power bi', 'powerbi']},
+    'sap': {'name': 'SAP', 'aliases': ['sap']},
+    'project management': {'name': 'Project Management', 'aliases': ['project management', 'project manager', 'pmp']},
+    'agile': {'name': 'Agile', 'aliases': ['agile']},
+    'scrum': {'name': 'Scrum', 'aliases': ['scrum', 'scrum master']},
+    'leadership': {'name': 'Leadership', 'aliases': ['leadership', 'team lead', 'team leader']},
+    'communication': {'name': 'Communication', 'aliases': ['communication', 'communication skills']},
+    'problem solving': {'name': 'Problem Solving', 'aliases': ['problem solving', 'problem-solving']},
+    'accounting': {'name': 'Accounting', 'aliases': ['accounting', 'bookkeeping', 'ifrs']},
+    'sales': {'name': 'Sales', 'aliases': ['sales', 'business development']},
+    'customer service': {'name': 'Customer Service', 'aliases': ['customer service', 'customer support']},
+    'marketing': {'name': 'Marketing', 'aliases': ['marketing', 'digital marketing', 'seo']}
+}
+
+class SkillExtractor:
+    """Single-pass skill extraction over a compiled alias trie.
+
+    All aliases are folded into one character trie and emitted as a single
+    regex, so each text position is matched in time proportional to the
+    longest alias rather than the number of skills. Matches must sit on word
+    boundaries: 'ai' does not match inside 'maintain' and 'java' does not
+    match inside 'javascript'.
+    """
+
+    def __init__(self, taxonomy: Optional[Dict[str, Dict]] = None):
+        self.taxonomy = taxonomy or SKILL_TAXONOMY
+        self.alias_to_id = {}
+        for skill_id, skill in self.taxonomy.items():
+            for alias in [skill_id] + skill.get('aliases', []):
+                self.alias_to_id[self._normalize(alias)] = skill_id
+
+        trie = {}
+        for alias in self.alias_to_id:
+            node = trie
+            for char in alias:
+                node = node.setdefault(char, {})
+            node[''] = True  # end of alias marker
+
+        self.pattern = re.compile(r'(?<![\w+#])' + self._trie_to_regex(trie) + r'(?![\w+#])')
+
+    def extract(self, text: str) -> Dict[str, int]:
+        """Return {skill_id: occurrence count} for every skill mentioned in text"""
+        if not text:
+            return {}
+        counts = Counter()
+        for match in self.pattern.finditer(self._normalize(text)):
+            counts[self.alias_to_id[match.group(0)]] += 1
+        return dict(counts)
+
+    def extract_ids(self, text: str) -> List[str]:
+        """Skill IDs mentioned in text, in taxonomy order"""
+        found = self.extract(text)
+        return [skill_id for skill_id in self.taxonomy if skill_id in found]
+
+    def canonicalize(self, skills: Iterable[str]) -> Set[str]:
+        """Map free-form skill names (e.g. a user's profile skills) to canonical IDs"""
+        skill_ids = set()
+        for skill in skills:
+            normalized = self._normalize(skill)
+            if normalized in self.alias_to_id:
+                skill_ids.add(self.alias_to_id[normalized])
+            else:
+                skill_ids.update(self.extract(normalized))
+        return skill_ids
+
+    def display_name(self, skill_id: str) -> str:
+        return self.taxonomy.get(skill_id, {}).get('name', skill_id.title())
+
+    def _normalize(self, text: str) -> str:
+        return re.sub(r'\s+', ' ', text.lower()).strip()
+
+    def _trie_to_regex(self, node: Dict) -> str:
+        """Emit a regex for a trie node; alternatives share their common prefixes"""
+        optional = '' in node
+        branches = [re.escape(char) + self._trie_to_regex(child)
+                    for char, child in sorted(node.items()) if char != '']
+
+        if not branches:
+            return ''
+        if len(branches) == 1 and not optional:
+            return branches[0]
+
+        pattern = '(?:' + '|'.join(branches) + ')'
+        return pattern + '?' if optional else pattern
+
+_default_extractor = None
+
+def get_skill_extractor() -> SkillExtractor:
+    """Shared extractor compiled once per process"""
+    global _default_extractor
+    if _default_extractor is None:
+        _default_extractor = SkillExtractor()
+    return _default_extractor
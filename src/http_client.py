@@ -0,0 +1,128 @@
+import asyncio
+import time
+from typing import Dict, Optional
+import aiohttp
+
+class HTTPClientRegistry:
+    """Application-wide aiohttp connection pool shared by every outbound integration.
+
+    One TCPConnector (per-host connection limit, DNS cache, keep-alive) backs
+    a named ClientSession per integration, so scrapers, TikTok and other
+    clients reuse warm connections and TLS sessions instead of opening a new
+    pool per call. The FastAPI app starts and closes it with the process;
+    other callers get it lazily through get_http_registry().
+    """
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 10, dns_ttl: int = 300,
+                 keepalive_timeout: float = 30, timeout: float = 20):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.metrics = {
+            'requests': 0,
+            'connections_created': 0,
+            'connections_reused': 0,
+            'queued': 0,
+            'queue_wait_seconds': 0.0
+        }
+        self._connector: Optional[aiohttp.TCPConnector] = None
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._loop = None
+
+    async def start(self):
+        """Create the shared connector on the running loop"""
+        loop = asyncio.get_running_loop()
+        if self._connector is not None and self._loop is loop and not self._connector.closed:
+            return
+        if self._connector is not None and self._loop is not loop:
+            # The loop that owned the old pool is gone; its sockets cannot be reused
+            self._sessions = {}
+        self._loop = loop
+        self._connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.dns_ttl,
+            use_dns_cache=True,
+            keepalive_timeout=self.keepalive_timeout,
+            enable_cleanup_closed=True
+        )
+
+    async def session(self, name: str = 'default', headers: Optional[Dict[str, str]] = None) -> aiohttp.ClientSession:
+        """Named session on the shared connector; created once per integration"""
+        await self.start()
+        session = self._sessions.get(name)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=self._connector,
+                connector_owner=False,
+                timeout=self.timeout,
+                headers={'Accept-Encoding': 'gzip, deflate', **(headers or {})},
+                auto_decompress=True,
+                trace_configs=[self._trace_config()]
+            )
+            self._sessions[name] = session
+        return session
+
+    async def close(self):
+        """Close every session and the shared connector"""
+        for session in self._sessions.values():
+            await session.close()
+        self._sessions = {}
+        if self._connector is not None:
+            await self._connector.close()
+            self._connector = None
+
+    def pool_metrics(self) -> Dict:
+        """Open connections, connection-wait time and keep-alive reuse ratio"""
+        connector = self._connector
+        in_use = len(getattr(connector, '_acquired', ())) if connector else 0
+        idle = sum(len(conns) for conns in getattr(connector, '_conns', {}).values()) if connector else 0
+        created = self.metrics['connections_created']
+        reused = self.metrics['connections_reused']
+        return {
+            'open_connections': in_use + idle,
+            'in_use_connections': in_use,
+            'idle_connections': idle,
+            'requests': self.metrics['requests'],
+            'queued_requests': self.metrics['queued'],
+            'avg_queue_wait_ms': round(1000 * self.metrics['queue_wait_seconds'] / self.metrics['queued'], 2)
+            if self.metrics['queued'] else 0.0,
+            'reuse_ratio': round(reused / (created + reused), 3) if created + reused else 0.0
+        }
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, context, params):
+            self.metrics['requests'] += 1
+
+        async def on_queued_start(session, context, params):
+            context.queued_at = time.monotonic()
+
+        async def on_queued_end(session, context, params):
+            self.metrics['queued'] += 1
+            self.metrics['queue_wait_seconds'] += time.monotonic() - getattr(context, 'queued_at', time.monotonic())
+
+        async def on_connection_create_end(session, context, params):
+            self.metrics['connections_created'] += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            self.metrics['connections_reused'] += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_queued_start.append(on_queued_start)
+        trace_config.on_connection_queued_end.append(on_queued_end)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+_http_registry = None
+
+def get_http_registry() -> HTTPClientRegistry:
+    """Process-wide HTTP client registry"""
+    global _http_registry
+    if _http_registry is None:
+        _http_registry = HTTPClientRegistry()
+    return _http_registry
@@ -3,6 +3,15 @@ from .scrapers.international_za import InternationalJobScraper
 from .scrapers.careerjunction import CareerJunctionScraper
 from .scrapers.pnet import PNetScraper
 from .job_matcher import JobMatcher
+from .scrapers.job_index import JobTextIndex
+from .scrapers.page_fetcher import PageFetcher, get_page_fetcher
+from .scrapers.job_dedup import JobDeduplicator, get_job_deduplicator
+from .scrapers.job_pipeline import JobPipeline, TopKJobs, merge_job_streams
+from .scrapers.job_store import JobStore, get_job_store
+from .scrapers.scrape_demand import ScrapeDemandAggregator
+from .scrapers.search_settings import SearchSettingsStore, get_search_settings_store
+from .scrapers.candidate_index import UserProfileIndex, get_user_profile_index
+from .scrapers.site_specs import SITE_SPECS, SiteRegistry, get_site_registry
 from .application_bot import ApplicationBot
 
 __all__ = [
@@ -11,5 +20,23 @@ __all__ = [
     "CareerJunctionScraper",
     "PNetScraper",
     "JobMatcher",
+    "JobTextIndex",
+    "PageFetcher",
+    "get_page_fetcher",
+    "JobDeduplicator",
+    "get_job_deduplicator",
+    "JobPipeline",
+    "TopKJobs",
+    "merge_job_streams",
+    "JobStore",
+    "get_job_store",
+    "ScrapeDemandAggregator",
+    "SearchSettingsStore",
+    "get_search_settings_store",
+    "UserProfileIndex",
+    "get_user_profile_index",
+    "SITE_SPECS",
+    "SiteRegistry",
+    "get_site_registry",
     "ApplicationBot"
 ]
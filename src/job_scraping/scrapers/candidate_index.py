@@ -0,0 +1,323 @@
+import bisect
+import json
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Hashable, Iterable, List, Optional, Set
+import numpy as np
+from .job_matcher import PROVINCE_CODES, JobMatcher
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends from concurrent processes are not serialized
+    fcntl = None
+
+# Lower bounds (years) of the experience buckets: 0-1, 2-4, 5-9, 10+
+EXPERIENCE_BUCKETS = (0, 2, 5, 10)
+
+# Posting key for users with no usable skills or locations; they are never pruned on that dimension
+ANY = '*'
+
+# The parts of a profile JobMatcher.score_block reads; only these are indexed and stored
+SCORED_FIELDS = ('skills', 'preferred_locations', 'years_experience', 'expected_salary', 'education')
+
+class UserProfileIndex:
+    """Inverted index from skill id, province and experience bucket to user ids.
+
+    Used in the job -> users direction: for each incoming job the candidate
+    users are the intersection of up to three posting-list unions:
+
+    * users sharing at least one of the job's skills (or with no skills),
+    * users wanting the job's province (or any province, or remote jobs),
+    * users whose experience bucket can reach 70% of the required years,
+      the level at which JobMatcher stops scoring experience as a mismatch.
+
+    A dimension only prunes when a user failing it cannot reach
+    ``min_score`` even with every other component at its best for that job,
+    so no match is lost. Only the remaining (user, job) pairs are fully
+    scored, with the matcher's vectorized score_block over the batch's
+    features built once.
+
+    With a ``path`` every change is appended to a JSONL file, later lines
+    overriding earlier ones, and refresh() picks up lines other processes
+    have appended since the last read. Re-adding an unchanged profile (as
+    every automation cycle does) writes nothing. Once the file holds more
+    than ``compact_ratio`` lines per indexed user it is rewritten with one
+    line per user; readers notice the new file and reload it.
+    """
+
+    def __init__(self, matcher: Optional[JobMatcher] = None, path: Optional[str] = None,
+                 compact_ratio: float = 4, compact_min_lines: int = 1000):
+        self.matcher = matcher or JobMatcher()
+        self.path = path
+        self.profiles: Dict[Hashable, Dict] = {}
+        self.stats = {'jobs': 0, 'candidate_pairs': 0, 'scored_users': 0, 'matches': 0}
+        self._skills: Dict[str, Set] = {}
+        self._provinces: Dict[str, Set] = {}
+        self._experience: List[Set] = [set() for _ in EXPERIENCE_BUCKETS]
+        self._keys: Dict[Hashable, tuple] = {}  # user -> (skills, provinces, bucket) it is posted under
+        self.compact_ratio = compact_ratio
+        self.compact_min_lines = compact_min_lines
+        self._lock = threading.Lock()
+        self._offset = 0
+        self._lines = 0  # lines in the file as last read or written
+        self._generation = None  # first line of the file as last read; changes when it is compacted
+
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.refresh()
+
+    def __len__(self) -> int:
+        return len(self.profiles)
+
+    def add(self, user_id: Hashable, profile: Dict):
+        """Index or re-index a user's profile; a no-op when its scored fields are unchanged"""
+        profile = {field: profile[field] for field in SCORED_FIELDS if field in profile}
+        with self._lock, self._file_lock():
+            self._refresh()
+            if user_id in self._keys and self.profiles[user_id] == profile:
+                return
+            self._index(user_id, profile)
+            self._append({'user_id': user_id, 'profile': profile})
+
+    def remove(self, user_id: Hashable):
+        with self._lock, self._file_lock():
+            self._refresh()
+            if user_id not in self._keys:
+                return
+            self._unindex(user_id)
+            self._append({'user_id': user_id, 'profile': None})
+
+    def refresh(self):
+        """Apply profile changes other processes appended to the index file"""
+        with self._lock:
+            self._refresh()
+
+    def candidates(self, job: Dict, min_score: float = 0) -> Set:
+        """Users who may score at least min_score for a single job"""
+        features = self.matcher.build_job_features([job])
+        with self._lock:
+            return self._candidates(features, 0, {}, min_score)
+
+    def match_jobs(self, jobs: List[Dict], min_score: float = 0,
+                   users: Optional[Iterable[Hashable]] = None, block_size: int = 256) -> Dict[Hashable, List[Dict]]:
+        """Score each job of a batch against its candidate users only.
+
+        Returns {user_id: [scored job copies with match_score >= min_score,
+        best first]}. ``users`` optionally restricts the candidates further
+        (e.g. to users whose settings accept the jobs).
+        """
+        if not jobs:
+            return {}
+        allowed = set(users) if users is not None else None
+
+        features = self.matcher.build_job_features(jobs)
+        pairs: Dict[Hashable, List[int]] = {}
+        unions = {}  # province/experience posting unions shared by the batch's jobs
+        # Posting sets are mutated by add(); take the candidates and the profiles to score under the lock
+        with self._lock:
+            self._refresh()
+            for j in range(len(jobs)):
+                candidates = self._candidates(features, j, unions, min_score)
+                if allowed is not None:
+                    candidates &= allowed
+                for user_id in candidates:
+                    pairs.setdefault(user_id, []).append(j)
+            profiles = {user_id: self.profiles[user_id] for user_id in pairs}
+        self.stats['jobs'] += len(jobs)
+        self.stats['candidate_pairs'] += sum(len(job_ids) for job_ids in pairs.values())
+        self.stats['scored_users'] += len(pairs)
+
+        matches = {}
+        user_ids = list(pairs)
+        for start in range(0, len(user_ids), block_size):
+            block_users = user_ids[start:start + block_size]
+            block = self.matcher.score_block(features, [profiles[user_id] for user_id in block_users])
+            for row, user_id in enumerate(block_users):
+                scored = []
+                for j in pairs[user_id]:
+                    score = float(block['total'][row, j])
+                    if score >= min_score:
+                        scored.append({
+                            **jobs[j],
+                            'match_score': score,
+                            'match_breakdown': {
+                                component: float(block[component][row, j])
+                                for component in self.matcher.score_weights
+                            }
+                        })
+                if scored:
+                    scored.sort(key=lambda job: job['match_score'], reverse=True)
+                    matches[user_id] = scored
+                    self.stats['matches'] += len(scored)
+        return matches
+
+    def _candidates(self, features, j: int, unions: Dict, min_score: float) -> Set:
+        skill_ids = [features.skills[i] for i in np.flatnonzero(features.skill_matrix[j])]
+        best = self._best_components(features, j)
+        postings = []
+
+        def prunes(component: str, failed: float) -> bool:
+            """Whether a user scoring ``failed`` on the component is below min_score at best"""
+            total = sum(self.matcher.score_weights[c] * (failed if c == component else score)
+                        for c, score in best.items())
+            return min(100, total * 100) < min_score
+
+        # Users with skills but none of the job's score 0 on skills
+        if skill_ids and prunes('skills', 0.0):
+            with_skill = set(self._skills.get(ANY, ()))
+            for skill_id in skill_ids:
+                with_skill.update(self._skills.get(skill_id, ()))
+            postings.append(with_skill)
+
+        province = features.province[j]
+        # Users whose provinces all differ score 0.2 on location
+        if province >= 0 and not features.remote[j] and prunes('location', 0.2):
+            key = ('province', province)
+            if key not in unions:
+                unions[key] = self._provinces.get(PROVINCE_CODES[province], set()) | self._provinces.get(ANY, set())
+            postings.append(unions[key])
+
+        # The bucket holding 70% of the required years and every bucket above it;
+        # users at the low end of that bucket are scored rather than dropped.
+        # Users in lower buckets are under 70% and score 0.3 on experience
+        first = bisect.bisect_right(EXPERIENCE_BUCKETS, features.experience[j] * 0.7) - 1
+        if first > 0 and prunes('experience', 0.3):
+            key = ('experience', first)
+            if key not in unions:
+                unions[key] = set().union(*self._experience[first:])
+            postings.append(unions[key])
+
+        if not postings:
+            return set(self.profiles)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates &= posting
+        return candidates
+
+    def _best_components(self, features, j: int) -> Dict[str, float]:
+        """Highest score any user can get on each component of score_block for job j"""
+        return {
+            'skills': 1.0,
+            'experience': 1.0 if features.experience[j] > 0 else 0.8,
+            'location': 1.0 if features.location_ids[j] >= 0 else 0.6,
+            'salary': 1.0 if features.salary[j] > 0 else 0.7,
+            'education': 1.0 if features.education[j] > 0 else 0.8
+        }
+
+    def _index(self, user_id: Hashable, profile: Dict):
+        self._unindex(user_id)
+        skills = self.matcher.skill_extractor.canonicalize(profile.get('skills', [])) or {ANY}
+        provinces = {
+            self.matcher._extract_province(location.lower()) for location in profile.get('preferred_locations', [])
+        }
+        provinces.discard(None)
+        provinces = provinces or {ANY}
+        bucket = bisect.bisect_right(EXPERIENCE_BUCKETS, profile.get('years_experience', 0) or 0) - 1
+
+        for skill_id in skills:
+            self._skills.setdefault(skill_id, set()).add(user_id)
+        for province in provinces:
+            self._provinces.setdefault(province, set()).add(user_id)
+        self._experience[max(bucket, 0)].add(user_id)
+        self._keys[user_id] = (skills, provinces, max(bucket, 0))
+        self.profiles[user_id] = profile
+
+    def _unindex(self, user_id: Hashable):
+        keys = self._keys.pop(user_id, None)
+        self.profiles.pop(user_id, None)
+        if keys is None:
+            return
+        skills, provinces, bucket = keys
+        for skill_id in skills:
+            self._skills[skill_id].discard(user_id)
+        for province in provinces:
+            self._provinces[province].discard(user_id)
+        self._experience[bucket].discard(user_id)
+
+    def _refresh(self):
+        """refresh() body; the caller holds self._lock"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        with open(self.path, encoding='utf-8') as f:
+            generation = f.readline()
+            if generation != self._generation:
+                # First read, or another process compacted the file: reload it from scratch
+                self._reset()
+                self._generation = generation if generation.endswith('\n') else None
+            f.seek(self._offset)
+            for line in iter(f.readline, ''):
+                if not line.endswith('\n'):
+                    break  # partially written; read it next time
+                self._offset = f.tell()
+                self._lines += 1
+                entry = json.loads(line)
+                if 'generation' in entry:
+                    continue
+                if entry['profile'] is None:
+                    self._unindex(entry['user_id'])
+                else:
+                    self._index(entry['user_id'], entry['profile'])
+
+    def _reset(self):
+        self.profiles.clear()
+        self._skills.clear()
+        self._provinces.clear()
+        self._experience = [set() for _ in EXPERIENCE_BUCKETS]
+        self._keys.clear()
+        self._offset = 0
+        self._lines = 0
+
+    def _append(self, entry: Dict):
+        """Append one change; the caller holds both locks and has refreshed, so this is the file's end"""
+        if not self.path:
+            return
+        with open(self.path, 'a', encoding='utf-8') as f:
+            line = json.dumps(entry, default=str) + '\n'
+            f.write(line)
+            self._offset = f.tell()
+        if self._generation is None:
+            self._generation = line
+        self._lines += 1
+        if self._lines > max(self.compact_min_lines, self.compact_ratio * len(self.profiles)):
+            self._compact()
+
+    def _compact(self):
+        """Rewrite the file with one line per indexed user"""
+        temporary = f"{self.path}.tmp"
+        generation = json.dumps({'generation': uuid.uuid4().hex}) + '\n'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            f.write(generation)
+            for user_id, profile in self.profiles.items():
+                f.write(json.dumps({'user_id': user_id, 'profile': profile}, default=str) + '\n')
+            self._offset = f.tell()
+        os.replace(temporary, self.path)
+        self._generation = generation
+        self._lines = len(self.profiles)
+
+    @contextmanager
+    def _file_lock(self):
+        if not self.path or fcntl is None:
+            yield
+            return
+        with open(f"{self.path}.lock", 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+_user_profile_index = None
+
+def get_user_profile_index() -> UserProfileIndex:
+    """Process-wide user profile index backed by data/user_profiles.jsonl"""
+    global _user_profile_index
+    if _user_profile_index is None:
+        _user_profile_index = UserProfileIndex(path="data/user_profiles.jsonl")
+    return _user_profile_index
@@ -0,0 +1,119 @@
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve
+
+try:
+    # C-backed parsing and compiled XPath; an order of magnitude faster than bs4 tree building
+    from lxml import etree
+    from cssselect import GenericTranslator
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Bump when extraction changes in a way that alters parsed cards, so cached parses are not reused
+PARSER_VERSION = 2
+
+# Characters of markup fed to the pull parser at a time
+FEED_SIZE = 16384
+
+# A field is either a CSS selector (text content) or a (selector, attribute) pair
+FieldSpec = Union[str, Tuple[str, str]]
+
+class CardParser:
+    """Extracts job cards from a listing page with selectors compiled once.
+
+    With lxml available the page is streamed through lxml's HTMLPullParser
+    (in C): each card is yielded as soon as its closing tag is parsed, using
+    field CSS selectors pre-translated into compiled XPath, and markup
+    outside the cards is cleared as it closes, so the tree never holds more
+    than the open elements and the current card. Without lxml it falls back
+    to BeautifulSoup, where a SoupStrainer restricts the tree to card
+    subtrees and soupsieve pre-compiles the field selectors.
+    """
+
+    def __init__(self, card_tag: str, card_class: str, fields: Dict[str, FieldSpec],
+                 required: Optional[List[str]] = None):
+        self.card_tag = card_tag
+        self.card_class = card_class
+        self.required = required or []
+        self.fields = []
+        for name, spec in fields.items():
+            selector, attribute = (spec, None) if isinstance(spec, str) else spec
+            self.fields.append((name, selector, attribute))
+
+        if HTML_PARSER == 'lxml':
+            translator = GenericTranslator()
+            self._text = etree.XPath('string()')
+            self._field_xpaths = [
+                (name, etree.XPath(translator.css_to_xpath(selector, prefix='descendant::')), attribute)
+                for name, selector, attribute in self.fields
+            ]
+        else:
+            self._strainer = SoupStrainer(card_tag, class_=card_class)
+            self._field_selectors = [
+                (name, soupsieve.compile(selector), attribute) for name, selector, attribute in self.fields
+            ]
+
+    def parse(self, html: str) -> Iterator[Dict[str, str]]:
+        """Yield one dict of raw field values per job card, in page order"""
+        cards = self._parse_lxml(html) if HTML_PARSER == 'lxml' else self._parse_soup(html)
+        for values in cards:
+            if all(values.get(field) for field in self.required):
+                yield values
+
+    def _parse_lxml(self, html: str) -> Iterator[Dict[str, str]]:
+        if not html.strip():
+            return
+        # Only card-tag elements produce events; anything else is freed with the element it closes in
+        parser = etree.HTMLPullParser(events=('start', 'end'), tag=self.card_tag)
+        card = None
+        for offset in range(0, len(html) + FEED_SIZE, FEED_SIZE):
+            if offset < len(html):
+                parser.feed(html[offset:offset + FEED_SIZE])
+            else:
+                parser.close()  # flushes elements the page never closed
+            for event, element in parser.read_events():
+                if card is None and event == 'start' and self._is_card(element):
+                    card = element
+                elif card is None and event == 'end':
+                    self._discard(element)
+                elif element is card and event == 'end':
+                    yield self._card_values(card)
+                    self._discard(card)
+                    card = None
+
+    def _is_card(self, element) -> bool:
+        return element.tag == self.card_tag and self.card_class in (element.get('class') or '').split()
+
+    def _discard(self, element):
+        """Free a closed element outside any card, along with its already-closed earlier siblings"""
+        element.clear()
+        parent = element.getparent()
+        while parent is not None and element.getprevious() is not None:
+            del parent[0]
+
+    def _card_values(self, card) -> Dict[str, str]:
+        values = {}
+        for name, xpath, attribute in self._field_xpaths:
+            matches = xpath(card)
+            if not matches:
+                values[name] = ''
+            elif attribute:
+                values[name] = (matches[0].get(attribute) or '').strip()
+            else:
+                values[name] = ' '.join(self._text(matches[0]).split())
+        return values
+
+    def _parse_soup(self, html: str) -> Iterator[Dict[str, str]]:
+        soup = BeautifulSoup(html, 'html.parser', parse_only=self._strainer)
+        for card in soup.find_all(self.card_tag, class_=self.card_class):
+            values = {}
+            for name, selector, attribute in self._field_selectors:
+                element = selector.select_one(card)
+                if element is None:
+                    values[name] = ''
+                elif attribute:
+                    values[name] = (element.get(attribute) or '').strip()
+                else:
+                    values[name] = element.get_text(' ', strip=True)
+            yield values
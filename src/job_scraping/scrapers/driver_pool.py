@@ -0,0 +1,140 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+def default_chrome_options() -> webdriver.ChromeOptions:
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    return options
+
+class PooledBrowser:
+    """A checked-out driver; every Selenium call runs on the pool's thread executor"""
+
+    def __init__(self, pool: 'BrowserPool', driver: webdriver.Chrome):
+        self.pool = pool
+        self.driver = driver
+
+    async def fetch(self, url: str, wait_for: Optional[Tuple[str, str]] = None, timeout: int = 10) -> str:
+        """Load url and return the rendered page source without blocking the event loop"""
+        return await self.pool.run(self._fetch_sync, url, wait_for, timeout)
+
+    def _fetch_sync(self, url: str, wait_for: Optional[Tuple[str, str]], timeout: int) -> str:
+        self.driver.get(url)
+        if wait_for:
+            WebDriverWait(self.driver, timeout).until(EC.presence_of_element_located(wait_for))
+        self.pool.page_counts[id(self.driver)] += 1
+        return self.driver.page_source
+
+class BrowserPool:
+    """Bounded pool of warm headless Chrome sessions.
+
+    At most ``size`` drivers exist, each used by one coroutine at a time.
+    Blocking Selenium calls run on a dedicated thread executor of the same
+    size, so searches share drivers concurrently without stalling the
+    FastAPI/Celery event loop. Drivers are health-checked on checkout and
+    recycled after ``max_pages`` page loads or any WebDriver error.
+    """
+
+    def __init__(self, size: int = 4, max_pages: int = 50,
+                 options_factory: Callable[[], webdriver.ChromeOptions] = default_chrome_options):
+        self.size = size
+        self.max_pages = max_pages
+        self.options_factory = options_factory
+        self.page_counts: Dict[int, int] = {}
+        self.stats = {'created': 0, 'recycled': 0, 'unhealthy': 0, 'checkouts': 0}
+        self._idle: List[webdriver.Chrome] = []
+        self._idle_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix='browser-pool')
+        self._semaphore = None  # created lazily on the running loop
+        self._loop = None
+
+    async def run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    @asynccontextmanager
+    async def session(self):
+        """Check out a healthy driver for the duration of the block"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.size)
+            self._loop = loop
+
+        async with self._semaphore:
+            driver = await self.run(self._checkout_sync)
+            self.stats['checkouts'] += 1
+            healthy = True
+            try:
+                yield PooledBrowser(self, driver)
+            except TimeoutException:
+                raise  # slow page, driver itself is fine
+            except WebDriverException:
+                healthy = False
+                raise
+            finally:
+                await self.run(self._checkin_sync, driver, healthy)
+
+    async def close(self):
+        """Quit every idle driver and stop the executor"""
+        with self._idle_lock:
+            drivers, self._idle = self._idle, []
+        for driver in drivers:
+            await self.run(self._quit_sync, driver)
+        self._executor.shutdown(wait=False)
+
+    def _checkout_sync(self) -> webdriver.Chrome:
+        while True:
+            with self._idle_lock:
+                driver = self._idle.pop() if self._idle else None
+            if driver is None:
+                return self._create_sync()
+            if self._is_healthy_sync(driver):
+                return driver
+            self.stats['unhealthy'] += 1
+            self._quit_sync(driver)
+
+    def _checkin_sync(self, driver: webdriver.Chrome, healthy: bool):
+        if not healthy or self.page_counts.get(id(driver), 0) >= self.max_pages:
+            self.stats['recycled'] += 1
+            self._quit_sync(driver)
+            return
+        with self._idle_lock:
+            self._idle.append(driver)
+
+    def _create_sync(self) -> webdriver.Chrome:
+        driver = webdriver.Chrome(options=self.options_factory())
+        driver.set_page_load_timeout(30)
+        self.page_counts[id(driver)] = 0
+        self.stats['created'] += 1
+        return driver
+
+    def _is_healthy_sync(self, driver: webdriver.Chrome) -> bool:
+        try:
+            driver.execute_script('return 1')
+            return True
+        except WebDriverException:
+            return False
+
+    def _quit_sync(self, driver: webdriver.Chrome):
+        self.page_counts.pop(id(driver), None)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+_browser_pool = None
+
+def get_browser_pool() -> BrowserPool:
+    """Process-wide browser pool shared by all Selenium scrapers"""
+    global _browser_pool
+    if _browser_pool is None:
+        _browser_pool = BrowserPool()
+    return _browser_pool
@@ -1,6 +1,8 @@
 import asyncio
-from typing import List, Dict
+from typing import AsyncIterator, List, Dict
 import aiohttp
+from .scrape_scheduler import get_scrape_scheduler
+from ...http_client import get_http_registry
 
 class InternationalJobScraper:
     def __init__(self):
@@ -31,37 +33,48 @@ class InternationalJobScraper:
         """Scrape international jobs suitable for South Africans"""
         all_jobs = []
         
-        async with aiohttp.ClientSession() as session:
-            tasks = []
-            for site in self.international_sites:
-                for skill in skills:
-                    task = self.scrape_site(session, site, skill, remote_only)
-                    tasks.append(task)
-            
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            for result in results:
-                if isinstance(result, list):
-                    all_jobs.extend(result)
+        session = await get_http_registry().session('scrapers')
+        tasks = []
+        for site in self.international_sites:
+            for skill in skills:
+                tasks.append(lambda s=site, k=skill: self.scrape_site(session, s, k, remote_only))
+        
+        results = await get_scrape_scheduler().run_all(tasks)
+        
+        for result in results:
+            if isinstance(result, list):
+                all_jobs.extend(result)
         
         # Filter jobs that are suitable for South Africans
         suitable_jobs = self._filter_for_south_africans(all_jobs)
         return suitable_jobs
     
+    async def iter_jobs(self, skills: List[str], remote_only: bool = True) -> AsyncIterator[Dict]:
+        """Yield suitable international jobs as each site search completes"""
+        session = await get_http_registry().session('scrapers')
+        streams = [
+            lambda s=site, k=skill: self._iter_site(session, s, k, remote_only)
+            for site in self.international_sites for skill in skills
+        ]
+        async for job in get_scrape_scheduler().stream(streams):
+            if self._is_suitable_for_south_africans(job):
+                yield job
+    
+    async def _iter_site(self, session, site: Dict, skill: str, remote_only: bool) -> AsyncIterator[Dict]:
+        for job in await self.scrape_site(session, site, skill, remote_only):
+            yield job
+    
     def _filter_for_south_africans(self, jobs: List[Dict]) -> List[Dict]:
         """Filter jobs that are suitable for South African applicants"""
-        filtered_jobs = []
-        
-        for job in jobs:
-            # Check timezone compatibility
-            if self._is_timezone_compatible(job):
-                # Check for visa requirements
-                if not self._requires_visa_sponsorship(job):
-                    # Check for remote work capability
-                    if self._can_work_remotely(job):
-                        filtered_jobs.append(job)
-        
-        return filtered_jobs
+        return [job for job in jobs if self._is_suitable_for_south_africans(job)]
+    
+    def _is_suitable_for_south_africans(self, job: Dict) -> bool:
+        """Timezone compatible, no visa sponsorship needed and workable remotely"""
+        return (
+            self._is_timezone_compatible(job)
+            and not self._requires_visa_sponsorship(job)
+            and self._can_work_remotely(job)
+        )
     
     def _is_timezone_compatible(self, job: Dict) -> bool:
         """Check if job timezone is compatible with South Africa (UTC+2)"""
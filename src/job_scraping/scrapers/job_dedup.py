@@ -0,0 +1,221 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from ...location_za.location_index import LOCATION_INDEX, normalize_location
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+# Legal-form suffixes boards add or drop for the same employer
+COMPANY_SUFFIXES = re.compile(r'\b(pty|ltd|limited|inc|llc|plc|co|sa|za|group|holdings)\b')
+
+# Words per description shingle
+SHINGLE_SIZE = 3
+
+def _words(text: str) -> List[str]:
+    return re.findall(r'[a-z0-9+#]+', (text or '').lower())
+
+def normalize_company(name: str) -> str:
+    """Employer name without case, punctuation or legal-form suffixes ('ABC (Pty) Ltd' -> 'abc')"""
+    return ' '.join(COMPANY_SUFFIXES.sub(' ', ' '.join(_words(name))).split())
+
+def job_shingles(job: Dict, shingle_size: int = SHINGLE_SIZE) -> set:
+    """Features compared between listings: tagged title/company/location tokens plus description word shingles"""
+    features = {f"t:{word}" for word in _words(job.get('title', ''))}
+
+    features.update(f"c:{word}" for word in normalize_company(job.get('company', '')).split())
+
+    location = job.get('location') or ''
+    province = job.get('province') or LOCATION_INDEX.province_for(location)
+    if province:
+        features.add(f"p:{province}")
+    elif location:
+        features.add(f"l:{normalize_location(location)}")
+
+    words = _words(job.get('description', ''))
+    features.update(' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1))
+    return features
+
+class JobDeduplicator:
+    """Cross-source near-duplicate detection with MinHash signatures and LSH banding.
+
+    Every distinct vacancy gets a canonical id; the same vacancy scraped
+    from another board (or re-posted with a tweaked description) resolves
+    to that id and only adds its URL to the canonical job's source list.
+
+    Signatures are ``num_perm`` MinHash values over ``job_shingles``. They
+    are split into ``bands`` bands whose hashes are stored in an indexed
+    SQLite table, so finding candidates is one indexed lookup per listing
+    instead of a scan over every stored job. Candidates are confirmed when
+    their estimated Jaccard similarity reaches ``threshold``. A listing
+    without enough description to shingle is compared on title, company
+    and location alone, which different vacancies at one employer share
+    easily, so it must reach the stricter ``metadata_threshold`` instead.
+    """
+
+    def __init__(self, db_path: str = "data/job_dedup.db", num_perm: int = 128, bands: int = 32,
+                 threshold: float = 0.7, metadata_threshold: float = 0.95, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.db_path = db_path
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.metadata_threshold = metadata_threshold
+        self.stats = {'checked': 0, 'url_hits': 0, 'near_duplicates': 0, 'new': 0, 'candidates': 0}
+
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(1, int(MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = generator.randint(0, int(MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+
+        self._lock = threading.Lock()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS canonical_jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    title TEXT,
+                    company TEXT,
+                    location TEXT,
+                    signature BLOB NOT NULL,
+                    first_seen TEXT NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS job_sources (
+                    url TEXT PRIMARY KEY,
+                    canonical_id INTEGER NOT NULL,
+                    source TEXT,
+                    seen_at TEXT NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_job_sources_canonical ON job_sources (canonical_id)")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS lsh_buckets (
+                    bucket INTEGER NOT NULL,
+                    canonical_id INTEGER NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_lsh_buckets_bucket ON lsh_buckets (bucket)")
+
+    def signature(self, job: Dict) -> np.ndarray:
+        """MinHash signature (num_perm uint32 values) of a job's shingles"""
+        shingles = job_shingles(job)
+        if not shingles:
+            return np.full(self.num_perm, MAX_HASH, dtype=np.uint32)
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64, count=len(shingles))
+        permuted = (np.outer(hashes, self._a) + self._b) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def resolve(self, job: Dict) -> Tuple[int, bool]:
+        """Canonical id for a job and whether it is a new vacancy; records the job's URL as a source"""
+        url = job.get('url') or job.get('job_url')
+        now = datetime.utcnow().isoformat()
+        with self._lock:
+            self.stats['checked'] += 1
+            if url:
+                row = self._conn.execute("SELECT canonical_id FROM job_sources WHERE url = ?", (url,)).fetchone()
+                if row:
+                    self.stats['url_hits'] += 1
+                    return row[0], False
+
+            signature = self.signature(job)
+            buckets = self._band_hashes(signature)
+            has_description = len(_words(job.get('description', ''))) >= SHINGLE_SIZE
+            canonical_id = self._find_duplicate(
+                signature, buckets, self.threshold if has_description else self.metadata_threshold
+            )
+
+            with self._conn:
+                is_new = canonical_id is None
+                if is_new:
+                    canonical_id = self._conn.execute(
+                        "INSERT INTO canonical_jobs (title, company, location, signature, first_seen) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (job.get('title'), job.get('company'), job.get('location'), signature.tobytes(), now)
+                    ).lastrowid
+                    self._conn.executemany(
+                        "INSERT INTO lsh_buckets (bucket, canonical_id) VALUES (?, ?)",
+                        [(bucket, canonical_id) for bucket in buckets]
+                    )
+                    self.stats['new'] += 1
+                else:
+                    self.stats['near_duplicates'] += 1
+                if url:
+                    self._conn.execute(
+                        "INSERT OR IGNORE INTO job_sources (url, canonical_id, source, seen_at) VALUES (?, ?, ?, ?)",
+                        (url, canonical_id, job.get('source'), now)
+                    )
+        return canonical_id, is_new
+
+    def dedupe(self, jobs: List[Dict]) -> List[Dict]:
+        """One job per canonical vacancy, tagged with 'canonical_id' and every 'source_urls' seen in the batch"""
+        unique: Dict[int, Dict] = {}
+        for job in jobs:
+            canonical_id, _ = self.resolve(job)
+            url = job.get('url') or job.get('job_url')
+            kept = unique.get(canonical_id)
+            if kept is None:
+                kept = unique[canonical_id] = {**job, 'canonical_id': canonical_id, 'source_urls': []}
+            if url and url not in kept['source_urls']:
+                kept['source_urls'].append(url)
+        return list(unique.values())
+
+    def source_urls(self, canonical_id: int) -> List[str]:
+        """Every URL the vacancy has been seen at, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url FROM job_sources WHERE canonical_id = ? ORDER BY seen_at", (canonical_id,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def _band_hashes(self, signature: np.ndarray) -> List[int]:
+        """One signed 64-bit bucket key per band (band index included so bands never collide)"""
+        if (signature == MAX_HASH).all():
+            return []  # nothing to compare on; never treat empty jobs as duplicates
+        keys = []
+        for band in range(self.bands):
+            digest = hashlib.blake2b(
+                signature[band * self.rows:(band + 1) * self.rows].tobytes(), digest_size=8, key=bytes([band])
+            ).digest()
+            keys.append(int.from_bytes(digest, 'big', signed=True))
+        return keys
+
+    def _find_duplicate(self, signature: np.ndarray, buckets: List[int], threshold: float) -> Optional[int]:
+        """Best stored candidate whose estimated Jaccard similarity reaches threshold"""
+        if not buckets:
+            return None
+        placeholders = ','.join('?' * len(buckets))
+        rows = self._conn.execute(
+            f"SELECT id, signature FROM canonical_jobs WHERE id IN "
+            f"(SELECT DISTINCT canonical_id FROM lsh_buckets WHERE bucket IN ({placeholders}))",
+            buckets
+        ).fetchall()
+        self.stats['candidates'] += len(rows)
+
+        best_id, best_similarity = None, threshold
+        for candidate_id, blob in rows:
+            similarity = float(np.mean(np.frombuffer(blob, dtype=np.uint32) == signature))
+            if similarity >= best_similarity:
+                best_id, best_similarity = candidate_id, similarity
+        return best_id
+
+_job_deduplicator = None
+
+def get_job_deduplicator() -> JobDeduplicator:
+    """Process-wide deduplicator backed by data/job_dedup.db"""
+    global _job_deduplicator
+    if _job_deduplicator is None:
+        _job_deduplicator = JobDeduplicator()
+    return _job_deduplicator
@@ -0,0 +1,412 @@
+import hashlib
+import json
+import os
+import threading
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends from concurrent processes are not serialized
+    fcntl = None
+
+def job_key(job: Dict) -> str:
+    """Natural key of a scraped job: its URL, else a hash of source, title, company and location"""
+    url = job.get('url') or job.get('job_url')
+    if url:
+        return url
+    identity = '|'.join(str(job.get(field, '')).lower() for field in ('source', 'title', 'company', 'location'))
+    return hashlib.sha1(identity.encode('utf-8')).hexdigest()
+
+def _row_date(job: Dict) -> int:
+    """Ordinal day a row is dated by: its posting date, else the day it was indexed (0 if unknown)"""
+    for field in ('posted_date', 'date_posted', 'indexed_at'):
+        value = job.get(field)
+        if value:
+            try:
+                return date.fromisoformat(str(value)[:10]).toordinal()
+            except ValueError:
+                continue
+    return 0
+
+class JobTextIndex:
+    """Persistent TF-IDF index over scraped job text.
+
+    New scrape results are appended without re-tokenizing the existing
+    corpus. IDF weights are recomputed from the stored document frequencies
+    when the index is searched, using the same smoothed formula as
+    sklearn's TfidfVectorizer. Adding a job whose key is already indexed
+    with ``replace=True`` appends a new row that supersedes the old one;
+    superseded rows are no longer searched or counted in the IDF.
+
+    On-disk layout (append-only between prunes):
+        terms.txt      one vocabulary term per line, in column order
+        jobs.jsonl     one job dict per line, in row order
+        chunks/*.npz   sparse term-count matrix for each appended batch
+        generation     changes whenever prune() rewrites the files
+
+    Several processes can share one path: appends hold an exclusive lock
+    and first pick up the batches others wrote, so column numbers agree,
+    and search() picks them up too. prune() drops superseded rows and rows
+    dated before the retention window; other processes reload on seeing the
+    new generation.
+    """
+
+    def __init__(self, path: Optional[str] = None, analyzer: Optional[Callable[[str], List[str]]] = None,
+                 max_features: int = 50000):
+        self.path = path
+        self.analyzer = analyzer or TfidfVectorizer(stop_words='english').build_analyzer()
+        self.max_features = max_features
+
+        self._lock = threading.Lock()
+        self._reset()
+
+        if path:
+            os.makedirs(path, exist_ok=True)
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def add_jobs(self, jobs: List[Dict], replace: bool = False) -> int:
+        """Append jobs to the index. Returns the number added.
+
+        Jobs already indexed are skipped, unless ``replace`` is set (e.g. the
+        listing changed): then the new row supersedes the old one.
+        """
+        with self._lock, self._file_lock():
+            self._refresh()
+            return self._add_jobs(jobs, replace)
+
+    def refresh(self):
+        """Load batches other processes appended since this index was last read"""
+        with self._lock, self._file_lock(shared=True):
+            self._refresh()
+
+    def prune(self, since: date, min_fraction: float = 0.2) -> int:
+        """Drop superseded rows and rows dated before ``since``; returns the number dropped.
+
+        Dropping means rewriting every file, so nothing is done until at
+        least ``min_fraction`` of the rows would go.
+        """
+        with self._lock, self._file_lock():
+            self._refresh()
+            keep = np.flatnonzero(self._alive & (self._dates >= since.toordinal()))
+            dropped = len(self.jobs) - len(keep)
+            if not dropped or dropped < min_fraction * len(self.jobs):
+                return 0
+
+            counts = self._counts()[keep]
+            # Terms no surviving row uses are dropped and the columns renumbered
+            used = np.flatnonzero(np.bincount(counts.indices, minlength=counts.shape[1]))
+            counts = counts[:, used].tocsr()
+            terms = list(self.vocabulary)
+            terms = [terms[column] for column in used]
+            jobs = [self.jobs[row] for row in keep]
+
+            self._reset()
+            self.vocabulary = {term: i for i, term in enumerate(terms)}
+            self._track_rows(jobs, counts)
+            if self.path:
+                self._rewrite_disk(jobs, counts, terms)
+            return dropped
+
+    def _add_jobs(self, jobs: List[Dict], replace: bool) -> int:
+        batch: Dict[str, Dict] = {}
+        for job in jobs:
+            key = job_key(job)
+            if replace or key not in self._row_of:
+                batch[key] = job  # the last copy of a key in one batch wins
+        if not batch:
+            return 0
+
+        today = date.today().isoformat()
+        new_jobs = [{**job, 'indexed_at': job.get('indexed_at') or today} for job in batch.values()]
+        n_terms_before = len(self.vocabulary)
+        counts = self._count_terms([self._job_text(job) for job in new_jobs], grow=True)
+        self._track_rows(new_jobs, counts)
+
+        if self.path:
+            self._append_to_disk(new_jobs, counts, list(self.vocabulary)[n_terms_before:])
+            self._loaded_chunks += 1
+
+        return len(new_jobs)
+
+    def search(self, text: str, top_k: int = 100, since: Optional[date] = None) -> List[Tuple[Dict, float]]:
+        """Return up to top_k (job, cosine similarity) pairs for free text such as a resume.
+
+        With ``since``, only jobs dated on or after it are considered, before
+        the top_k cut, so older similar jobs cannot crowd out recent ones.
+        """
+
+        self.refresh()
+        with self._lock:
+            if not self._row_of:
+                return []
+            matrix, idf = self._tfidf_matrix()
+            query = self._count_terms([text], grow=False).multiply(idf).tocsr()
+            jobs = self.jobs[:matrix.shape[0]]
+            eligible = self._alive[:matrix.shape[0]].copy()
+            if since is not None:
+                eligible &= self._dates[:matrix.shape[0]] >= since.toordinal()
+        norm = np.sqrt(query.multiply(query).sum())
+        if norm == 0:
+            return []
+
+        scores = (matrix @ (query / norm).T).toarray().ravel()
+        scores[~eligible] = 0
+        if top_k < len(scores):
+            candidates = np.argpartition(-scores, top_k)[:top_k]
+        else:
+            candidates = np.arange(len(scores))
+        candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+
+        return [(jobs[i], float(scores[i])) for i in candidates if scores[i] > 0]
+
+    def _count_terms(self, texts: List[str], grow: bool) -> sp.csr_matrix:
+        """Tokenize texts into a sparse count matrix, optionally adding unseen terms to the vocabulary"""
+
+        indptr, indices, data = [0], [], []
+        for text in texts:
+            term_counts = Counter()
+            for term in self.analyzer(text):
+                column = self.vocabulary.get(term)
+                if column is None and grow and len(self.vocabulary) < self.max_features:
+                    column = self.vocabulary[term] = len(self.vocabulary)
+                if column is not None:
+                    term_counts[column] += 1
+            indices.extend(term_counts.keys())
+            data.extend(term_counts.values())
+            indptr.append(len(indices))
+
+        return sp.csr_matrix((data, indices, indptr), shape=(len(texts), len(self.vocabulary)), dtype=np.float64)
+
+    def _counts(self) -> sp.csr_matrix:
+        """All rows' term counts as one matrix (the chunks are merged in place)"""
+        n_terms = len(self.vocabulary)
+        for chunk in self._chunks:
+            chunk.resize((chunk.shape[0], n_terms))
+        if len(self._chunks) != 1:
+            self._chunks = [sp.vstack(self._chunks, format='csr') if self._chunks
+                            else sp.csr_matrix((0, n_terms))]
+        return self._chunks[0]
+
+    def _tfidf_matrix(self):
+        """Stack the count chunks and apply current IDF weights and L2 row normalization"""
+
+        if self._tfidf is None:
+            counts = self._counts()
+            idf = np.log((1 + len(self._row_of)) / (1 + self._doc_freq)) + 1
+            weighted = counts.multiply(idf).tocsr()
+            norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+            norms[norms == 0] = 1
+            self._tfidf = (sp.diags(1 / norms) @ weighted).tocsr(), idf
+
+        return self._tfidf
+
+    def _reset(self):
+        self.vocabulary: Dict[str, int] = {}
+        self.jobs: List[Dict] = []
+        self._row_of: Dict[str, int] = {}  # job key -> its current row
+        self._alive = np.zeros(0, dtype=bool)  # False for superseded rows
+        self._dates = np.zeros(0, dtype=np.int64)  # ordinal day of each row
+        self._chunks: List[sp.csr_matrix] = []
+        self._doc_freq = np.zeros(0)
+        self._tfidf = None  # cached row-normalized matrix, reset on any change
+        self._loaded_chunks = 0
+        self._terms_offset = 0
+        self._jobs_offset = 0
+        self._generation = None
+
+    def _track_rows(self, jobs: List[Dict], counts: sp.csr_matrix):
+        """Account for rows appended in file order; a row supersedes an earlier one with the same key"""
+        start = len(self.jobs)
+        self.jobs.extend(jobs)
+        self._chunks.append(counts)
+        self._alive = np.concatenate([self._alive, np.ones(len(jobs), dtype=bool)])
+        self._dates = np.concatenate([self._dates, np.array([_row_date(job) for job in jobs], dtype=np.int64)])
+        self._doc_freq = np.concatenate([self._doc_freq, np.zeros(len(self.vocabulary) - len(self._doc_freq))])
+        self._doc_freq += np.bincount(counts.indices, minlength=len(self.vocabulary))
+        for offset, job in enumerate(jobs):
+            key = job_key(job)
+            previous = self._row_of.get(key)
+            if previous is not None:
+                self._retire(previous)
+            self._row_of[key] = start + offset
+        self._tfidf = None
+
+    def _retire(self, row: int):
+        self._alive[row] = False
+        for chunk in self._chunks:
+            if row < chunk.shape[0]:
+                self._doc_freq[chunk.indices[chunk.indptr[row]:chunk.indptr[row + 1]]] -= 1
+                return
+            row -= chunk.shape[0]
+
+    def _job_text(self, job: Dict) -> str:
+        return ' '.join(str(job.get(field) or '') for field in ('title', 'company', 'description'))
+
+    def _append_to_disk(self, jobs: List[Dict], counts: sp.csr_matrix, new_terms: List[str]):
+        """Persist one appended batch without rewriting earlier batches"""
+
+        chunk_dir = os.path.join(self.path, 'chunks')
+        os.makedirs(chunk_dir, exist_ok=True)
+
+        # Counts go first: a chunk without its terms/jobs lines is ignored on load
+        chunk_name = f"{len(os.listdir(chunk_dir)):06d}"
+        tmp_path = os.path.join(chunk_dir, f".{chunk_name}.tmp.npz")
+        sp.save_npz(tmp_path, counts)
+
+        with open(os.path.join(self.path, 'terms.txt'), 'a', encoding='utf-8') as f:
+            f.writelines(f"{term}\n" for term in new_terms)
+            self._terms_offset = f.tell()
+        with open(os.path.join(self.path, 'jobs.jsonl'), 'a', encoding='utf-8') as f:
+            f.writelines(json.dumps(job, default=str) + '\n' for job in jobs)
+            self._jobs_offset = f.tell()
+
+        os.replace(tmp_path, os.path.join(chunk_dir, f"{chunk_name}.npz"))
+
+    def _rewrite_disk(self, jobs: List[Dict], counts: sp.csr_matrix, terms: List[str]):
+        """Replace every file with the pruned index; readers reload on the new generation"""
+
+        chunk_dir = os.path.join(self.path, 'chunks')
+        os.makedirs(chunk_dir, exist_ok=True)
+        sp.save_npz(os.path.join(chunk_dir, ".000000.tmp.npz"), counts)
+        for name, lines in (('terms.txt', (f"{term}\n" for term in terms)),
+                            ('jobs.jsonl', (json.dumps(job, default=str) + '\n' for job in jobs))):
+            with open(os.path.join(self.path, f".{name}.tmp"), 'w', encoding='utf-8') as f:
+                f.writelines(lines)
+        for name in os.listdir(chunk_dir):
+            if not name.startswith('.'):
+                os.remove(os.path.join(chunk_dir, name))
+        os.replace(os.path.join(chunk_dir, ".000000.tmp.npz"), os.path.join(chunk_dir, "000000.npz"))
+        for name in ('terms.txt', 'jobs.jsonl'):
+            os.replace(os.path.join(self.path, f".{name}.tmp"), os.path.join(self.path, name))
+
+        self._generation = uuid.uuid4().hex
+        with open(os.path.join(self.path, 'generation'), 'w', encoding='utf-8') as f:
+            f.write(self._generation)
+        self._terms_offset = os.path.getsize(os.path.join(self.path, 'terms.txt'))
+        self._jobs_offset = os.path.getsize(os.path.join(self.path, 'jobs.jsonl'))
+        self._loaded_chunks = 1
+
+    def _read_generation(self) -> Optional[str]:
+        try:
+            with open(os.path.join(self.path, 'generation'), encoding='utf-8') as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _load(self):
+        """Load an existing index from self.path, if any"""
+
+        self._reset()
+        self._generation = self._read_generation()
+        chunk_dir = os.path.join(self.path, 'chunks')
+        terms_path = os.path.join(self.path, 'terms.txt')
+        jobs_path = os.path.join(self.path, 'jobs.jsonl')
+        if not (os.path.isdir(chunk_dir) and os.path.exists(terms_path) and os.path.exists(jobs_path)):
+            return
+
+        with open(terms_path, encoding='utf-8') as f:
+            terms = f.read().splitlines()
+        with open(jobs_path, encoding='utf-8') as f:
+            jobs = [json.loads(line) for line in f if line.strip()]
+
+        chunks = []
+        n_rows = 0
+        for name in sorted(os.listdir(chunk_dir)):
+            if name.startswith('.'):
+                continue
+            chunk = sp.load_npz(os.path.join(chunk_dir, name)).tocsr()
+            chunks.append(chunk)
+            n_rows += chunk.shape[0]
+
+        n_terms = max((chunk.shape[1] for chunk in chunks), default=0)
+        if len(terms) > n_terms or len(jobs) > n_rows:
+            # An interrupted append left lines without a matching chunk
+            terms, jobs = terms[:n_terms], jobs[:n_rows]
+            with open(terms_path, 'w', encoding='utf-8') as f:
+                f.writelines(f"{term}\n" for term in terms)
+            with open(jobs_path, 'w', encoding='utf-8') as f:
+                f.writelines(json.dumps(job, default=str) + '\n' for job in jobs)
+
+        with open(terms_path, 'rb') as f:
+            self._terms_offset = f.seek(0, os.SEEK_END)
+        with open(jobs_path, 'rb') as f:
+            self._jobs_offset = f.seek(0, os.SEEK_END)
+        self._loaded_chunks = len(chunks)
+        self.vocabulary = {term: i for i, term in enumerate(terms)}
+        row = 0
+        for chunk in chunks:
+            self._track_rows(jobs[row:row + chunk.shape[0]], chunk)
+            row += chunk.shape[0]
+
+    def _refresh(self):
+        if not self.path:
+            return
+        if self._read_generation() != self._generation:
+            self._load()  # another process pruned the index
+            return
+        chunk_dir = os.path.join(self.path, 'chunks')
+        if not os.path.isdir(chunk_dir):
+            return
+        names = sorted(name for name in os.listdir(chunk_dir) if not name.startswith('.'))
+        if len(names) <= self._loaded_chunks:
+            return
+
+        # A chunk file is renamed into place only after its terms and jobs lines are written
+        chunks = [sp.load_npz(os.path.join(chunk_dir, name)).tocsr() for name in names[self._loaded_chunks:]]
+        n_terms = max(chunk.shape[1] for chunk in chunks)
+        n_jobs = sum(chunk.shape[0] for chunk in chunks)
+        terms, self._terms_offset = self._read_lines('terms.txt', self._terms_offset,
+                                                     n_terms - len(self.vocabulary))
+        lines, self._jobs_offset = self._read_lines('jobs.jsonl', self._jobs_offset, n_jobs)
+
+        for term in terms:
+            self.vocabulary[term] = len(self.vocabulary)
+        jobs = [json.loads(line) for line in lines]
+        row = 0
+        for chunk in chunks:
+            self._track_rows(jobs[row:row + chunk.shape[0]], chunk)
+            row += chunk.shape[0]
+        self._loaded_chunks = len(names)
+
+    def _read_lines(self, name: str, offset: int, count: int) -> Tuple[List[str], int]:
+        lines = []
+        with open(os.path.join(self.path, name), encoding='utf-8') as f:
+            f.seek(offset)
+            while len(lines) < count:
+                line = f.readline()
+                if not line:
+                    break
+                lines.append(line.rstrip('\n'))
+            return lines, f.tell()
+
+    @contextmanager
+    def _file_lock(self, shared: bool = False):
+        if not self.path or fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.path, '.lock'), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+_job_text_index = None
+
+def get_job_text_index() -> JobTextIndex:
+    """Process-wide text index over ingested jobs, shared on disk at data/job_index"""
+    global _job_text_index
+    if _job_text_index is None:
+        _job_text_index = JobTextIndex(path="data/job_index")
+    return _job_text_index
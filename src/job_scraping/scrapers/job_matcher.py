@@ -1,18 +1,64 @@
-from typing import List, Dict
+from datetime import date
+from typing import List, Dict, Optional, Tuple
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 import re
+from ...location_za.provinces_za import SOUTH_AFRICA_PROVINCES
+from ...location_za.location_index import LOCATION_INDEX
+from ...document_processing.skill_taxonomy import get_skill_extractor
+from .job_index import JobTextIndex
+
+# Ordered province codes used for the integer province vectors in batch mode
+PROVINCE_CODES = list(SOUTH_AFRICA_PROVINCES.keys())
+
+EDUCATION_LEVELS = {
+    'matric': 1, 'grade 12': 1, 'certificate': 1,
+    'diploma': 2,
+    'degree': 3, 'bachelor': 3, 'bsc': 3, 'ba ': 3, 'bcom': 3,
+    'honours': 4, 'postgraduate': 4,
+    'master': 5, 'msc': 5, 'mba': 5,
+    'phd': 6, 'doctorate': 6
+}
+
+def parse_salary_range(salary) -> Tuple[float, float]:
+    """(min, max) monthly ZAR figures from a salary string such as 'R35 000 - R45 000'; (0, 0) if none"""
+    if isinstance(salary, (int, float)):
+        return float(salary), float(salary)
+    if not salary:
+        return 0.0, 0.0
+    
+    cleaned = re.sub(r'(?<=\d)[\s,](?=\d{3})', '', salary.lower())
+    amounts = []
+    for number, suffix in re.findall(r'(\d+(?:\.\d+)?)\s*(k?)', cleaned)[:2]:
+        amount = float(number) * (1000 if suffix else 1)
+        amounts.append(amount)
+    
+    if not amounts:
+        return 0.0, 0.0
+    return min(amounts), max(amounts)
 
 class JobMatcher:
-    def __init__(self):
+    def __init__(self, index_path: Optional[str] = None, job_index: Optional[JobTextIndex] = None):
         self.vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
+        # Shares the vectorizer's tokenization so index and query terms line up
+        if job_index is None:
+            job_index = JobTextIndex(path=index_path, analyzer=self.vectorizer.build_analyzer())
+        self.job_index = job_index
+        self.skill_extractor = get_skill_extractor()
+        # Keyed by canonical skill ID; skills not listed weigh 1.0
         self.skill_weights = {
             'python': 1.2, 'java': 1.1, 'javascript': 1.1, 'react': 1.3,
             'node.js': 1.2, 'aws': 1.4, 'docker': 1.3, 'kubernetes': 1.4,
             'machine learning': 1.5, 'ai': 1.5, 'data science': 1.4,
             'project management': 1.2, 'agile': 1.1, 'scrum': 1.1
         }
+        self.score_weights = {
+            'skills': 0.4,
+            'experience': 0.2,
+            'location': 0.15,
+            'salary': 0.15,
+            'education': 0.1
+        }
     
     def calculate_match_scores(self, jobs: List[Dict], user_profile: Dict) -> List[Dict]:
         """Calculate match scores between jobs and user profile"""
@@ -28,17 +74,31 @@ class JobMatcher:
         # Sort by match score
         return sorted(enhanced_jobs, key=lambda x: x['match_score'], reverse=True)
     
+    def index_jobs(self, jobs: List[Dict]) -> int:
+        """Append freshly scraped jobs to the persistent text index"""
+        return self.job_index.add_jobs(jobs)
+    
+    def match_indexed_jobs(self, user_profile: Dict, top_k: int = 200, since: Optional[date] = None) -> List[Dict]:
+        """Score only the top_k indexed jobs most similar to the user's resume text"""
+        return self.calculate_match_scores(self.indexed_candidates(user_profile, top_k, since), user_profile)
+    
+    def indexed_candidates(self, user_profile: Dict, top_k: int = 200, since: Optional[date] = None) -> List[Dict]:
+        """The top_k indexed jobs dated on or after ``since`` most similar to the user's resume text, unscored"""
+        candidates = self.job_index.search(self._profile_text(user_profile), top_k=top_k, since=since)
+        return [{**job, 'text_similarity': similarity} for job, similarity in candidates]
+    
+    def _profile_text(self, user_profile: Dict) -> str:
+        """Free text used to query the job index for a user"""
+        resume_text = user_profile.get('raw_text') or user_profile.get('resume_text')
+        if resume_text:
+            return resume_text
+        return ' '.join(user_profile.get('skills', []) + user_profile.get('target_titles', []))
+    
     def _calculate_individual_match(self, job: Dict, user_profile: Dict) -> float:
         """Calculate individual job match score"""
         
         total_score = 0
-        weights = {
-            'skills': 0.4,
-            'experience': 0.2,
-            'location': 0.15,
-            'salary': 0.15,
-            'education': 0.1
-        }
+        weights = self.score_weights
         
         # Skills match
         skills_score = self._calculate_skills_match(job, user_profile)
@@ -71,10 +131,10 @@ class JobMatcher:
         if not job_skills or not user_skills:
             return 0.5  # Neutral score if no skills data
         
-        # Calculate weighted skill match
-        matched_skills = set(job_skills) & set(user_skills)
-        total_weight = sum(self.skill_weights.get(skill.lower(), 1.0) for skill in job_skills)
-        matched_weight = sum(self.skill_weights.get(skill.lower(), 1.0) for skill in matched_skills)
+        # Calculate weighted skill match on canonical skill IDs
+        matched_skills = set(job_skills) & self.skill_extractor.canonicalize(user_skills)
+        total_weight = sum(self.skill_weights.get(skill, 1.0) for skill in job_skills)
+        matched_weight = sum(self.skill_weights.get(skill, 1.0) for skill in matched_skills)
         
         return matched_weight / total_weight if total_weight > 0 else 0
     
@@ -111,7 +171,7 @@ class JobMatcher:
         job_province = self._extract_province(job_location)
         user_provinces = [self._extract_province(loc) for loc in user_locations]
         
-        if job_province in user_provinces:
+        if job_province and job_province in user_provinces:
             return 0.8
         
         # Remote work
@@ -129,4 +189,252 @@ class JobMatcher:
         if job_salary == 0 or user_expected == 0:
             return 0.7  # Neutral if no salary data
         
-        if job_salary >=
+        if job_salary >= user_expected:
+            return 1.0
+        elif job_salary >= user_expected * 0.85:  # Within 15% of expectation
+            return 0.7
+        else:
+            return 0.3
+    
+    def _calculate_education_match(self, job: Dict, user_profile: Dict) -> float:
+        """Calculate education requirement match"""
+        
+        required_level = self._education_level(job.get('description', ''))
+        user_level = self._education_level(user_profile.get('education', ''))
+        
+        if required_level == 0:  # No education requirement specified
+            return 0.8
+        
+        return 1.0 if user_level >= required_level else 0.4
+    
+    def _get_match_breakdown(self, job: Dict, user_profile: Dict) -> Dict:
+        """Per-component scores used to explain the overall match"""
+        return {
+            'skills': self._calculate_skills_match(job, user_profile),
+            'experience': self._calculate_experience_match(job, user_profile),
+            'location': self._calculate_location_match(job, user_profile),
+            'salary': self._calculate_salary_match(job, user_profile),
+            'education': self._calculate_education_match(job, user_profile)
+        }
+    
+    def _extract_skills_from_text(self, text: str) -> List[str]:
+        """Extract canonical skill IDs from job text"""
+        return self.skill_extractor.extract_ids(text)
+    
+    def _parse_experience_requirement(self, description: str) -> int:
+        """Parse the minimum years of experience from a job description"""
+        match = re.search(r'(\d+)\s*\+?\s*(?:-\s*\d+\s*)?years?', description.lower())
+        return int(match.group(1)) if match else 0
+    
+    def _parse_salary(self, salary) -> float:
+        """Parse a ZAR salary string such as 'R35 000 - R45 000' into a single monthly figure"""
+        low, high = parse_salary_range(salary)
+        return (low + high) / 2
+    
+    def _education_level(self, text) -> int:
+        """Map free text to the highest education level it mentions"""
+        if isinstance(text, list):
+            text = ' '.join(str(item) for item in text)
+        text_lower = f"{text or ''} ".lower()
+        return max((level for keyword, level in EDUCATION_LEVELS.items() if keyword in text_lower), default=0)
+    
+    def _extract_province(self, location: str) -> Optional[str]:
+        """Find the province code for a location string"""
+        return LOCATION_INDEX.province_for(location)
+    
+    # Batch scoring
+    
+    def build_job_features(self, jobs: List[Dict]) -> 'JobFeatureMatrix':
+        """Extract skills, experience, salary, education and location features for a job set once"""
+        
+        skills = list(self.skill_extractor.taxonomy.keys())
+        skill_index = {skill: i for i, skill in enumerate(skills)}
+        province_index = {code: i for i, code in enumerate(PROVINCE_CODES)}
+        
+        n_jobs = len(jobs)
+        skill_matrix = np.zeros((n_jobs, len(skills)))
+        experience = np.zeros(n_jobs)
+        salary = np.zeros(n_jobs)
+        education = np.zeros(n_jobs)
+        province = np.full(n_jobs, -1, dtype=np.int64)
+        location_ids = np.full(n_jobs, -1, dtype=np.int64)
+        remote = np.zeros(n_jobs, dtype=bool)
+        location_index = {}
+        
+        for j, job in enumerate(jobs):
+            description = job.get('description', '')
+            for skill in self._extract_skills_from_text(description + ' ' + job.get('title', '')):
+                skill_matrix[j, skill_index[skill]] = self.skill_weights.get(skill, 1.0)
+            
+            experience[j] = self._parse_experience_requirement(description)
+            salary[j] = self._parse_salary(job.get('salary', ''))
+            education[j] = self._education_level(description)
+            
+            job_location = job.get('location', '').lower()
+            if job_location:
+                location_ids[j] = location_index.setdefault(job_location, len(location_index))
+                job_province = self._extract_province(job_location)
+                if job_province:
+                    province[j] = province_index[job_province]
+            remote[j] = 'remote' in job_location or 'work from home' in description.lower()
+        
+        return JobFeatureMatrix(
+            jobs=jobs,
+            skills=skills,
+            skill_matrix=skill_matrix,
+            experience=experience,
+            salary=salary,
+            education=education,
+            province=province,
+            location_ids=location_ids,
+            location_index=location_index,
+            remote=remote
+        )
+    
+    def score_block(self, features: 'JobFeatureMatrix', user_profiles: List[Dict]) -> Dict[str, np.ndarray]:
+        """Score a users x jobs block with matrix operations.
+        
+        Returns one (n_users, n_jobs) array per score component plus 'total'.
+        """
+        
+        n_users = len(user_profiles)
+        n_provinces = len(PROVINCE_CODES)
+        province_index = {code: i for i, code in enumerate(PROVINCE_CODES)}
+        skill_index = {skill: i for i, skill in enumerate(features.skills)}
+        
+        user_skills = np.zeros((n_users, len(features.skills)))
+        user_has_skills = np.zeros(n_users, dtype=bool)
+        # Extra trailing column stays zero so jobs with no province (-1) never match
+        user_provinces = np.zeros((n_users, n_provinces + 1), dtype=bool)
+        user_exact = np.zeros((n_users, len(features.location_index) + 1), dtype=bool)
+        user_has_locations = np.zeros(n_users, dtype=bool)
+        user_years = np.zeros(n_users)
+        user_salary = np.zeros(n_users)
+        user_education = np.zeros(n_users)
+        
+        for u, profile in enumerate(user_profiles):
+            raw_skills = profile.get('skills', [])
+            user_has_skills[u] = bool(raw_skills)
+            for skill in self.skill_extractor.canonicalize(raw_skills):
+                if skill in skill_index:
+                    user_skills[u, skill_index[skill]] = 1
+            
+            locations = [loc.lower() for loc in profile.get('preferred_locations', [])]
+            user_has_locations[u] = bool(locations)
+            for loc in locations:
+                if loc in features.location_index:
+                    user_exact[u, features.location_index[loc]] = True
+                loc_province = self._extract_province(loc)
+                if loc_province:
+                    user_provinces[u, province_index[loc_province]] = True
+            
+            user_years[u] = profile.get('years_experience', 0)
+            user_salary[u] = profile.get('expected_salary', 0)
+            user_education[u] = self._education_level(profile.get('education', ''))
+        
+        # Skills: weighted share of the job's skills the user has
+        total_weight = features.skill_matrix.sum(axis=1)
+        matched_weight = user_skills @ features.skill_matrix.T
+        skills_score = np.divide(
+            matched_weight, total_weight[None, :],
+            out=np.zeros_like(matched_weight), where=total_weight[None, :] > 0
+        )
+        skills_score = np.where(~user_has_skills[:, None] | (total_weight == 0)[None, :], 0.5, skills_score)
+        
+        # Experience
+        required = features.experience[None, :]
+        years = user_years[:, None]
+        experience_score = np.where(years >= required, 1.0, np.where(years >= required * 0.7, 0.7, 0.3))
+        experience_score = np.where(required == 0, 0.8, experience_score)
+        
+        # Location: exact > province > remote > elsewhere, neutral without data
+        exact = user_exact[:, features.location_ids]
+        same_province = user_provinces[:, features.province]
+        location_score = np.where(features.remote[None, :], 0.9, 0.2)
+        location_score = np.where(same_province, 0.8, location_score)
+        location_score = np.where(exact, 1.0, location_score)
+        no_location = ~user_has_locations[:, None] | (features.location_ids < 0)[None, :]
+        location_score = np.where(no_location, 0.6, location_score)
+        
+        # Salary
+        offered = features.salary[None, :]
+        expected = user_salary[:, None]
+        salary_score = np.where(offered >= expected, 1.0, np.where(offered >= expected * 0.85, 0.7, 0.3))
+        salary_score = np.where((offered == 0) | (expected == 0), 0.7, salary_score)
+        
+        # Education
+        required_level = features.education[None, :]
+        education_score = np.where(user_education[:, None] >= required_level, 1.0, 0.4)
+        education_score = np.where(required_level == 0, 0.8, education_score)
+        
+        components = {
+            'skills': skills_score,
+            'experience': experience_score,
+            'location': location_score,
+            'salary': salary_score,
+            'education': education_score
+        }
+        
+        total = np.zeros((n_users, len(features.jobs)))
+        for component, score in components.items():
+            total += score * self.score_weights[component]
+        components['total'] = np.minimum(100, total * 100)
+        
+        return components
+    
+    def calculate_match_scores_batch(self, jobs: List[Dict], user_profiles: List[Dict],
+                                     block_size: int = 256, top_n: Optional[int] = None) -> List[List[Dict]]:
+        """Batch equivalent of calculate_match_scores for many users.
+        
+        Job features are built once and users are scored in blocks of
+        ``block_size`` rows. Returns one ranked job list per user profile with
+        the same 'match_score' and 'match_breakdown' as the per-job path.
+        """
+        
+        features = self.build_job_features(jobs)
+        results = []
+        
+        for start in range(0, len(user_profiles), block_size):
+            block = self.score_block(features, user_profiles[start:start + block_size])
+            
+            for row in range(block['total'].shape[0]):
+                scores = block['total'][row]
+                # Stable sort keeps the per-job path's ordering for tied scores
+                order = np.argsort(-scores, kind='stable')
+                if top_n is not None:
+                    order = order[:top_n]
+                
+                ranked = []
+                for j in order:
+                    ranked.append({
+                        **jobs[j],
+                        'match_score': float(scores[j]),
+                        'match_breakdown': {
+                            component: float(block[component][row, j])
+                            for component in self.score_weights
+                        }
+                    })
+                results.append(ranked)
+        
+        return results
+
+class JobFeatureMatrix:
+    """NumPy feature matrices for a fixed set of jobs, built by JobMatcher.build_job_features"""
+    
+    def __init__(self, jobs: List[Dict], skills: List[str], skill_matrix: np.ndarray,
+                 experience: np.ndarray, salary: np.ndarray, education: np.ndarray,
+                 province: np.ndarray, location_ids: np.ndarray, location_index: Dict[str, int],
+                 remote: np.ndarray):
+        self.jobs = jobs
+        self.skills = skills                  # skill vocabulary, column order of skill_matrix
+        self.skill_matrix = skill_matrix      # (n_jobs, n_skills) weighted by skill_weights
+        self.experience = experience          # required years, 0 if unspecified
+        self.salary = salary                  # parsed ZAR salary, 0 if unspecified
+        self.education = education            # required education level, 0 if unspecified
+        self.province = province              # index into PROVINCE_CODES, -1 if unknown
+        self.location_ids = location_ids      # index into location_index, -1 if no location
+        self.location_index = location_index  # lowercased job location -> id
+        self.remote = remote
+    
+    def __len__(self) -> int:
+        return len(self.jobs)
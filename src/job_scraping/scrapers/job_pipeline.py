@@ -0,0 +1,129 @@
+import asyncio
+import heapq
+import itertools
+from typing import AsyncIterator, Callable, Dict, List, Optional
+from ...location_za.location_index import LOCATION_INDEX
+from .job_dedup import JobDeduplicator, get_job_deduplicator, normalize_company
+from .job_matcher import JobMatcher
+from .scrape_scheduler import get_scrape_scheduler
+
+class TopKJobs:
+    """Bounded min-heap keeping the k best-scoring jobs seen so far"""
+
+    def __init__(self, k: int):
+        self.k = k
+        self._heap = []
+        self._counter = itertools.count()  # tie-breaker so dicts are never compared
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, job: Dict) -> bool:
+        """Offer a scored job; returns True if it is currently in the top k"""
+        entry = (job['match_score'], -next(self._counter), job)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True
+        if entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+            return True
+        return False
+
+    def results(self) -> List[Dict]:
+        """Jobs sorted by match score, best first"""
+        return [job for _, _, job in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
+
+async def merge_job_streams(*streams: AsyncIterator[Dict]) -> AsyncIterator[Dict]:
+    """Interleave several job streams in arrival order"""
+    async for job in get_scrape_scheduler().stream([lambda s=stream: s for stream in streams]):
+        yield job
+
+class JobPipeline:
+    """Streaming scrape -> dedup -> pre-filter -> score -> top-k pipeline for one user.
+
+    Jobs are scored one at a time as the scrapers yield them, so memory is
+    bounded by the top-k heap rather than the full scrape result set. Every
+    job scoring at least ``apply_threshold`` is handed to ``on_high_match``
+    the moment it is scored, letting applications start while slower sites
+    are still being scraped.
+    """
+
+    def __init__(self, user_profile: Dict, preferences: Optional[Dict] = None,
+                 matcher: Optional[JobMatcher] = None, top_k: int = 50, apply_threshold: float = 80,
+                 deduplicator: Optional[JobDeduplicator] = None):
+        self.user_profile = user_profile
+        self.preferences = preferences or {}
+        self.matcher = matcher or JobMatcher()
+        self.deduplicator = deduplicator or get_job_deduplicator()
+        self.top_k = top_k
+        self.apply_threshold = apply_threshold
+        self.stats = {'received': 0, 'duplicates': 0, 'filtered': 0, 'scored': 0, 'high_matches': 0}
+
+        self.excluded_terms = [term.lower() for term in self.preferences.get('exclude_keywords', [])]
+        self.excluded_companies = {normalize_company(company) for company in self.preferences.get('excluded_companies', [])}
+        self.excluded_companies.discard('')
+        self.min_salary = self.preferences.get('min_salary', 0)
+        provinces = {LOCATION_INDEX.province_for(location) for location in self.preferences.get('locations', [])}
+        provinces.discard(None)
+        self.provinces = provinces if self.preferences.get('province_only') else set()
+
+    async def run(self, jobs: AsyncIterator[Dict],
+                  on_high_match: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """Consume a job stream and return the top-k matches, best first"""
+        top = TopKJobs(self.top_k)
+        async for job in self.score(self.prefilter(self.dedup(jobs))):
+            top.push(job)
+            if job['match_score'] >= self.apply_threshold:
+                self.stats['high_matches'] += 1
+                if on_high_match:
+                    on_high_match(job)
+        return top.results()
+
+    async def dedup(self, jobs: AsyncIterator[Dict]) -> AsyncIterator[Dict]:
+        """Drop vacancies already seen in this run, including near-duplicates from other boards"""
+        seen = set()
+        async for job in jobs:
+            self.stats['received'] += 1
+            canonical_id = job.get('canonical_id')
+            if not canonical_id:
+                # SQLite lookup and insert; kept off the event loop
+                canonical_id, _ = await asyncio.to_thread(self.deduplicator.resolve, job)
+            if canonical_id in seen:
+                self.stats['duplicates'] += 1
+                continue
+            seen.add(canonical_id)
+            job['canonical_id'] = canonical_id
+            yield job
+
+    async def prefilter(self, jobs: AsyncIterator[Dict]) -> AsyncIterator[Dict]:
+        """Cheap rejections that need no scoring"""
+        async for job in jobs:
+            if self._passes_prefilter(job):
+                yield job
+            else:
+                self.stats['filtered'] += 1
+
+    async def score(self, jobs: AsyncIterator[Dict]) -> AsyncIterator[Dict]:
+        async for job in jobs:
+            self.stats['scored'] += 1
+            yield self.matcher.calculate_match_scores([job], self.user_profile)[0]
+
+    def _passes_prefilter(self, job: Dict) -> bool:
+        title = (job.get('title') or '').lower()
+        if not title:
+            return False
+        if any(term in title for term in self.excluded_terms):
+            return False
+        if self.excluded_companies and normalize_company(job.get('company') or '') in self.excluded_companies:
+            return False
+        if self.min_salary:
+            salary = self.matcher._parse_salary(job.get('salary', ''))
+            if salary and salary < self.min_salary:
+                return False
+        if self.provinces:
+            location = job.get('location') or ''
+            if 'remote' not in location.lower():
+                province = job.get('province') or LOCATION_INDEX.province_for(location)
+                if province and province not in self.provinces:
+                    return False
+        return True
@@ -0,0 +1,287 @@
+import asyncio
+import hashlib
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, Dict, Iterable, List, Optional
+from sqlalchemy import and_, delete, exists, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from ...database.models import Job, JobSkill
+from ...database.session import Database, get_database
+from ...document_processing.skill_taxonomy import SkillExtractor, get_skill_extractor
+from ...location_za.location_index import LOCATION_INDEX
+from .job_dedup import JobDeduplicator, get_job_deduplicator
+from .job_index import JobTextIndex, get_job_text_index, job_key
+from .job_matcher import parse_salary_range
+
+# Fields whose change means the listing itself changed
+HASHED_FIELDS = ('title', 'company', 'location', 'salary', 'description')
+
+# Days of postings the text index keeps; user cycles only look this far back by default
+INDEX_RETENTION_DAYS = 30
+
+def _dialect_insert(session: AsyncSession):
+    """INSERT construct with ON CONFLICT support for the session's database"""
+    if session.bind.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    return dialect_insert(Job)
+
+def _posted_date(job: Dict) -> Optional[date]:
+    value = job.get('date_posted') or job.get('posted_date')
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+class JobStore:
+    """Persistent, indexed store of scraped jobs.
+
+    Scrape batches are bulk-upserted by the natural key (source, external_id).
+    Rows whose content hash is unchanged only get their last_seen_at bumped;
+    new and changed rows are written with one INSERT ... ON CONFLICT DO
+    UPDATE per chunk and have their job_skills rows rebuilt. New rows are
+    also appended to the TF-IDF job index that pre-filters user cycles.
+    User cycles read from here by province, skills and recency instead of
+    scraping per user.
+    """
+
+    def __init__(self, database: Optional[Database] = None,
+                 deduplicator: Optional[JobDeduplicator] = None,
+                 skill_extractor: Optional[SkillExtractor] = None,
+                 job_index: Optional[JobTextIndex] = None):
+        self.database = database or get_database()
+        self.deduplicator = deduplicator or get_job_deduplicator()
+        self.skill_extractor = skill_extractor or get_skill_extractor()
+        self.job_index = job_index if job_index is not None else get_job_text_index()
+
+    async def upsert_jobs(self, jobs: Iterable[Dict], chunk_size: int = 500) -> Dict[str, int]:
+        """Insert new jobs, update changed ones and touch unchanged ones; returns counts"""
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        chunk = []
+        for job in jobs:
+            chunk.append(job)
+            if len(chunk) >= chunk_size:
+                await self._upsert_chunk(chunk, counts)
+                chunk = []
+        if chunk:
+            await self._upsert_chunk(chunk, counts)
+        return counts
+
+    async def ingest(self, jobs: AsyncIterator[Dict], batch_size: int = 500) -> Dict[str, int]:
+        """Upsert a scrape stream in batches as it arrives"""
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        batch = []
+        async for job in jobs:
+            batch.append(job)
+            if len(batch) >= batch_size:
+                await self._upsert_chunk(batch, counts)
+                batch = []
+        if batch:
+            await self._upsert_chunk(batch, counts)
+        return counts
+
+    async def query_jobs(self, provinces: Optional[Iterable[str]] = None, skills: Optional[Iterable[str]] = None,
+                   since_days: int = 30, include_unknown_province: bool = True, limit: int = 500,
+                   after: Optional[tuple] = None, job_ids: Optional[Iterable[int]] = None,
+                   include_unskilled: bool = True) -> List[Dict]:
+        """Recent jobs, newest first, in the provinces given and mentioning any of the skills.
+
+        ``skills`` may be free-form names; they are mapped to canonical ids.
+        Jobs no skill could be extracted from (terse or non-English ads) are
+        kept unless ``include_unskilled`` is False; the scorer judges them.
+        ``after`` is the (posted_date, id) of the last row of a previous page.
+        ``job_ids`` restricts the result to those jobs (e.g. a text index pre-filter).
+        """
+        stmt = select(Job).where(Job.posted_date >= date.today() - timedelta(days=since_days))
+        if job_ids is not None:
+            stmt = stmt.where(Job.id.in_(list(job_ids)))
+
+        province_codes = list(provinces or [])
+        if province_codes:
+            condition = Job.province.in_(province_codes)
+            if include_unknown_province:
+                condition = or_(condition, Job.province.is_(None))
+            stmt = stmt.where(condition)
+
+        skill_ids = self.skill_extractor.canonicalize(skills or [])
+        if skill_ids:
+            condition = Job.id.in_(select(JobSkill.job_id).where(JobSkill.skill_id.in_(skill_ids)))
+            if include_unskilled:
+                condition = or_(condition, ~exists().where(JobSkill.job_id == Job.id))
+            stmt = stmt.where(condition)
+
+        if after:
+            after_date, after_id = after
+            stmt = stmt.where(or_(Job.posted_date < after_date, and_(Job.posted_date == after_date, Job.id < after_id)))
+
+        stmt = stmt.order_by(Job.posted_date.desc(), Job.id.desc()).limit(limit)
+        async with self.database.session() as session:
+            return [self._to_dict(job) for job in await session.scalars(stmt)]
+
+    async def stream_jobs(self, provinces: Optional[Iterable[str]] = None, skills: Optional[Iterable[str]] = None,
+                          since_days: int = 30, batch_size: int = 500,
+                          job_ids: Optional[Iterable[int]] = None) -> AsyncIterator[Dict]:
+        """query_jobs as an async stream, one keyset page at a time"""
+        provinces, skills = list(provinces or []), list(skills or [])
+        job_ids = list(job_ids) if job_ids is not None else None
+        after = None
+        while True:
+            page = await self.query_jobs(provinces, skills, since_days, True, batch_size, after, job_ids)
+            for job in page:
+                yield job
+            if len(page) < batch_size:
+                return
+            after = (date.fromisoformat(page[-1]['date_posted']), page[-1]['id'])
+
+    async def index_existing_jobs(self, since_days: int = 30, batch_size: int = 2000) -> int:
+        """Add recent jobs stored before the text index existed to it; returns the number added"""
+        added = 0
+        after = None
+        while True:
+            page = await self.query_jobs(since_days=since_days, limit=batch_size, after=after)
+            if page:
+                added += await asyncio.to_thread(self.job_index.add_jobs, page)
+            if len(page) < batch_size:
+                return added
+            after = (date.fromisoformat(page[-1]['date_posted']), page[-1]['id'])
+
+    async def prune_index(self, retention_days: int = INDEX_RETENTION_DAYS) -> int:
+        """Drop text index rows older than the retention window; returns the number dropped"""
+        since = date.today() - timedelta(days=retention_days)
+        return await asyncio.to_thread(self.job_index.prune, since)
+
+    async def query_new_jobs(self, since: datetime, limit: int = 5000) -> List[Dict]:
+        """Jobs first seen at or after ``since``, oldest first"""
+        stmt = select(Job).where(Job.first_seen_at >= since).order_by(Job.id).limit(limit)
+        async with self.database.session() as session:
+            return [self._to_dict(job) for job in await session.scalars(stmt)]
+
+    async def _upsert_chunk(self, jobs: List[Dict], counts: Dict[str, int]):
+        rows = {}
+        # _to_row resolves canonical ids against the dedup SQLite database; kept off the event loop
+        built = await asyncio.to_thread(lambda: [(self._to_row(job), job) for job in jobs])
+        for row, job in built:
+            if row['title']:
+                rows[(row['source'], row['external_id'])] = (row, job)
+        if not rows:
+            return
+
+        now = datetime.utcnow()
+        indexed = []
+        async with self.database.session() as session, session.begin():
+            existing = {
+                (source, external_id): (job_id, content_hash)
+                for job_id, source, external_id, content_hash in await session.execute(
+                    select(Job.id, Job.source, Job.external_id, Job.content_hash).where(
+                        Job.external_id.in_([key[1] for key in rows])
+                    )
+                )
+                if (source, external_id) in rows
+            }
+
+            unchanged_ids, changed = [], []
+            for key, (row, job) in rows.items():
+                current = existing.get(key)
+                if current and current[1] == row['content_hash']:
+                    unchanged_ids.append(current[0])
+                    continue
+                if row['posted_date'] is None and not current:
+                    row['posted_date'] = now.date()  # first seen is the best estimate we have
+                changed.append((row, job, current is not None))
+
+            if unchanged_ids:
+                await session.execute(update(Job).where(Job.id.in_(unchanged_ids)).values(last_seen_at=now))
+                counts['unchanged'] += len(unchanged_ids)
+            if not changed:
+                return
+
+            stmt = _dialect_insert(session)
+            updates = {
+                column: stmt.excluded[column]
+                for column in ('canonical_id', 'url', 'title', 'company', 'location', 'province',
+                               'salary_min', 'salary_max', 'description', 'content_hash', 'last_seen_at')
+            }
+            # Keep the stored date when a re-scrape no longer shows one
+            updates['posted_date'] = func.coalesce(stmt.excluded.posted_date, Job.posted_date)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Job.source, Job.external_id], set_=updates
+            ).returning(Job.id, Job.source, Job.external_id)
+
+            values = [{**row, 'first_seen_at': now, 'last_seen_at': now} for row, _, _ in changed]
+            ids = {(source, external_id): job_id for job_id, source, external_id in await session.execute(stmt, values)}
+
+            job_ids = list(ids.values())
+            await session.execute(delete(JobSkill).where(JobSkill.job_id.in_(job_ids)))
+            skill_rows = [
+                {'job_id': ids[(row['source'], row['external_id'])], 'skill_id': skill_id}
+                for row, job, _ in changed
+                for skill_id in set(self.skill_extractor.extract_ids(f"{row['title']} {row['description'] or ''}"))
+            ]
+            if skill_rows:
+                await session.execute(insert(JobSkill), skill_rows)
+
+            updated = sum(1 for _, _, was_present in changed if was_present)
+            counts['updated'] += updated
+            counts['inserted'] += len(changed) - updated
+            # Updated listings are re-indexed too; their new row supersedes the old one
+            indexed = [
+                {'id': ids[(row['source'], row['external_id'])],
+                 **{field: row[field] for field in ('source', 'url', 'title', 'company', 'location', 'description')},
+                 'posted_date': row['posted_date'].isoformat() if row['posted_date'] else None}
+                for row, _, _ in changed
+            ]
+
+        if indexed:
+            # Disk append under a file lock; kept off the event loop
+            await asyncio.to_thread(self.job_index.add_jobs, indexed, True)
+
+    def _to_row(self, job: Dict) -> Dict:
+        """Column values for a scraped job dict"""
+        salary_min, salary_max = parse_salary_range(job.get('salary', ''))
+        location = job.get('location') or ''
+        fingerprint = '|'.join(str(job.get(field) or '') for field in HASHED_FIELDS)
+        return {
+            'source': job.get('source') or 'unknown',
+            'external_id': str(job.get('external_id') or job_key(job))[:512],
+            'canonical_id': job.get('canonical_id') or self.deduplicator.resolve(job)[0],
+            'url': job.get('url') or job.get('job_url'),
+            'title': (job.get('title') or '').strip(),
+            'company': job.get('company'),
+            'location': location,
+            'province': job.get('province') or LOCATION_INDEX.province_for(location),
+            'posted_date': _posted_date(job),
+            'salary_min': salary_min or None,
+            'salary_max': salary_max or None,
+            'description': job.get('description'),
+            'content_hash': hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()
+        }
+
+    def _to_dict(self, job: Job) -> Dict:
+        """Job row in the dict shape the scrapers produce and JobMatcher scores"""
+        salary = (job.salary_min + (job.salary_max or job.salary_min)) / 2 if job.salary_min else ''
+        return {
+            'id': job.id,
+            'canonical_id': job.canonical_id,
+            'source': job.source,
+            'url': job.url,
+            'title': job.title,
+            'company': job.company or '',
+            'location': job.location or '',
+            'province': job.province or '',
+            'date_posted': job.posted_date.isoformat() if job.posted_date else '',
+            'salary': salary,
+            'salary_min': job.salary_min,
+            'salary_max': job.salary_max,
+            'description': job.description or ''
+        }
+
+_job_store = None
+
+def get_job_store() -> JobStore:
+    """Process-wide job store on the application database"""
+    global _job_store
+    if _job_store is None:
+        _job_store = JobStore()
+    return _job_store
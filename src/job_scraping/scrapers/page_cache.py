@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Scripts, styles and comments carry nonces/timestamps that change on every
+# request without changing the listings, so they are left out of the hash
+VOLATILE_MARKUP = re.compile(r'<script\b.*?</script>|<style\b.*?</style>|<!--.*?-->', re.S | re.I)
+
+def content_hash(html: str) -> str:
+    """Hash of the listing-relevant part of a page"""
+    stable = re.sub(r'\s+', ' ', VOLATILE_MARKUP.sub('', html))
+    return hashlib.sha256(stable.encode('utf-8')).hexdigest()
+
+class PageCache:
+    """On-disk validators and parse results for scraped listing pages.
+
+    For every URL it keeps the last ETag/Last-Modified, a hash of the page
+    content and the jobs parsed from it. PageFetcher sends conditional
+    requests from the validators and returns the stored jobs on a 304 or
+    when the downloaded body hashes the same, skipping the HTML parse.
+    Each row records the version of the parser that produced it; a row
+    written by another parser version is treated as a miss.
+    """
+
+    def __init__(self, db_path: str = "data/page_cache.db"):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS page_cache (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    content_hash TEXT NOT NULL,
+                    parsed TEXT NOT NULL,
+                    fetched_at TEXT NOT NULL,
+                    parser_version TEXT
+                )
+            """)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(page_cache)")}
+            if 'parser_version' not in columns:
+                self._conn.execute("ALTER TABLE page_cache ADD COLUMN parser_version TEXT")
+
+    def get(self, url: str, parser_version: Optional[str] = None) -> Optional[Dict]:
+        """Cached entry for a URL, or None when there is none or another parser version wrote it"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, content_hash, parsed, parser_version FROM page_cache WHERE url = ?",
+                (url,)
+            ).fetchone()
+        if row is None or row[4] != parser_version:
+            return None
+        return {
+            'etag': row[0],
+            'last_modified': row[1],
+            'content_hash': row[2],
+            'parsed': json.loads(row[3])
+        }
+
+    def conditional_headers(self, entry: Optional[Dict]) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for a cached entry"""
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def put(self, url: str, etag: Optional[str], last_modified: Optional[str], page_hash: str, parsed: List[Dict],
+            parser_version: Optional[str] = None):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO page_cache "
+                "(url, etag, last_modified, content_hash, parsed, fetched_at, parser_version) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, page_hash, json.dumps(parsed, default=str), datetime.utcnow().isoformat(),
+                 parser_version)
+            )
+
+    def touch(self, url: str, etag: Optional[str], last_modified: Optional[str]):
+        """Refresh validators and fetch time for an unchanged page"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE page_cache SET etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified), "
+                "fetched_at = ? WHERE url = ?",
+                (etag, last_modified, datetime.utcnow().isoformat(), url)
+            )
@@ -0,0 +1,173 @@
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+import aiohttp
+from ...http_client import get_http_registry
+from .driver_pool import BrowserPool, get_browser_pool
+from .page_cache import PageCache, content_hash
+from .scrape_scheduler import THROTTLE_STATUSES, ScrapeScheduler, get_scrape_scheduler
+
+# Markers of a client-side rendered shell that plain HTTP cannot scrape
+JS_SHELL_MARKERS = ('enable javascript', 'please turn on javascript', 'id="__next"></div>', 'id="root"></div>')
+
+class PageFetcher:
+    """HTTP-first page fetching with a pooled headless browser as fallback.
+
+    Every site starts on the fast path: a plain GET plus a substring check
+    for ``ready_marker`` (usually the job card class). If the marker is
+    missing or the page looks like a JavaScript shell, the site switches to
+    the browser path and stays there; every ``reprobe_every`` browser
+    fetches the HTTP path is tried again in case the site changed.
+
+    All requests go through the scrape scheduler's per-host rate limits;
+    429/503 responses are retried after the scheduler's backoff. With a
+    PageCache, fetch_parsed() sends conditional requests and skips parsing
+    pages whose content has not changed since the last run.
+    """
+
+    def __init__(self, browser_pool: Optional[BrowserPool] = None, reprobe_every: int = 50,
+                 timeout: float = 15, scheduler: Optional[ScrapeScheduler] = None, max_retries: int = 3,
+                 cache: Optional[PageCache] = None):
+        self.browser_pool = browser_pool
+        self.cache = cache
+        self.scheduler = scheduler or get_scrape_scheduler()
+        self.max_retries = max_retries
+        self.reprobe_every = reprobe_every
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.site_modes: Dict[str, str] = {}
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    async def fetch(self, url: str, ready_marker: Optional[str] = None,
+                    wait_for: Optional[Tuple[str, str]] = None,
+                    session: Optional[aiohttp.ClientSession] = None) -> str:
+        """Return the page HTML, rendering it in a browser only when the site needs it"""
+        status, html, headers = await self._fetch(url, ready_marker, wait_for, session)
+        return html
+
+    async def fetch_parsed(self, url: str, parser: Callable[[str], List[Dict]], ready_marker: Optional[str] = None,
+                           wait_for: Optional[Tuple[str, str]] = None,
+                           session: Optional[aiohttp.ClientSession] = None,
+                           parser_version: Optional[str] = None) -> List[Dict]:
+        """Fetch and parse a listing page, reusing the last parse when the page is unchanged.
+
+        ``parser_version`` identifies the parser (e.g. CompiledSite.version);
+        a parse stored by a different version is never reused.
+        """
+        if self.cache is None:
+            return parser(await self.fetch(url, ready_marker, wait_for, session))
+
+        site = self._site_stats(urlparse(url).netloc)
+        # SQLite reads and writes are kept off the event loop
+        entry = await asyncio.to_thread(self.cache.get, url, parser_version)
+        status, html, headers = await self._fetch(
+            url, ready_marker, wait_for, session, self.cache.conditional_headers(entry)
+        )
+
+        if status == 304 and entry:
+            site['not_modified'] += 1
+            return entry['parsed']
+
+        page_hash = content_hash(html)
+        if entry and entry['content_hash'] == page_hash:
+            site['unchanged'] += 1
+            await asyncio.to_thread(self.cache.touch, url, headers.get('ETag'), headers.get('Last-Modified'))
+            return entry['parsed']
+
+        parsed = parser(html)
+        site['parsed'] += 1
+        await asyncio.to_thread(
+            self.cache.put, url, headers.get('ETag'), headers.get('Last-Modified'), page_hash, parsed, parser_version
+        )
+        return parsed
+
+    async def _fetch(self, url: str, ready_marker: Optional[str], wait_for: Optional[Tuple[str, str]],
+                     session: Optional[aiohttp.ClientSession], extra_headers: Optional[Dict[str, str]] = None):
+        """Returns (status, html, response headers); browser fetches report status 200 and no headers"""
+        host = urlparse(url).netloc
+        site = self._site_stats(host)
+
+        if self.site_modes.get(host) != 'browser' or site['browser_since_probe'] >= self.reprobe_every:
+            site['browser_since_probe'] = 0
+            started = time.monotonic()
+            status, html, headers = await self._fetch_http(url, session, extra_headers)
+            if status == 304 or (status == 200 and self._is_usable(html, ready_marker)):
+                self.site_modes[host] = 'http'
+                site['http'] += 1
+                site['http_seconds'] += time.monotonic() - started
+                return status, html, headers
+            # Only a JS shell or a bot wall means the site needs a browser;
+            # transient errors fall back once without changing the site's mode
+            if status in (200, 403):
+                if self.site_modes.get(host) != 'browser':
+                    site['switched_to_browser'] += 1
+                self.site_modes[host] = 'browser'
+
+        started = time.monotonic()
+        pool = self.browser_pool or get_browser_pool()
+        async with self.scheduler.throttle(url), pool.session() as browser:
+            html = await browser.fetch(url, wait_for=wait_for)
+        site['browser'] += 1
+        site['browser_since_probe'] += 1
+        site['browser_seconds'] += time.monotonic() - started
+        return 200, html, {}
+
+    def report(self) -> Dict[str, Dict]:
+        """Per-site fast-path vs browser-path counts and average latency"""
+        report = {}
+        for host, site in self.stats.items():
+            report[host] = {
+                'mode': self.site_modes.get(host, 'http'),
+                'http_fetches': int(site['http']),
+                'browser_fetches': int(site['browser']),
+                'switched_to_browser': int(site['switched_to_browser']),
+                'not_modified': int(site['not_modified']),
+                'unchanged_hash': int(site['unchanged']),
+                'parsed': int(site['parsed']),
+                'avg_http_ms': round(1000 * site['http_seconds'] / site['http'], 1) if site['http'] else None,
+                'avg_browser_ms': round(1000 * site['browser_seconds'] / site['browser'], 1) if site['browser'] else None
+            }
+        return report
+
+    async def _fetch_http(self, url: str, session: Optional[aiohttp.ClientSession],
+                          extra_headers: Optional[Dict[str, str]] = None):
+        """Rate-limited plain GET; returns (status, body, headers) with status 0 on network errors"""
+        session = session or await get_http_registry().session('scrapers')
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self.scheduler.throttle(url):
+                    async with session.get(url, timeout=self.timeout, headers=extra_headers) as response:
+                        status, body, headers = response.status, await response.text(), response.headers
+                        self.scheduler.record(url, status, headers.get('Retry-After'))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"HTTP fetch failed for {url}: {e}")
+                return 0, '', {}
+            
+            if status not in THROTTLE_STATUSES:
+                break
+        return status, body, headers
+
+    def _is_usable(self, html: str, ready_marker: Optional[str]) -> bool:
+        """Cheap check that the static HTML already contains the content we parse"""
+        if ready_marker:
+            return ready_marker in html
+        html_lower = html[:20000].lower()
+        return not any(marker in html_lower for marker in JS_SHELL_MARKERS)
+
+    def _site_stats(self, host: str) -> Dict[str, float]:
+        if host not in self.stats:
+            self.stats[host] = {
+                'http': 0, 'browser': 0, 'switched_to_browser': 0, 'browser_since_probe': 0,
+                'not_modified': 0, 'unchanged': 0, 'parsed': 0,
+                'http_seconds': 0.0, 'browser_seconds': 0.0
+            }
+        return self.stats[host]
+
+_page_fetcher = None
+
+def get_page_fetcher() -> PageFetcher:
+    """Process-wide fetcher so per-site mode decisions are shared by all scrapers"""
+    global _page_fetcher
+    if _page_fetcher is None:
+        _page_fetcher = PageFetcher(cache=PageCache())
+    return _page_fetcher
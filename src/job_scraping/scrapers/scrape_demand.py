@@ -0,0 +1,121 @@
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+from sqlalchemy import select
+from ...database.models import ApplicationSettings, ScrapeRun, User, UserKeyword, UserLocation
+from ...database.session import Database, get_database
+from ...http_client import get_http_registry
+from .job_store import JobStore, get_job_store
+from .scrape_scheduler import get_scrape_scheduler
+from .site_specs import CompiledSite
+from .za_agencies import SouthAfricaJobScrapers
+
+# (source, keyword, location) - one scrape of one board for one search
+SearchKey = Tuple[str, str, str]
+
+class ScrapeDemandAggregator:
+    """Turns every active user's searches into one scrape per distinct search.
+
+    Keywords and locations of all active auto-apply users (stored
+    normalized in the user_keywords and user_locations tables) are expanded
+    over the ZA boards into (source, keyword, location) tuples. Each
+    distinct tuple is scraped at most once per ``freshness`` window and
+    ingested into the shared jobs table, which is what every interested
+    user's cycle reads from.
+    """
+
+    def __init__(self, database: Optional[Database] = None,
+                 scrapers: Optional[SouthAfricaJobScrapers] = None, job_store: Optional[JobStore] = None,
+                 freshness: timedelta = timedelta(hours=6)):
+        self.database = database or get_database()
+        self.scrapers = scrapers or SouthAfricaJobScrapers()
+        self.job_store = job_store or get_job_store()
+        self.freshness = freshness
+        self.last_report: Dict = {}
+
+    async def collect_demand(self) -> Dict[SearchKey, Set[int]]:
+        """Distinct (source, keyword, location) tuples and the ids of the users who want each"""
+        stmt = (
+            select(UserKeyword.user_id, UserKeyword.keyword, UserLocation.location)
+            .join(UserLocation, UserLocation.user_id == UserKeyword.user_id)
+            .join(ApplicationSettings, ApplicationSettings.user_id == UserKeyword.user_id)
+            .join(User, User.id == UserKeyword.user_id)
+            .where(User.is_active.is_(True), ApplicationSettings.auto_apply.is_(True), UserLocation.location != '')
+        )
+        demand: Dict[SearchKey, Set[int]] = {}
+        async with self.database.session() as session:
+            for user_id, keyword, place in await session.execute(stmt):
+                for site in self.scrapers.agencies:
+                    demand.setdefault((site.name, keyword, place), set()).add(user_id)
+        return demand
+
+    async def run(self) -> Dict:
+        """Scrape every stale demanded search once, ingest the jobs and return the dedup report"""
+        demand = await self.collect_demand()
+        fresh = await self._fresh_searches(list(demand))
+        stale = [key for key in demand if key not in fresh]
+
+        sites = {site.name: site for site in self.scrapers.agencies}
+        jobs_found: Dict[SearchKey, int] = {}
+        session = await get_http_registry().session('scrapers')
+        streams = [
+            lambda key=key: self._counted(key, sites[key[0]], session, jobs_found)
+            for key in stale if key[0] in sites
+        ]
+        ingested = await self.job_store.ingest(get_scrape_scheduler().stream(streams))
+        await self._record_runs(jobs_found)
+
+        requested = sum(len(users) for users in demand.values())
+        self.last_report = {
+            'users': len(set().union(*demand.values())) if demand else 0,
+            'requested_searches': requested,
+            'distinct_searches': len(demand),
+            'fresh_skipped': len(fresh),
+            'scraped': len(jobs_found),
+            'failed': len(streams) - len(jobs_found),
+            'dedup_ratio': round(requested / len(demand), 2) if demand else 0.0,
+            'scrape_calls_saved': requested - len(streams),
+            'jobs': ingested
+        }
+        return self.last_report
+
+    async def _counted(self, key: SearchKey, site: CompiledSite, session,
+                       jobs_found: Dict[SearchKey, int]) -> AsyncIterator[Dict]:
+        """Yield a search's jobs; the search is recorded as scraped only if it finished without error"""
+        count = 0
+        async for job in self.scrapers.iter_agency(session, site, key[1], key[2], raise_errors=True):
+            count += 1
+            yield job
+        jobs_found[key] = count
+
+    async def _fresh_searches(self, keys: List[SearchKey]) -> Set[SearchKey]:
+        """Searches scraped within the freshness window"""
+        if not keys:
+            return set()
+        cutoff = datetime.utcnow() - self.freshness
+        stmt = select(ScrapeRun.source, ScrapeRun.keyword, ScrapeRun.location).where(
+            ScrapeRun.last_scraped_at >= cutoff,
+            ScrapeRun.source.in_({key[0] for key in keys})
+        )
+        wanted = set(keys)
+        async with self.database.session() as session:
+            return {tuple(row) for row in await session.execute(stmt) if tuple(row) in wanted}
+
+    async def _record_runs(self, jobs_found: Dict[SearchKey, int]):
+        if not jobs_found:
+            return
+        now = datetime.utcnow()
+        async with self.database.session() as session, session.begin():
+            existing = {
+                (run.source, run.keyword, run.location): run
+                for run in await session.scalars(
+                    select(ScrapeRun).where(ScrapeRun.source.in_({key[0] for key in jobs_found}))
+                )
+            }
+            for key, count in jobs_found.items():
+                run = existing.get(key)
+                if run is None:
+                    session.add(ScrapeRun(source=key[0], keyword=key[1], location=key[2],
+                                          last_scraped_at=now, jobs_found=count))
+                else:
+                    run.last_scraped_at = now
+                    run.jobs_found = count
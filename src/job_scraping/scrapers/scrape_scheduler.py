@@ -0,0 +1,204 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+# Responses that mean "slow down" rather than "this page is broken"
+THROTTLE_STATUSES = (429, 503)
+
+class HostBucket:
+    """Token bucket for one host with additive-increase / multiplicative-decrease rate control"""
+
+    def __init__(self, rate: float, burst: float, min_rate: float, max_rate: float):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.consecutive_throttles = 0
+        self.stats = {'requests': 0, 'throttled': 0, 'waited_seconds': 0.0}
+
+    async def acquire(self):
+        started = time.monotonic()
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if now < self.blocked_until:
+                wait = self.blocked_until - now
+            elif self.tokens >= 1:
+                self.tokens -= 1
+                self.stats['requests'] += 1
+                self.stats['waited_seconds'] += now - started
+                return
+            else:
+                wait = (1 - self.tokens) / self.rate
+            await asyncio.sleep(wait)
+
+    def on_success(self, step: float):
+        self.consecutive_throttles = 0
+        self.rate = min(self.max_rate, self.rate + step)
+
+    def on_throttled(self, retry_after: Optional[float], base_backoff: float, max_backoff: float):
+        self.stats['throttled'] += 1
+        self.consecutive_throttles += 1
+        self.rate = max(self.min_rate, self.rate / 2)
+        backoff = retry_after if retry_after is not None else base_backoff * 2 ** (self.consecutive_throttles - 1)
+        self.blocked_until = max(self.blocked_until, time.monotonic() + min(backoff, max_backoff))
+        self.tokens = 0
+
+class ScrapeScheduler:
+    """Global concurrency limit plus per-host token buckets for all scraper traffic.
+
+    ``throttle(url)`` gates a single request: it takes a global slot and a
+    token from the host's bucket. ``record(url, status)`` feeds the response
+    back: successes slowly raise the host's rate towards ``max_rate``, while
+    429/503 halve it and pause the host (honouring Retry-After). ``run_all``
+    replaces ad-hoc ``asyncio.gather`` fan-outs with a bounded worker pool,
+    and ``stream`` does the same for async iterators of results.
+    """
+
+    def __init__(self, max_concurrency: int = 20, default_rate: float = 1.0, burst: float = 2,
+                 min_rate: float = 0.1, max_rate: float = 5.0, increase_step: float = 0.05,
+                 base_backoff: float = 5.0, max_backoff: float = 300.0,
+                 host_rates: Optional[Dict[str, float]] = None):
+        self.max_concurrency = max_concurrency
+        self.default_rate = default_rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase_step = increase_step
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.host_rates = host_rates or {}
+        self.buckets: Dict[str, HostBucket] = {}
+        self._semaphore = None
+        self._loop = None
+
+    @asynccontextmanager
+    async def throttle(self, url: str):
+        """Wait for a global slot and a host token before issuing a request"""
+        # Host token first so a paused host never sits on a global slot
+        await self._bucket(url).acquire()
+        async with self._global_semaphore():
+            yield
+
+    def record(self, url: str, status: int, retry_after: Optional[str] = None):
+        """Adapt the host's rate to the response status"""
+        bucket = self._bucket(url)
+        if status in THROTTLE_STATUSES:
+            bucket.on_throttled(self._parse_retry_after(retry_after), self.base_backoff, self.max_backoff)
+        elif 200 <= status < 400:
+            bucket.on_success(self.increase_step)
+
+    async def run_all(self, task_factories: Iterable[Callable[[], Awaitable[Any]]],
+                      concurrency: Optional[int] = None) -> List[Any]:
+        """Run tasks with bounded concurrency; results (or exceptions) are returned in input order.
+
+        Coroutines are only created when a worker is free, so a large
+        agencies x keywords x locations product never exists in memory at once.
+        """
+        factories = list(task_factories)
+        results: List[Any] = [None] * len(factories)
+        next_index = iter(range(len(factories)))
+
+        async def worker():
+            for i in next_index:
+                try:
+                    results[i] = await factories[i]()
+                except Exception as e:
+                    results[i] = e
+
+        workers = min(concurrency or self.max_concurrency * 2, len(factories))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        return results
+
+    async def stream(self, iterator_factories: Iterable[Callable[[], AsyncIterator[Any]]],
+                     concurrency: Optional[int] = None, buffer: int = 100) -> AsyncIterator[Any]:
+        """Streaming counterpart of run_all: yield items from many async iterators as they arrive.
+
+        At most ``concurrency`` iterators run at once and at most ``buffer``
+        items wait for the consumer, so a slow consumer pauses the scrapers
+        instead of letting results pile up. A failing iterator is reported
+        and skipped; closing the stream early cancels the workers.
+        """
+        factories = list(iterator_factories)
+        if not factories:
+            return
+        queue: asyncio.Queue = asyncio.Queue(maxsize=buffer)
+        next_index = iter(range(len(factories)))
+        done = object()
+
+        async def worker():
+            for i in next_index:
+                try:
+                    async for item in factories[i]():
+                        await queue.put(item)
+                except Exception as e:
+                    print(f"Scrape stream {i} failed: {e}")
+            await queue.put(done)
+
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(concurrency or self.max_concurrency * 2, len(factories)))
+        ]
+        try:
+            remaining = len(workers)
+            while remaining:
+                item = await queue.get()
+                if item is done:
+                    remaining -= 1
+                else:
+                    yield item
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    def report(self) -> Dict[str, Dict]:
+        """Current rate and counters per host"""
+        return {
+            host: {
+                'rate_per_second': round(bucket.rate, 3),
+                'requests': bucket.stats['requests'],
+                'throttled': bucket.stats['throttled'],
+                'avg_wait_ms': round(1000 * bucket.stats['waited_seconds'] / bucket.stats['requests'], 1)
+                if bucket.stats['requests'] else None,
+                'paused_for_seconds': round(max(0.0, bucket.blocked_until - time.monotonic()), 1)
+            }
+            for host, bucket in self.buckets.items()
+        }
+
+    def _bucket(self, url: str) -> HostBucket:
+        host = urlparse(url).netloc or url
+        if host not in self.buckets:
+            rate = self.host_rates.get(host, self.default_rate)
+            self.buckets[host] = HostBucket(rate, self.burst, self.min_rate, max(rate, self.max_rate))
+        return self.buckets[host]
+
+    def _global_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    def _parse_retry_after(self, retry_after: Optional[str]) -> Optional[float]:
+        if not retry_after:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            return None  # HTTP-date form; fall back to exponential backoff
+
+_scrape_scheduler = None
+
+def get_scrape_scheduler() -> ScrapeScheduler:
+    """Process-wide scheduler so every scraper shares the same host budgets"""
+    global _scrape_scheduler
+    if _scrape_scheduler is None:
+        _scrape_scheduler = ScrapeScheduler()
+    return _scrape_scheduler
@@ -0,0 +1,200 @@
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import and_, delete, insert, or_, select
+from ...database.models import ApplicationSettings, User, UserCompanyPreference, UserKeyword, UserLocation
+from ...database.session import Database, get_database
+from ...location_za.location_index import LOCATION_INDEX, normalize_location
+from .job_dedup import normalize_company
+
+# Settings stored in typed columns and user_* tables rather than the preferences JSON
+NORMALIZED_FIELDS = ('keywords', 'locations', 'min_salary', 'max_salary',
+                     'target_companies', 'excluded_companies', 'auto_apply')
+
+def normalize_keyword(keyword: str) -> str:
+    return re.sub(r'\s+', ' ', (keyword or '').lower()).strip()
+
+def _salary(value) -> Optional[float]:
+    try:
+        return float(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+def settings_rows(user_id: int, settings: Dict) -> Tuple[Dict, List[Dict], List[Dict], List[Dict]]:
+    """Split a flat settings dict into the application_settings row and its location, keyword and company rows"""
+    settings = settings or {}
+    row = {
+        'user_id': user_id,
+        'preferences': {key: value for key, value in settings.items() if key not in NORMALIZED_FIELDS},
+        'salary_min': _salary(settings.get('min_salary')),
+        'salary_max': _salary(settings.get('max_salary')),
+        'auto_apply': settings.get('auto_apply', True)
+    }
+
+    # Canonical place names, so 'joburg', 'Johannesburg ' and 'JHB' share one row and one scrape
+    locations = {}
+    for location in settings.get('locations') or []:
+        match = LOCATION_INDEX.resolve(location or '')
+        province, name = (match.province_code, match.name) if match else (None, normalize_location(location or ''))
+        if name:
+            locations[(province, name)] = {'user_id': user_id, 'province': province, 'location': name}
+    if not locations:
+        locations[(None, '')] = {'user_id': user_id, 'province': None, 'location': ''}  # anywhere
+
+    keywords = {normalize_keyword(keyword) for keyword in settings.get('keywords') or []}
+    keywords.discard('')
+
+    companies = {}
+    for kind in ('target', 'excluded'):
+        for company in settings.get(f'{kind}_companies') or []:
+            key = normalize_company(company or '')
+            if key:
+                companies[(kind, key)] = {'user_id': user_id, 'kind': kind, 'company_key': key, 'company': company}
+
+    return (row, list(locations.values()),
+            [{'user_id': user_id, 'keyword': keyword} for keyword in sorted(keywords)],
+            list(companies.values()))
+
+class SearchSettingsStore:
+    """Users' search settings in typed, indexed tables.
+
+    ``save`` spreads the flat settings dict used by the API and the
+    automation cycle (keywords, locations, min/max salary, target and
+    excluded companies, plus free-form options) over application_settings
+    and the user_* tables; ``load`` puts it back together.
+    ``candidates_for_jobs`` finds the users a new job batch is relevant to
+    with a single indexed query.
+    """
+
+    def __init__(self, database: Optional[Database] = None):
+        self.database = database or get_database()
+
+    async def save(self, user_id: int, settings: Dict):
+        row, locations, keywords, companies = settings_rows(user_id, settings)
+        async with self.database.session() as session, session.begin():
+            existing = await session.scalar(select(ApplicationSettings).where(ApplicationSettings.user_id == user_id))
+            if existing is None:
+                session.add(ApplicationSettings(**row))
+            else:
+                for column, value in row.items():
+                    setattr(existing, column, value)
+            for model, rows in ((UserLocation, locations), (UserKeyword, keywords), (UserCompanyPreference, companies)):
+                await session.execute(delete(model).where(model.user_id == user_id))
+                if rows:
+                    await session.execute(insert(model), rows)
+
+    async def resolve_locations(self) -> int:
+        """Resolve stored places that have no province (e.g. migrated ones) against the gazetteer; returns the count"""
+        resolved = 0
+        async with self.database.session() as session, session.begin():
+            unresolved = list(await session.scalars(
+                select(UserLocation).where(UserLocation.province.is_(None), UserLocation.location != '')
+            ))
+            for location in unresolved:
+                match = LOCATION_INDEX.resolve(location.location)
+                if match is None:
+                    continue
+                duplicate = await session.scalar(select(UserLocation.id).where(
+                    UserLocation.user_id == location.user_id, UserLocation.province == match.province_code,
+                    UserLocation.location == match.name
+                ))
+                if duplicate is None:
+                    location.province, location.location = match.province_code, match.name
+                else:
+                    await session.delete(location)
+                await session.flush()
+                resolved += 1
+        return resolved
+
+    async def load(self, user_id: int) -> Optional[Dict]:
+        """The flat settings dict for a user, or None if they have none"""
+        async with self.database.session() as session:
+            row = await session.scalar(select(ApplicationSettings).where(ApplicationSettings.user_id == user_id))
+            if row is None:
+                return None
+            locations = await session.scalars(select(UserLocation.location).where(UserLocation.user_id == user_id))
+            keywords = await session.scalars(select(UserKeyword.keyword).where(UserKeyword.user_id == user_id))
+            companies = await session.execute(
+                select(UserCompanyPreference.kind, UserCompanyPreference.company)
+                .where(UserCompanyPreference.user_id == user_id)
+            )
+            settings = {
+                **(row.preferences or {}),
+                'keywords': list(keywords),
+                'locations': [location for location in locations if location],
+                'target_companies': [],
+                'excluded_companies': [],
+                'auto_apply': row.auto_apply
+            }
+            for kind, company in companies:
+                settings[f'{kind}_companies'].append(company)
+        if row.salary_min is not None:
+            settings['min_salary'] = row.salary_min
+        if row.salary_max is not None:
+            settings['max_salary'] = row.salary_max
+        return settings
+
+    async def candidates_for_jobs(self, jobs: Iterable[Dict]) -> Dict[int, List[Dict]]:
+        """Active auto-apply users and the jobs of the batch each of them could want.
+
+        A user is a candidate for a job in one of their provinces (or anywhere,
+        if their locations are unknown) whose salary is not below their minimum
+        and whose company they have not excluded. Jobs without a province are
+        left to the users' own cycles.
+        """
+        batch = []
+        for job in jobs:
+            if job.get('province'):
+                salary = job.get('salary_max') or job.get('salary_min')
+                batch.append((job, normalize_company(job.get('company') or ''), salary))
+        if not batch:
+            return {}
+
+        stmt = (
+            select(ApplicationSettings.user_id, ApplicationSettings.salary_min,
+                   UserLocation.province, UserCompanyPreference.company_key)
+            .join(User, User.id == ApplicationSettings.user_id)
+            .join(UserLocation, UserLocation.user_id == ApplicationSettings.user_id)
+            .outerjoin(UserCompanyPreference, and_(
+                UserCompanyPreference.user_id == ApplicationSettings.user_id,
+                UserCompanyPreference.kind == 'excluded',
+                UserCompanyPreference.company_key.in_({key for _, key, _ in batch if key} or {''})
+            ))
+            .where(
+                User.is_active.is_(True),
+                ApplicationSettings.auto_apply.is_(True),
+                or_(UserLocation.province.in_({job['province'] for job, _, _ in batch}),
+                    UserLocation.province.is_(None))
+            )
+        )
+        if all(salary for _, _, salary in batch):
+            top_salary = max(salary for _, _, salary in batch)
+            stmt = stmt.where(or_(ApplicationSettings.salary_min.is_(None), ApplicationSettings.salary_min <= top_salary))
+
+        users: Dict[int, Dict] = {}
+        async with self.database.session() as session:
+            for user_id, salary_min, province, excluded in await session.execute(stmt):
+                user = users.setdefault(user_id, {'salary_min': salary_min, 'provinces': set(), 'excluded': set()})
+                user['provinces'].add(province)
+                if excluded:
+                    user['excluded'].add(excluded)
+
+        candidates = {}
+        for user_id, user in users.items():
+            wanted = [
+                job for job, company_key, salary in batch
+                if (None in user['provinces'] or job['province'] in user['provinces'])
+                and company_key not in user['excluded']
+                and not (salary and user['salary_min'] and salary < user['salary_min'])
+            ]
+            if wanted:
+                candidates[user_id] = wanted
+        return candidates
+
+_search_settings_store = None
+
+def get_search_settings_store() -> SearchSettingsStore:
+    """Process-wide search settings store on the application database"""
+    global _search_settings_store
+    if _search_settings_store is None:
+        _search_settings_store = SearchSettingsStore()
+    return _search_settings_store
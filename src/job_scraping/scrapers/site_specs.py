@@ -0,0 +1,262 @@
+import hashlib
+import json
+import re
+from datetime import date, timedelta
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote_plus, urljoin, urlparse
+from selenium.webdriver.common.by import By
+from ...location_za.location_index import LOCATION_INDEX
+from .card_parser import PARSER_VERSION, CardParser
+
+# Declarative description of every job board we scrape. Adding a board means
+# adding an entry here: the URL template takes {keyword} and {location},
+# "pagination" names the page parameter, "card" is the (tag, class) of one
+# listing, "fields" are CSS selectors (or (selector, attribute) pairs) inside
+# a card and "normalize" maps a field to one of NORMALIZERS. "defaults" fill
+# fields the card does not show, formatted with the search terms.
+SITE_SPECS: Dict[str, Dict] = {
+    "CareerJunction": {
+        "country": "ZA",
+        "url": "https://www.careerjunction.co.za/jobs?q={keyword}&l={location}",
+        "pagination": {"param": "page", "start": 1, "step": 1, "max_pages": 3},
+        "card": ("div", "job-item"),  # Update with actual class
+        "fields": {
+            "title": ".job-title",
+            "company": ".company-name",
+            "salary": ".salary",
+            "date_posted": ".date-posted",
+            "description": ".job-description",
+            "url": ("a[href]", "href")
+        },
+        "required": ["title"],
+        "normalize": {"url": "absolute_url", "salary": "salary", "date_posted": "posted_date"},
+        "defaults": {"location": "{location}"}
+    },
+    "PNet": {
+        "country": "ZA",
+        "url": "https://www.pnet.co.za/jobs?q={keyword}&l={location}",
+        "pagination": {"param": "page", "start": 1, "step": 1, "max_pages": 3},
+        "card": ("article", "job-element"),  # Update with actual class
+        "fields": {
+            "title": ".job-element__url-title-text",
+            "company": ".job-element__body__company",
+            "location": ".job-element__body__location",
+            "salary": ".job-element__body__salary",
+            "date_posted": ".job-element__date",
+            "description": ".job-element__body__snippet",
+            "url": ("a.job-element__url[href]", "href")
+        },
+        "required": ["title", "url"],
+        "normalize": {"url": "absolute_url", "salary": "salary", "date_posted": "posted_date"},
+        "defaults": {"location": "{location}"}
+    },
+    "IndeedZA": {
+        "country": "ZA",
+        "url": "https://za.indeed.com/jobs?q={keyword}&l={location}",
+        "pagination": {"param": "start", "start": 0, "step": 10, "max_pages": 3},
+        "card": ("div", "job_seen_beacon"),
+        "fields": {
+            "title": "h2.jobTitle",
+            "company": "span.companyName",
+            "location": "div.companyLocation",
+            "salary": ".salary-snippet-container, .estimated-salary",
+            "date_posted": "span.date",
+            "description": ".job-snippet",
+            "url": ("h2.jobTitle a[href]", "href")
+        },
+        "required": ["title", "company"],
+        "normalize": {"url": "absolute_url", "salary": "salary", "date_posted": "posted_date"},
+        "defaults": {"location": "{location}"}
+    },
+    "CareerBox": {
+        "country": "ZA",
+        "url": "https://www.careerbox.co.za/jobs?q={keyword}&l={location}",
+        "pagination": {"param": "page", "start": 1, "step": 1, "max_pages": 3},
+        "card": ("div", "job-listing"),  # Update with actual class
+        "fields": {
+            "title": ".job-listing-title",
+            "company": ".job-listing-company",
+            "location": ".job-listing-location",
+            "date_posted": ".job-listing-date",
+            "url": ("a[href]", "href")
+        },
+        "required": ["title"],
+        "normalize": {"url": "absolute_url", "date_posted": "posted_date"},
+        "defaults": {"location": "{location}"}
+    },
+    "JobMail": {
+        "country": "ZA",
+        "url": "https://www.jobmail.co.za/jobs?q={keyword}&l={location}",
+        "pagination": {"param": "page", "start": 1, "step": 1, "max_pages": 3},
+        "card": ("div", "job-result"),  # Update with actual class
+        "fields": {
+            "title": ".job-result-title",
+            "company": ".job-result-company",
+            "location": ".job-result-location",
+            "salary": ".job-result-salary",
+            "date_posted": ".job-result-date",
+            "description": ".job-result-description",
+            "url": ("a.job-result-title[href]", "href")
+        },
+        "required": ["title"],
+        "normalize": {"url": "absolute_url", "salary": "salary", "date_posted": "posted_date"},
+        "defaults": {"location": "{location}"}
+    },
+    "Jobs4All": {
+        "country": "ZA",
+        "url": "https://www.jobs4all.co.za/jobs?q={keyword}&l={location}",
+        "pagination": {"param": "page", "start": 1, "step": 1, "max_pages": 3},
+        "card": ("li", "job-listing"),  # Update with actual class
+        "fields": {
+            "title": ".position",
+            "company": ".company",
+            "location": ".location",
+            "date_posted": ".date",
+            "url": ("a[href]", "href")
+        },
+        "required": ["title"],
+        "normalize": {"url": "absolute_url", "date_posted": "posted_date"},
+        "defaults": {"location": "{location}"}
+    },
+    "Indeed": {
+        "country": "US",
+        "url": "https://www.indeed.com/jobs?q={keyword}&l={location}",
+        "pagination": {"param": "start", "start": 0, "step": 10, "max_pages": 5},
+        "card": ("div", "job_seen_beacon"),
+        "fields": {
+            "title": "h2.jobTitle",
+            "company": "span.companyName",
+            "location": "div.companyLocation",
+            "salary": ".salary-snippet-container, .estimated-salary",
+            "posted_date": "span.date",
+            "job_url": ("h2.jobTitle a[href]", "href")
+        },
+        "required": ["title", "company", "location"],
+        "normalize": {"job_url": "absolute_url", "salary": "salary"},
+        "source": "indeed"
+    }
+}
+
+def _absolute_url(value: str, base_url: str) -> str:
+    return urljoin(base_url, value) if value else ''
+
+def _salary(value: str, base_url: str) -> str:
+    return ' '.join(value.replace('\xa0', ' ').split())
+
+def _posted_date(value: str, base_url: str) -> str:
+    """'Just posted' / '3 days ago' / '30+ days ago' -> ISO date; anything else is kept as is"""
+    text = value.lower()
+    if not text:
+        return ''
+    if 'today' in text or 'just' in text or 'hour' in text:
+        return date.today().isoformat()
+    if 'yesterday' in text:
+        return (date.today() - timedelta(days=1)).isoformat()
+    match = re.search(r'(\d+)\+?\s*(day|week|month)', text)
+    if not match:
+        return value
+    days = int(match.group(1)) * {'day': 1, 'week': 7, 'month': 30}[match.group(2)]
+    return (date.today() - timedelta(days=days)).isoformat()
+
+# Field normalizers available to specs; each takes (value, base_url)
+NORMALIZERS: Dict[str, Callable[[str, str], str]] = {
+    'absolute_url': _absolute_url,
+    'salary': _salary,
+    'posted_date': _posted_date
+}
+
+class CompiledSite:
+    """A site spec compiled into a card parser and a flat list of field normalizers"""
+
+    def __init__(self, name: str, spec: Dict):
+        self.name = name
+        self.country = spec.get('country', 'ZA')
+        self.url_template = spec['url']
+        self.pagination = {'param': 'page', 'start': 1, 'step': 1, 'max_pages': 1, **spec.get('pagination', {})}
+        self.source = spec.get('source', name)
+        self.defaults = spec.get('defaults', {})
+        # Identifies parses made from this exact spec; cached pages from another spec are re-parsed
+        self.version = hashlib.sha256(
+            json.dumps({'parser': PARSER_VERSION, 'spec': spec}, sort_keys=True, default=str).encode('utf-8')
+        ).hexdigest()[:16]
+
+        card_tag, card_class = spec['card']
+        self.ready_marker = spec.get('ready_marker', card_class)
+        self.wait_for: Tuple[str, str] = (By.CLASS_NAME, card_class)
+        self.cards = CardParser(card_tag, card_class, spec['fields'], required=spec.get('required'))
+
+        parsed_url = urlparse(self.url_template)
+        base_url = f"{parsed_url.scheme}://{parsed_url.netloc}/"
+        unknown = set(spec.get('normalize', {}).values()) - set(NORMALIZERS)
+        if unknown:
+            raise ValueError(f"{name}: unknown normalizers {sorted(unknown)}")
+        self.normalizers = [
+            (field, partial(NORMALIZERS[normalizer], base_url=base_url))
+            for field, normalizer in spec.get('normalize', {}).items()
+        ]
+
+    def page_urls(self, keyword: str, location: str, max_pages: Optional[int] = None) -> List[str]:
+        """Search URL for each results page"""
+        url = self.url_template.format(keyword=quote_plus(keyword), location=quote_plus(location))
+        separator = '&' if '?' in url else '?'
+        pagination = self.pagination
+        return [
+            f"{url}{separator}{pagination['param']}={pagination['start'] + page * pagination['step']}"
+            for page in range(max_pages or pagination['max_pages'])
+        ]
+
+    def extract(self, html: str, keyword: str = '', location: str = '') -> List[Dict]:
+        """Parse one results page into normalized job dicts"""
+        # Everything that depends only on the search is resolved once per page
+        constants = {'source': self.source}
+        if self.country == 'ZA':
+            constants['province'] = (LOCATION_INDEX.province_for(location) or '') if location else ''
+        defaults = {field: value.format(keyword=keyword, location=location) for field, value in self.defaults.items()}
+
+        jobs = []
+        for card in self.cards.parse(html):
+            for field, normalize in self.normalizers:
+                card[field] = normalize(card.get(field, ''))
+            for field, value in defaults.items():
+                if not card.get(field):
+                    card[field] = value
+            card.update(constants)
+            jobs.append(card)
+        return jobs
+
+class SiteRegistry:
+    """Compiled site specs, built once per process and looked up by name"""
+
+    def __init__(self, specs: Optional[Dict[str, Dict]] = None):
+        self.specs = dict(SITE_SPECS if specs is None else specs)
+        self._compiled: Dict[str, CompiledSite] = {}
+
+    def register(self, name: str, spec: Dict) -> CompiledSite:
+        """Add or replace a site spec at runtime"""
+        self.specs[name] = spec
+        self._compiled.pop(name, None)
+        return self.get(name)
+
+    def get(self, name: str) -> CompiledSite:
+        site = self._compiled.get(name)
+        if site is None:
+            site = CompiledSite(name, self.specs[name])
+            self._compiled[name] = site
+        return site
+
+    def sites(self, country: Optional[str] = None) -> List[CompiledSite]:
+        """Compiled sites, optionally limited to one country"""
+        return [
+            self.get(name) for name, spec in self.specs.items()
+            if country is None or spec.get('country', 'ZA') == country
+        ]
+
+_site_registry = None
+
+def get_site_registry() -> SiteRegistry:
+    """Process-wide registry so each spec is compiled only once"""
+    global _site_registry
+    if _site_registry is None:
+        _site_registry = SiteRegistry()
+    return _site_registry
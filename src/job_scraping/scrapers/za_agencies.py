@@ -1,108 +1,80 @@
 import asyncio
 import aiohttp
-from bs4 import BeautifulSoup
-from typing import List, Dict
-import re
+from typing import AsyncIterator, List, Dict, Optional
+from .page_fetcher import PageFetcher, get_page_fetcher
+from .scrape_scheduler import get_scrape_scheduler
+from .site_specs import CompiledSite, get_site_registry
+from .job_dedup import JobDeduplicator, get_job_deduplicator
+from ...http_client import get_http_registry
 
 class SouthAfricaJobScrapers:
-    def __init__(self):
-        self.agencies = [
-            {
-                "name": "CareerJunction",
-                "url": "https://www.careerjunction.co.za/jobs",
-                "parser": self.parse_careerjunction
-            },
-            {
-                "name": "PNet",
-                "url": "https://www.pnet.co.za/jobs",
-                "parser": self.parse_pnet
-            },
-            {
-                "name": "IndeedZA",
-                "url": "https://www.indeed.co.za/jobs",
-                "parser": self.parse_indeed_za
-            },
-            {
-                "name": "CareerBox",
-                "url": "https://www.careerbox.co.za/jobs",
-                "parser": self.parse_careerbox
-            },
-            {
-                "name": "JobMail",
-                "url": "https://www.jobmail.co.za/jobs",
-                "parser": self.parse_jobmail
-            },
-            {
-                "name": "Jobs4All",
-                "url": "https://www.jobs4all.co.za/jobs",
-                "parser": self.parse_jobs4all
-            }
-        ]
+    def __init__(self, fetcher: PageFetcher = None, max_pages: Optional[int] = None,
+                 deduplicator: Optional[JobDeduplicator] = None):
+        self.fetcher = fetcher or get_page_fetcher()
+        self.deduplicator = deduplicator or get_job_deduplicator()
+        self.max_pages = max_pages
+        # Boards are declared in site_specs.SITE_SPECS and compiled once per process
+        self.agencies: List[CompiledSite] = get_site_registry().sites(country='ZA')
     
     async def scrape_all_agencies(self, keywords: List[str], locations: List[str]) -> List[Dict]:
         """Scrape jobs from all South African agencies"""
         all_jobs = []
         
-        async with aiohttp.ClientSession() as session:
-            tasks = []
-            for agency in self.agencies:
-                for keyword in keywords:
-                    for location in locations:
-                        task = self.scrape_agency(session, agency, keyword, location)
-                        tasks.append(task)
-            
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            for result in results:
-                if isinstance(result, list):
-                    all_jobs.extend(result)
+        # Shared keep-alive pool owned by the app/worker, not closed per call
+        session = await get_http_registry().session('scrapers')
+        tasks = []
+        for agency in self.agencies:
+            for keyword in keywords:
+                for location in locations:
+                    tasks.append(lambda a=agency, k=keyword, l=location: self.scrape_agency(session, a, k, l))
         
-        return all_jobs
-    
-    async def scrape_agency(self, session, agency: Dict, keyword: str, location: str) -> List[Dict]:
-        """Scrape individual agency"""
-        try:
-            url = f"{agency['url']}?q={keyword}&l={location}"
-            async with session.get(url) as response:
-                content = await response.text()
-                soup = BeautifulSoup(content, 'html.parser')
-                return agency['parser'](soup, keyword, location)
-        except Exception as e:
-            print(f"Error scraping {agency['name']}: {e}")
-            return []
-    
-    def parse_careerjunction(self, soup: BeautifulSoup, keyword: str, location: str) -> List[Dict]:
-        """Parse CareerJunction job listings"""
-        jobs = []
-        job_cards = soup.find_all('div', class_='job-item')  # Update with actual class
+        # Bounded fan-out; per-host rate limits are applied inside the fetcher
+        results = await get_scrape_scheduler().run_all(tasks)
         
-        for card in job_cards:
-            try:
-                job = {
-                    'title': self._safe_extract(card, '.job-title'),
-                    'company': self._safe_extract(card, '.company-name'),
-                    'location': location,
-                    'salary': self._safe_extract(card, '.salary'),
-                    'date_posted': self._safe_extract(card, '.date-posted'),
-                    'description': self._safe_extract(card, '.job-description'),
-                    'source': 'CareerJunction',
-                    'url': self._extract_url(card),
-                    'province': self._determine_province(location)
-                }
-                jobs.append(job)
-            except Exception as e:
-                continue
+        for result in results:
+            if isinstance(result, list):
+                all_jobs.extend(result)
         
-        return jobs
+        # The same vacancy is usually listed on several boards
+        return await asyncio.to_thread(self.deduplicator.dedupe, all_jobs)
     
-    def parse_pnet(self, soup: BeautifulSoup, keyword: str, location: str) -> List[Dict]:
-        """Parse PNet job listings"""
-        jobs = []
-        # Similar implementation for PNet
-        return jobs
+    async def iter_jobs(self, keywords: List[str], locations: List[str]) -> AsyncIterator[Dict]:
+        """Yield jobs from all agencies page by page, as soon as each page is parsed"""
+        session = await get_http_registry().session('scrapers')
+        streams = [
+            lambda a=agency, k=keyword, l=location: self.iter_agency(session, a, k, l)
+            for agency in self.agencies for keyword in keywords for location in locations
+        ]
+        async for job in get_scrape_scheduler().stream(streams):
+            yield job
+    
+    async def scrape_agency(self, session, agency: CompiledSite, keyword: str, location: str) -> List[Dict]:
+        """Scrape individual agency"""
+        return [job async for job in self.iter_agency(session, agency, keyword, location)]
+    
+    async def iter_agency(self, session, agency: CompiledSite, keyword: str, location: str,
+                          raise_errors: bool = False) -> AsyncIterator[Dict]:
+        """Yield one agency's jobs for a search, following pagination until a page is empty.
 
-    def parse_indeed_za(self, soup: BeautifulSoup, keyword: str, location: str) -> List[Dict]:
-        """Parse Indeed South Africa job listings"""
-        jobs = []
-        # Implementation for Indeed South Africa
-        return jobs
+        A failed fetch is reported and ends the search; with ``raise_errors``
+        it is re-raised as well, so callers can tell it from a completed one.
+        """
+        try:
+            for url in agency.page_urls(keyword, location, self.max_pages):
+                # Unchanged pages (304 or same content hash) reuse the last parse
+                page_jobs = await self.fetcher.fetch_parsed(
+                    url,
+                    lambda content: agency.extract(content, keyword, location),
+                    ready_marker=agency.ready_marker,
+                    wait_for=agency.wait_for,
+                    session=session,
+                    parser_version=agency.version
+                )
+                if not page_jobs:
+                    break
+                for job in page_jobs:
+                    yield job
+        except Exception as e:
+            print(f"Error scraping {agency.name}: {e}")
+            if raise_errors:
+                raise
@@ -0,0 +1,165 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+def normalize_input(value: Any) -> Any:
+    """Collapse whitespace in strings (recursively) so reformatted inputs hash the same"""
+    if isinstance(value, str):
+        return ' '.join(value.split())
+    if isinstance(value, dict):
+        return {str(key): normalize_input(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [normalize_input(item) for item in value]
+    return value
+
+def cache_key(model: str, template: str, version: int, params: Dict, inputs: Dict) -> str:
+    """Content address of an LLM call: model, prompt template and version, parameters and normalized inputs"""
+    payload = json.dumps({
+        'model': model,
+        'template': template,
+        'version': version,
+        'params': params,
+        'inputs': normalize_input(inputs)
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class LLMCache:
+    """Persistent cache of LLM completions keyed by cache_key().
+
+    Entries live in SQLite (WAL, shared by every worker process on the
+    host) with an expiry time and a last-used time; once the table grows
+    past ``max_entries`` the least recently used rows are evicted. Bumping a
+    template's version invalidates everything it produced.
+
+    Calls with temperature > 0 are sampled and are only cached when the
+    caller passes ``cache_sampled=True``, i.e. when reusing an earlier
+    sample is acceptable for that call.
+    """
+
+    def __init__(self, db_path: str = "data/llm_cache.db", max_entries: int = 20000,
+                 default_ttl: Optional[float] = 30 * 24 * 3600, evict_every: int = 64):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.evict_every = evict_every
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'bypassed': 0, 'evicted': 0, 'saved_seconds': 0.0}
+        self.templates: Dict[str, Dict[str, int]] = {}
+        self._writes = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    template TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    latency REAL NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL,
+                    expires_at REAL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_last_used ON llm_cache (last_used_at)")
+        self.evict()
+
+    async def cached(self, call: Callable[[], Awaitable[str]], model: str, template: str, version: int,
+                     inputs: Dict, params: Optional[Dict] = None, ttl: Optional[float] = None,
+                     cache_sampled: bool = False) -> str:
+        """Stored response for this call if there is one, else await ``call()`` and store its result"""
+        params = params or {}
+        if (params.get('temperature') or 0) > 0 and not cache_sampled:
+            self.stats['bypassed'] += 1
+            return await call()
+
+        # SQLite reads and writes (and the eviction a write may trigger) stay off the event loop
+        key = cache_key(model, template, version, params, inputs)
+        response = await asyncio.to_thread(self.get, key, template)
+        if response is not None:
+            return response
+        started = time.perf_counter()
+        response = await call()
+        await asyncio.to_thread(self.put, key, template, response, time.perf_counter() - started, ttl)
+        return response
+
+    def get(self, key: str, template: str = '') -> Optional[str]:
+        now = time.time()
+        with self._lock, self._conn:
+            # Counters are updated under the lock too; lookups run on worker threads
+            counts = self.templates.setdefault(template, {'hits': 0, 'misses': 0})
+            row = self._conn.execute(
+                "SELECT response, latency, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[2] is not None and row[2] <= now:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self.stats['expired'] += 1
+                row = None
+            if row is None:
+                self.stats['misses'] += 1
+                counts['misses'] += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_used_at = ? WHERE key = ?", (now, key))
+            self.stats['hits'] += 1
+            self.stats['saved_seconds'] += row[1]
+            counts['hits'] += 1
+        return row[0]
+
+    def put(self, key: str, template: str, response: str, latency: float = 0.0, ttl: Optional[float] = None):
+        if response is None:
+            return
+        now = time.time()
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, template, response, latency, created_at, last_used_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, template, response, latency, now, now, now + ttl if ttl else None)
+            )
+            self._writes += 1
+            due = self._writes % self.evict_every == 0
+        if due:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop expired entries, then the least recently used ones beyond max_entries"""
+        with self._lock, self._conn:
+            removed = self._conn.execute(
+                "DELETE FROM llm_cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+            ).rowcount
+            removed += self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN "
+                "(SELECT key FROM llm_cache ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            ).rowcount
+            self.stats['evicted'] += removed
+        return removed
+
+    def metrics(self) -> Dict:
+        """Counters, hit rate and the per-template hits/misses"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        return {
+            **self.stats,
+            'saved_seconds': round(self.stats['saved_seconds'], 2),
+            'hit_rate': round(self.stats['hits'] / lookups, 3) if lookups else None,
+            'entries': entries,
+            'templates': self.templates
+        }
+
+_llm_cache = None
+
+def get_llm_cache() -> LLMCache:
+    """Process-wide LLM response cache backed by data/llm_cache.db"""
+    global _llm_cache
+    if _llm_cache is None:
+        _llm_cache = LLMCache()
+    return _llm_cache
@@ -1,11 +1,18 @@
-from .provinces import SOUTH_AFRICA_PROVINCES, get_all_locations, find_location_province
+from .provinces_za import SOUTH_AFRICA_PROVINCES, get_all_locations, find_location_province
 from .regions import SOUTH_AFRICA_REGIONS
 from .location_matcher import LocationMatcher
+from .location_index import LOCATION_INDEX, LocationMatch, resolve_location
+from .location_registry import LocationRegistry, get_location_registry
 
 __all__ = [
     "SOUTH_AFRICA_PROVINCES",
     "SOUTH_AFRICA_REGIONS", 
     "get_all_locations",
     "find_location_province",
-    "LocationMatcher"
+    "LocationMatcher",
+    "LOCATION_INDEX",
+    "LocationMatch",
+    "resolve_location",
+    "LocationRegistry",
+    "get_location_registry"
 ]
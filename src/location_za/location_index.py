@@ -0,0 +1,189 @@
+import re
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Set
+from .provinces_za import SOUTH_AFRICA_PROVINCES
+from .regions import SOUTH_AFRICA_REGIONS
+
+# Informal names, old/new names and abbreviations -> canonical location name
+LOCATION_ALIASES = {
+    "Johannesburg": ["Jozi", "Joburg", "Jo'burg", "JHB", "Egoli"],
+    "Pretoria": ["PTA", "Tshwane", "Pitori"],
+    "Cape Town": ["CPT", "Kaapstad", "Mother City"],
+    "Durban": ["DBN", "eThekwini", "Durbs"],
+    "Port Elizabeth": ["PE", "Gqeberha", "Nelson Mandela Bay", "Ibhayi"],
+    "East London": ["Buffalo City", "eMonti"],
+    "Bloemfontein": ["Bloem", "Mangaung"],
+    "Nelspruit": ["Mbombela"],
+    "Polokwane": ["Pietersburg"],
+    "Mahikeng": ["Mafikeng"],
+    "Grahamstown": ["Makhanda"],
+    "Witbank": ["eMalahleni"],
+    "Middleburg": ["Middelburg"],
+    "Pietermaritzburg": ["PMB", "Maritzburg"],
+    "Uitenhage": ["Kariega"],
+    "Makhado": ["Louis Trichardt"],
+    "Mokopane": ["Potgietersrus"],
+    "Bela-Bela": ["Warmbaths"]
+}
+
+# Fuzzy matching is limited to names this long; short names and codes would collide
+MIN_FUZZY_LENGTH = 6
+
+class LocationMatch(NamedTuple):
+    province_code: str
+    region: Optional[str]
+    location_type: str  # city, town, village, region or province
+    name: str           # canonical location name
+
+def normalize_location(name: str) -> str:
+    """Lowercase, strip punctuation noise and collapse whitespace"""
+    name = name.lower().replace("'", "").replace("-", " ")
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", " ", name)).strip()
+
+class LocationIndex:
+    """Precomputed name/alias -> LocationMatch lookup with edit-distance-1 fuzzy matching.
+
+    Exact and alias lookups are a single dict access. Typos are resolved
+    through a deletion neighbourhood (every name with one character removed),
+    so fuzzy lookups cost a handful of dict accesses regardless of how many
+    locations are indexed.
+
+    With ``sync_registry`` set, resolve() first pulls custom locations that
+    any worker added to the LocationRegistry since its last seen version
+    (a version check at most every refresh_interval seconds).
+    """
+
+    def __init__(self, sync_registry: bool = False):
+        self.entries: Dict[str, LocationMatch] = {}
+        self.sync_registry = sync_registry
+        self._deletes: Dict[str, Set[str]] = {}
+
+    def add(self, name: str, match: LocationMatch, overwrite: bool = False):
+        key = normalize_location(name)
+        if not key or (key in self.entries and not overwrite):
+            return
+        self.entries[key] = match
+        if len(key) >= MIN_FUZZY_LENGTH:
+            for variant in self._deletions(key):
+                self._deletes.setdefault(variant, set()).add(key)
+        self._resolve.cache_clear()
+
+    def lookup(self, name: str, fuzzy: bool = True) -> Optional[LocationMatch]:
+        """Resolve a single location name or alias"""
+        key = normalize_location(name)
+        if key in self.entries:
+            return self.entries[key]
+        if fuzzy and len(key) >= MIN_FUZZY_LENGTH:
+            return self._fuzzy_lookup(key)
+        return None
+
+    def resolve(self, location: str) -> Optional[LocationMatch]:
+        """Resolve free text such as 'Sandton, Gauteng' or 'Cape Town CBD'.
+
+        Tries the whole string, then each comma-separated part, then token
+        windows of up to three words, preferring the most specific match
+        (a town over its province). Results are cached per input string
+        until a location is added.
+        """
+        if self.sync_registry:
+            # Imported here: the registry itself adds to LOCATION_INDEX
+            from .location_registry import get_location_registry
+            get_location_registry().refresh()
+        return self._resolve(location)
+
+    @lru_cache(maxsize=50000)
+    def _resolve(self, location: str) -> Optional[LocationMatch]:
+        if not location:
+            return None
+
+        parts = [location] + re.split(r"[,/|;()]| - ", location)
+        fallback = None
+        for fuzzy in (False, True):
+            for part in parts:
+                match = self.lookup(part, fuzzy=fuzzy)
+                if match is None:
+                    match = self._window_lookup(normalize_location(part), fuzzy)
+                if match is None:
+                    continue
+                if match.location_type != "province":
+                    return match
+                fallback = fallback or match
+            if fallback:
+                return fallback
+        return None
+
+    def province_for(self, location: str) -> Optional[str]:
+        match = self.resolve(location)
+        return match.province_code if match else None
+
+    def _window_lookup(self, key: str, fuzzy: bool) -> Optional[LocationMatch]:
+        tokens = key.split()
+        fallback = None
+        for size in (3, 2, 1):
+            for start in range(len(tokens) - size + 1):
+                window = " ".join(tokens[start:start + size])
+                match = self.entries.get(window)
+                if match is None and fuzzy and len(window) >= MIN_FUZZY_LENGTH:
+                    match = self._fuzzy_lookup(window)
+                if match is None:
+                    continue
+                if match.location_type != "province":
+                    return match
+                fallback = fallback or match
+        return fallback
+
+    def _fuzzy_lookup(self, key: str) -> Optional[LocationMatch]:
+        candidates = set(self._deletes.get(key, ()))  # one character missing from key
+        for variant in self._deletions(key):
+            if variant in self.entries:  # one extra character in key
+                candidates.add(variant)
+            candidates.update(self._deletes.get(variant, ()))  # substitutions and transpositions
+        if not candidates:
+            return None
+        best = max(sorted(candidates), key=lambda candidate: SequenceMatcher(None, key, candidate).ratio())
+        return self.entries[best]
+
+    def _deletions(self, key: str) -> List[str]:
+        return [key[:i] + key[i + 1:] for i in range(len(key))]
+
+def build_location_index(sync_registry: bool = False) -> LocationIndex:
+    """Build the index from the province, region and alias tables"""
+    index = LocationIndex(sync_registry)
+
+    region_of = {}
+    for province_code, province_regions in SOUTH_AFRICA_REGIONS.items():
+        for region_name, locations in province_regions["regions"].items():
+            index.add(region_name.replace("_", " "),
+                      LocationMatch(province_code, region_name, "region", region_name.replace("_", " ").title()))
+            for location in locations:
+                region_of[normalize_location(location)] = (province_code, region_name)
+
+    for province_code, province_data in SOUTH_AFRICA_PROVINCES.items():
+        index.add(province_data["name"], LocationMatch(province_code, None, "province", province_data["name"]))
+        index.add(province_code, LocationMatch(province_code, None, "province", province_data["name"]))
+        for location_type, key in (("city", "cities"), ("town", "towns"), ("village", "villages")):
+            for location in province_data[key]:
+                region = region_of.get(normalize_location(location), (None, None))[1]
+                index.add(location, LocationMatch(province_code, region, location_type, location.strip()),
+                          overwrite=True)
+
+    # Places only listed under a region (e.g. Soweto, Franschhoek)
+    for location_key, (province_code, region_name) in region_of.items():
+        if location_key not in index.entries or index.entries[location_key].location_type == "region":
+            index.add(location_key, LocationMatch(province_code, region_name, "town", location_key.title()),
+                      overwrite=True)
+
+    for canonical, aliases in LOCATION_ALIASES.items():
+        match = index.lookup(canonical, fuzzy=False)
+        if match:
+            for alias in aliases:
+                index.add(alias, match, overwrite=True)
+
+    return index
+
+LOCATION_INDEX = build_location_index(sync_registry=True)
+
+def resolve_location(location: str) -> Optional[LocationMatch]:
+    """Resolve free-text location to (province_code, region, location_type, name)"""
+    return LOCATION_INDEX.resolve(location)
@@ -1,9 +1,11 @@
 import re
-from .provinces import SOUTH_AFRICA_PROVINCES, find_location_province
+from .provinces_za import SOUTH_AFRICA_PROVINCES, find_location_province
+from .location_registry import get_location_registry
 
 class LocationMatcher:
     def __init__(self):
         self.provinces = SOUTH_AFRICA_PROVINCES
+        self.registry = get_location_registry()
     
     def add_custom_location(self, location_name: str, location_type: str = "town"):
         """AI-powered location addition with automatic province detection"""
@@ -12,18 +14,8 @@ class LocationMatcher:
         province_match = self._ai_determine_province(location_name)
         
         if province_match and province_match in self.provinces:
-            # Add to the appropriate province
-            if location_type == "city":
-                self.provinces[province_match]['cities'].append(location_name)
-            elif location_type == "town":
-                self.provinces[province_match]['towns'].append(location_name)
-            else:
-                self.provinces[province_match]['villages'].append(location_name)
-            
-            # Remove duplicates and sort
-            self.provinces[province_match]['cities'] = sorted(list(set(self.provinces[province_match]['cities'])))
-            self.provinces[province_match]['towns'] = sorted(list(set(self.provinces[province_match]['towns'])))
-            self.provinces[province_match]['villages'] = sorted(list(set(self.provinces[province_match]['villages'])))
+            # Persist and index the location; built-in province lists stay untouched
+            self.registry.add(location_name, province_match, location_type)
             
             return {
                 "success": True,
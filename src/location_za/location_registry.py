@@ -0,0 +1,131 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+from sortedcontainers import SortedList
+from .provinces_za import SOUTH_AFRICA_PROVINCES
+from .location_index import LOCATION_INDEX, LocationMatch, normalize_location
+
+LOCATION_TYPE_KEYS = {"city": "cities", "town": "towns", "village": "villages"}
+
+class LocationRegistry:
+    """Built-in provinces plus user-added locations persisted in SQLite.
+
+    Custom locations live in an append-only table; the largest row id acts
+    as the version stamp. Each process keeps its own sorted lists (O(log n)
+    insert) and only pulls rows newer than the last id it has seen, so
+    locations added by one uvicorn worker show up in the others without
+    rebuilding any province list. SOUTH_AFRICA_PROVINCES is never mutated.
+    """
+
+    def __init__(self, db_path: str = "data/custom_locations.db", refresh_interval: float = 5.0):
+        self.db_path = db_path
+        self.refresh_interval = refresh_interval
+        self._lock = threading.RLock()
+        self._version = 0
+        self._last_refresh = 0.0
+
+        self._locations: Dict[str, Dict[str, SortedList]] = {}
+        self._known = set()
+        for province_code, province_data in SOUTH_AFRICA_PROVINCES.items():
+            self._locations[province_code] = {}
+            for key in LOCATION_TYPE_KEYS.values():
+                names = [name.strip() for name in province_data[key]]
+                self._locations[province_code][key] = SortedList(names)
+                self._known.update((province_code, key, normalize_location(name)) for name in names)
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS custom_locations (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    normalized_name TEXT NOT NULL,
+                    province_code TEXT NOT NULL,
+                    location_type TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    UNIQUE (province_code, location_type, normalized_name)
+                )
+            """)
+        self.refresh(force=True)
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def add(self, name: str, province_code: str, location_type: str = "town") -> bool:
+        """Persist a custom location. Returns False if it was already known."""
+        key = LOCATION_TYPE_KEYS.get(location_type, "villages")
+        name = name.strip()
+        normalized = normalize_location(name)
+
+        with self._lock:
+            if (province_code, key, normalized) in self._known:
+                return False
+            with self._conn:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO custom_locations "
+                    "(name, normalized_name, province_code, location_type, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (name, normalized, province_code, key, datetime.utcnow().isoformat())
+                )
+            # Pull our own row plus anything other workers added meanwhile
+            self.refresh(force=True)
+            return cursor.rowcount == 1
+
+    def refresh(self, force: bool = False) -> int:
+        """Apply rows added since the last seen version. Returns the number applied."""
+        now = time.monotonic()
+        if not force and now - self._last_refresh < self.refresh_interval:
+            return 0
+
+        with self._lock:
+            self._last_refresh = now
+            rows = self._conn.execute(
+                "SELECT id, name, normalized_name, province_code, location_type FROM custom_locations "
+                "WHERE id > ? ORDER BY id",
+                (self._version,)
+            ).fetchall()
+
+            for row_id, name, normalized, province_code, key in rows:
+                self._version = row_id
+                if province_code not in self._locations or (province_code, key, normalized) in self._known:
+                    continue
+                self._known.add((province_code, key, normalized))
+                self._locations[province_code][key].add(name)
+                location_type = next(t for t, k in LOCATION_TYPE_KEYS.items() if k == key)
+                LOCATION_INDEX.add(name, LocationMatch(province_code, None, location_type, name))
+
+            return len(rows)
+
+    def get_locations(self, province_code: str, location_type: Optional[str] = None) -> List[str]:
+        """Sorted locations for a province, optionally limited to one type"""
+        self.refresh()
+        with self._lock:
+            province = self._locations.get(province_code, {})
+            if location_type:
+                return list(province.get(LOCATION_TYPE_KEYS.get(location_type, "villages"), []))
+            return sorted(name for names in province.values() for name in names)
+
+    def get_all_locations(self) -> List[str]:
+        """All built-in and custom locations in South Africa"""
+        self.refresh()
+        with self._lock:
+            return sorted({name for province in self._locations.values()
+                           for names in province.values() for name in names})
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_location_registry() -> LocationRegistry:
+    """Process-wide registry, opened on first use"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = LocationRegistry()
+        return _registry
@@ -56,19 +56,19 @@ SOUTH_AFRICA_PROVINCES = {
 }
 
 def get_all_locations():
-    """Return all locations in South Africa"""
-    all_locations = []
-    for province_code, province_data in SOUTH_AFRICA_PROVINCES.items():
-        all_locations.extend(province_data['cities'])
-        all_locations.extend(province_data['towns'])
-        all_locations.extend(province_data['villages'])
-    return sorted(list(set(all_locations)))
+    """Return all locations in South Africa, including user-added ones"""
+    # Imported here: the registry is built from SOUTH_AFRICA_PROVINCES
+    from .location_registry import get_location_registry
+    return get_location_registry().get_all_locations()
 
 def find_location_province(location_name):
     """Find which province a location belongs to"""
-    for province_code, province_data in SOUTH_AFRICA_PROVINCES.items():
-        if (location_name in province_data['cities'] or 
-            location_name in province_data['towns'] or 
-            location_name in province_data['villages']):
-            return province_code, province_data['name']
+    from .location_index import LOCATION_INDEX
+    from .location_registry import get_location_registry
+    
+    # Pull locations other workers added before looking the name up
+    get_location_registry().refresh()
+    match = LOCATION_INDEX.lookup(location_name)
+    if match:
+        return match.province_code, SOUTH_AFRICA_PROVINCES[match.province_code]['name']
     return None, None
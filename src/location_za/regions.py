@@ -66,12 +66,12 @@ SOUTH_AFRICA_REGIONS = {
 
 def get_region_for_location(location_name: str, province_code: str) -> str:
     """Get the region for a specific location"""
+    from .location_index import LOCATION_INDEX
+    
     if province_code not in SOUTH_AFRICA_REGIONS:
         return "unknown"
     
-    location_lower = location_name.lower()
-    for region_name, locations in SOUTH_AFRICA_REGIONS[province_code]["regions"].items():
-        for loc in locations:
-            if location_lower in loc.lower() or loc.lower() in location_lower:
-                return region_name
+    match = LOCATION_INDEX.resolve(location_name)
+    if match and match.province_code == province_code and match.region:
+        return match.region
     return "other"
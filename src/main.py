@@ -1,4 +1,6 @@
 from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, Form
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer
 from fastapi.staticfiles import StaticFiles
@@ -12,6 +14,9 @@ from .location_za.location_matcher import LocationMatcher
 from .social_media.whatsapp_integration import WhatsAppService
 from .owners_dashboard.dashboard import OwnerDashboard
 from .auth.payment_zar import ZARPaymentProcessor, PAYMENT_PACKAGES
+from .http_client import get_http_registry
+from .database.session import get_database, get_db
+from .database import application_queries
 
 app = FastAPI(title="AI Job Application Automator - South Africa", version="2.0.0")
 
@@ -31,6 +36,58 @@ security = HTTPBearer()
 payment_processor = ZARPaymentProcessor()
 whatsapp_service = WhatsAppService()
 location_matcher = LocationMatcher()
+http_registry = get_http_registry()
+
+@app.on_event("startup")
+async def start_http_clients():
+    """Open the shared outbound connection pool for the app's lifetime"""
+    await http_registry.start()
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    await http_registry.close()
+
+@app.on_event("shutdown")
+async def close_database():
+    await get_database().dispose()
+
+@app.get("/owners/http-pool")
+async def http_pool_metrics(current_user: dict = Depends(get_current_user)):
+    """Outbound HTTP connection pool metrics"""
+    if not current_user.get('is_owner', False):
+        raise HTTPException(status_code=403, detail="Owner access required")
+    return http_registry.pool_metrics()
+
+@app.get("/owners/db-pool")
+async def db_pool_metrics(current_user: dict = Depends(get_current_user)):
+    """Database connection pool checkout latency and saturation"""
+    if not current_user.get('is_owner', False):
+        raise HTTPException(status_code=403, detail="Owner access required")
+    return get_database().pool_metrics()
+
+@app.get("/applications")
+async def list_my_applications(
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Current user's applications, newest first; pass next_cursor back for the next page"""
+    try:
+        return await application_queries.list_applications(
+            db, current_user['id'], status=status, limit=min(limit, 200), cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/applications/status-counts")
+async def my_application_status_counts(
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Number of the current user's applications per status"""
+    return await application_queries.status_counts(db, current_user['id'])
 
 @app.post("/register-za")
 async def register_user_za(
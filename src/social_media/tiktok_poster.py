@@ -1,6 +1,7 @@
 import asyncio
 from typing import Dict
 import aiohttp
+from ..http_client import get_http_registry
 
 class TikTokPoster:
     def __init__(self):
@@ -24,22 +25,22 @@ class TikTokPoster:
             "Content-Type": "application/json"
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(self.api_url, json=payload, headers=headers) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    return {
-                        "success": True,
-                        "video_id": result['data']['id'],
-                        "share_url": result['data']['share_url'],
-                        "platform": "tiktok"
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "error": await response.text(),
-                        "platform": "tiktok"
-                    }
+        session = await get_http_registry().session('tiktok')
+        async with session.post(self.api_url, json=payload, headers=headers) as response:
+            if response.status == 200:
+                result = await response.json()
+                return {
+                    "success": True,
+                    "video_id": result['data']['id'],
+                    "share_url": result['data']['share_url'],
+                    "platform": "tiktok"
+                }
+            else:
+                return {
+                    "success": False,
+                    "error": await response.text(),
+                    "platform": "tiktok"
+                }
     
     def _build_description(self, video_data: Dict) -> str:
         """Build engaging TikTok description"""